@@ -0,0 +1,170 @@
+"""Benchmarks of the simulator.
+
+Times graph generation, topological ordering, predecessor reset, every
+priority function, the analytics pass and the simulation for several
+graph sizes and numbers of resources. For each benchmark, it records the
+best wall time over a few repetitions, the peak memory allocated
+(measured in a separate run with tracemalloc) and the number of tasks
+processed per second. Levels are computed by a benchmark of their own,
+and cleared before each call of a priority function or of the analytics
+pass, which is timed with the levels it needs.
+
+To run, use 'python3 benchmarks/run_benchmarks.py'. Useful options:
+    --sizes 1000 10000 100000 1000000   graph sizes (number of tasks)
+    --resources 2 20 200                numbers of resources to simulate
+    --save benchmarks/baseline.json     stores the results as a baseline
+    --compare benchmarks/baseline.json  flags regressions against a
+                                        baseline (exit code 1 if any)
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import simulator.schedulers as schedulers
+from simulator.analytics import analyze
+from simulator.graph import Graph
+from simulator.levels import compute_levels
+from simulator.simulator import simulate
+
+PRIORITIES = ['priority_by_id', 'priority_by_topological_order',
+              'priority_by_lpt', 'priority_by_spt', 'priority_by_successors',
+              'priority_by_hlf', 'priority_by_cp']
+# Parameters of the generated graphs (besides their size)
+LOAD_RANGE = (2, 20)
+DEPENDENCY_RANGE = (1, 20)
+SEED = 1234
+
+
+def measure(function, repeat):
+    """Runs a function several times.
+
+    Returns
+    -------
+    (float, int, result)
+        Best wall time (s), peak memory allocated (bytes) and result of
+        the last call
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def uncached(graph):
+    """Clears the levels cached in a graph, so that each timed call
+    computes them again (as the first call does)"""
+    graph.height = dict()
+    return graph
+
+
+def run(sizes, resources, repeat):
+    """Runs all benchmarks and returns their results by name"""
+    results = dict()
+
+    def record(name, num_tasks, function):
+        # Large graphs are only measured once
+        wall_time, peak, result = measure(
+            function, repeat if num_tasks <= 10000 else 1)
+        results[name] = {'num_tasks': num_tasks, 'time': wall_time,
+                         'peak_memory': peak,
+                         'tasks_per_second': num_tasks / wall_time
+                         if wall_time > 0 else None}
+        print(f'{name:55} {wall_time:10.4f} s {peak / 2**20:10.1f} MiB')
+        return result
+
+    for num_tasks in sizes:
+        graph = record(f'generate_graph[n={num_tasks}]', num_tasks,
+                       lambda: Graph.generate_graph(num_tasks, LOAD_RANGE,
+                                                    DEPENDENCY_RANGE, True,
+                                                    SEED))
+        record(f'topological_ordering[n={num_tasks}]', num_tasks,
+               graph.topological_ordering)
+        record(f'reset_predecessors[n={num_tasks}]', num_tasks,
+               graph.reset_predecessors)
+        record(f'compute_levels[n={num_tasks}]', num_tasks,
+               lambda: compute_levels(graph))
+        for name in PRIORITIES:
+            function = getattr(schedulers, name)
+            record(f'{name}[n={num_tasks}]', num_tasks,
+                   lambda: function(uncached(graph)))
+        record(f'analyze[n={num_tasks}]', num_tasks,
+               lambda: analyze(uncached(graph)))
+        schedulers.priority_by_cp(graph)
+        for num_resources in resources:
+            record(f'simulate[n={num_tasks},r={num_resources}]', num_tasks,
+                   lambda: simulate(graph, num_resources, quiet=True))
+    return results
+
+
+def compare(results, baseline, tolerance, min_time=0.001):
+    """Lists the benchmarks slower than in the baseline.
+
+    Benchmarks that took less than min_time seconds in the baseline are
+    ignored, as their timings are mostly noise.
+
+    Returns
+    -------
+    list of (str, float, float)
+        Name, baseline time and new time of each regression
+    """
+    regressions = list()
+    for name, result in results.items():
+        if name in baseline:
+            reference = baseline[name]['time']
+            if reference >= min_time and \
+                    result['time'] > reference * (1 + tolerance):
+                regressions.append((name, reference, result['time']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--resources', type=int, nargs='+',
+                        default=[2, 20, 200])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='repetitions for graphs of up to 10^4 tasks')
+    parser.add_argument('--save', help='JSON file to store the results')
+    parser.add_argument('--compare', help='JSON baseline to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown flagged as a regression')
+    parser.add_argument('--min-time', type=float, default=0.001,
+                        help='baseline time (s) below which timings are '
+                        'not compared')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.resources, args.repeat)
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                       'results': results}, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.tolerance,
+                              args.min_time)
+        for name, reference, new in regressions:
+            print(f'REGRESSION {name}: {reference:.4f} s -> {new:.4f} s')
+        if regressions:
+            sys.exit(1)
+        print('No regressions')
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,6 @@ graph = Graph.generate_graph(6, (1, 10), (0, 3), False, 5)
 print(graph)
 schedulers.priority_by_id(graph)
 simulate(graph, 2, True)
-graph.reset_predecessors()
 simulate(graph, 3, True)
 
 print('\nScenario 2: 6 tasks over 2 and 3 resources - unordered task ids')
@@ -21,5 +20,4 @@ graph = Graph.generate_graph(6, (1, 10), (0, 3), True, 5)
 print(graph)
 schedulers.priority_by_id(graph)
 simulate(graph, 2, True)
-graph.reset_predecessors()
 simulate(graph, 3, True)
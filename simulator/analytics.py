@@ -0,0 +1,199 @@
+"""Module computing the shape and parallelism of a DAG.
+
+analyze(graph) gathers in one pass over the topological order:
+- the number of depth levels and the number of tasks and work of each
+  (the width of the graph is its largest level);
+- the total work, the critical path and their ratio (the average
+  parallelism: the speedup of an infinite number of resources);
+- the parallelism profile: the number of tasks running at each time when
+  every task starts as soon as its predecessors finish (at its top
+  level), with unlimited resources.
+
+The peak of the profile is the maximum useful parallelism: with at least
+that many resources, the simulator starts every task at its top level
+(whatever the priorities), so the makespan is the critical path and
+adding resources cannot reduce it:
+>>> profile = analyze(graph)
+>>> profile.max_parallelism, profile.critical_path
+>>> simulate(graph, profile.max_parallelism) == profile.critical_path
+
+Levels are computed (and cached in the graph) if needed. If NumPy is
+available, analyze(graph, vectorized=True) uses array operations for the
+levels, the per-level sums and the profile.
+"""
+
+from simulator.compact import CompactGraph
+from simulator.levels import compute_levels, has_levels
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class GraphProfile:
+    """
+    Shape and parallelism of a graph.
+
+    Attributes
+    ----------
+    num_tasks, num_edges : int
+        Size of the graph
+    level_sizes : list of int
+        Number of tasks in each depth level of the topological order
+    level_work : list of numbers
+        Total load of the tasks of each depth level
+    total_work : int or float
+        Total load of the graph
+    critical_path : int or float
+        Length of the longest path (makespan with unlimited resources)
+    profile : list of (number, int)
+        Number of tasks running from each time until the next one, with
+        unlimited resources (ends with (critical_path, 0))
+    max_parallelism : int
+        Largest number of tasks running at once in the profile, beyond
+        which adding resources cannot reduce the makespan
+    """
+    def __init__(self, num_tasks, num_edges, level_sizes, level_work,
+                 total_work, critical_path, profile, max_parallelism):
+        self.num_tasks = num_tasks
+        self.num_edges = num_edges
+        self.level_sizes = level_sizes
+        self.level_work = level_work
+        self.total_work = total_work
+        self.critical_path = critical_path
+        self.profile = profile
+        self.max_parallelism = max_parallelism
+
+    def __repr__(self):
+        return (f'GraphProfile({self.num_tasks} tasks, depth={self.depth}, '
+                f'width={self.width}, parallelism={self.parallelism:.2f}, '
+                f'max_parallelism={self.max_parallelism})')
+
+    @property
+    def depth(self):
+        """Number of depth levels"""
+        return len(self.level_sizes)
+
+    @property
+    def width(self):
+        """Number of tasks of the largest depth level"""
+        return max(self.level_sizes, default=0)
+
+    @property
+    def parallelism(self):
+        """Total work divided by the critical path (average number of
+        tasks running at once with unlimited resources)"""
+        if not self.critical_path:
+            return 0.0
+        return self.total_work / self.critical_path
+
+
+def analyze(graph, vectorized=False):
+    """
+    Computes the shape and parallelism of a graph in O(V+E), plus the
+    sort of the profile.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        DAG of tasks (its topological order and levels are computed if
+        needed)
+    vectorized : bool [default = False]
+        True if the computation should use NumPy
+
+    Returns
+    -------
+    GraphProfile object
+        Metrics of the graph
+
+    Raises
+    ------
+    ImportError
+        If vectorized is True and NumPy is not installed
+    """
+    if vectorized and np is None:
+        raise ImportError('vectorized analytics require NumPy')
+    compact = isinstance(graph, CompactGraph)
+    num_tasks = len(graph) if compact else len(graph.vertices)
+    # The order must be grouped by depth (it is not after edits)
+    if len(graph.topological_order) != num_tasks or \
+            (num_tasks and not len(graph.level_offsets)):
+        graph.topological_ordering()
+    if not has_levels(graph):
+        compute_levels(graph, vectorized)
+    if vectorized:
+        if not compact:
+            # Levels are cached in the Graph, and copied
+            graph = CompactGraph.from_graph(graph)
+        return _numpy_analyze(graph)
+
+    if compact:
+        loads, top_level = graph.loads, graph.top_level
+        num_edges = len(graph.succ_indices)
+        order = graph.topological_order
+    else:
+        vertices = graph.vertices
+        loads = {id: task.load for id, task in vertices.items()}
+        top_level = {id: task.top_level for id, task in vertices.items()}
+        num_edges = sum(len(task.successors) for task in vertices.values())
+        order = graph.topological_order
+    offsets = list(graph.level_offsets) + [num_tasks]
+    level_sizes = [offsets[k + 1] - offsets[k]
+                   for k in range(len(offsets) - 1)]
+    level_work = [sum(loads[key] for key in order[offsets[k]:offsets[k + 1]])
+                  for k in range(len(offsets) - 1)]
+    # Events of the profile: ends (of tasks with a load) come before the
+    # starts at the same time, as in the simulator, and tasks without load
+    # are counted as running with the tasks starting at the same time
+    events = list()
+    for key in order:
+        start, load = top_level[key], loads[key]
+        events.append((start, 1, 1))
+        events.append((start + load, 0 if load else 2, -1))
+    events.sort()
+    profile = list()
+    running = 0
+    max_parallelism = 0
+    for k, (time, _, change) in enumerate(events):
+        running += change
+        max_parallelism = max(max_parallelism, running)
+        if k + 1 == len(events) or events[k + 1][0] != time:
+            profile.append((time, running))
+    critical_path = profile[-1][0] if profile else 0
+    return GraphProfile(num_tasks, num_edges, level_sizes, level_work,
+                        sum(level_work), critical_path, profile,
+                        max_parallelism)
+
+
+def _numpy_analyze(graph):
+    """Vectorized version of analyze for a CompactGraph with levels"""
+    num_tasks = len(graph)
+    loads = np.asarray(graph.loads)
+    top = np.asarray(graph.top_level)
+    offsets = np.append(np.asarray(graph.level_offsets, dtype=np.int64),
+                        num_tasks)
+    level_sizes = np.diff(offsets)
+    # Sums of the loads in topological order, by depth level
+    cumulative = np.concatenate(
+        ([0], np.cumsum(loads[np.asarray(graph.topological_order)])))
+    level_work = cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+    # Same events as in analyze, sorted by (time, kind)
+    finish = top + loads
+    times = np.concatenate((top, finish))
+    kinds = np.concatenate((np.ones(num_tasks, dtype=np.int8),
+                            np.where(loads > 0, 0, 2).astype(np.int8)))
+    changes = np.concatenate((np.ones(num_tasks, dtype=np.int64),
+                              -np.ones(num_tasks, dtype=np.int64)))
+    permutation = np.lexsort((kinds, times))
+    times = times[permutation]
+    running = np.cumsum(changes[permutation])
+    last = np.flatnonzero(np.r_[times[1:] != times[:-1], True]) \
+        if num_tasks else np.zeros(0, dtype=np.int64)
+    profile = list(zip(times[last].tolist(), running[last].tolist()))
+    return GraphProfile(num_tasks, len(graph.succ_indices),
+                        level_sizes.tolist(), level_work.tolist(),
+                        cumulative[-1].item(),
+                        profile[-1][0] if profile else 0, profile,
+                        int(running.max()) if num_tasks else 0)
@@ -0,0 +1,151 @@
+"""Module containing lower bounds on the makespan of a graph.
+
+No schedule of a graph on num_resources resources can be shorter than:
+- the critical path bound: the longest path of the graph (its largest
+  bottom level);
+- the work bound: the total load divided by the number of resources;
+- the level bound, which combines both (Fernandez and Bussell; Hu for
+  unit tasks): a task of bottom level b and load p must run at least
+  min(p, b - s) time units before the last s time units of any schedule,
+  so the makespan is at least s + (that work) / num_resources, for every
+  s. Taking s = 0 gives the work bound, and s = critical path gives the
+  critical path bound. The same holds for the first s time units, with
+  top levels (plus the load of the task) instead of bottom levels.
+
+The critical path and work bounds take O(V+E) time, and the level bound
+O(V log V) more. With integer loads and identical resources, makespans
+are integers, so the bounds are rounded up.
+
+Fernandez, E.B. and Bussell, B., 1973. Bounds on the number of processors
+and time for multiprocessor optimal schedules. IEEE Transactions on
+Computers, 100(8), pp.745-751.
+Hu, T.C., 1961. Parallel sequencing and assembly line problems.
+Operations Research, 9(6), pp.841-848.
+
+Example
+-------
+>>> bounds = lower_bounds(graph, 20)
+>>> makespan = simulate(graph, 20, quiet=True)
+>>> bounds.value, bounds.gap(makespan)
+"""
+
+
+class Bounds:
+    """
+    Lower bounds on the makespan.
+
+    Attributes
+    ----------
+    critical_path : int or float
+        Length of the longest path of the graph
+    work : int or float
+        Total load divided by the number of resources
+    levels : int or float
+        Level bound (see the description of the module)
+    """
+    def __init__(self, critical_path, work, levels):
+        self.critical_path = critical_path
+        self.work = work
+        self.levels = levels
+
+    def __repr__(self):
+        return (f'Bounds(critical_path={self.critical_path}, '
+                f'work={self.work}, levels={self.levels})')
+
+    @property
+    def value(self):
+        """Best (largest) lower bound"""
+        return max(self.critical_path, self.work, self.levels)
+
+    def gap(self, makespan):
+        """Relative distance between a makespan and the best lower bound
+        (an upper bound on its distance to the optimal makespan)"""
+        bound = self.value
+        if not bound:
+            return 0.0
+        return (makespan - bound) / bound
+
+
+def lower_bounds(graph, num_resources, speeds=None, loads=None):
+    """
+    Computes lower bounds on the makespan of a graph.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        DAG of tasks (it is not modified)
+    num_resources : int
+        Number of resources
+    speeds : list of numbers [optional]
+        Speed factor of each resource (see simulate)
+    loads : sequence of numbers [optional]
+        Load of each task, used instead of the loads stored in the graph
+        (see simulate)
+
+    Returns
+    -------
+    Bounds object
+        Lower bounds, valid for any schedule (not only list schedules)
+    """
+    # Imported here as the simulator uses this module
+    from simulator.compact import CompactGraph
+    from simulator.simulator import _view
+    keys, graph_loads, successors, in_degree, _, _ = _view(graph)
+    if loads is None:
+        loads = graph_loads
+    elif not isinstance(graph, CompactGraph):
+        loads = dict(zip(keys, loads))
+    return _bounds(keys, loads, successors, in_degree, num_resources,
+                   speeds)
+
+
+def _bounds(keys, loads, successors, in_degree, num_resources, speeds):
+    """Computes the bounds from the view of a graph (see
+    simulator.simulator._view); in_degree is modified"""
+    # Top and bottom levels in topological order (Kahn's algorithm)
+    order = [key for key in keys if not in_degree[key]]
+    top_level = dict.fromkeys(keys, 0)
+    for key in order:
+        finish = top_level[key] + loads[key]
+        for succ in successors(key):
+            if top_level[succ] < finish:
+                top_level[succ] = finish
+            in_degree[succ] -= 1
+            if not in_degree[succ]:
+                order.append(succ)
+    bottom_level = dict()
+    for key in reversed(order):
+        bottom_level[key] = loads[key] + max(
+            (bottom_level[succ] for succ in successors(key)), default=0)
+
+    total = sum(loads[key] for key in keys)
+    critical_path = max(bottom_level.values(), default=0)
+    if speeds is not None:
+        # Tasks may run on the fastest resource; the level bound is not
+        # computed for resources of different speeds
+        return Bounds(critical_path / max(speeds), total / sum(speeds), 0)
+    integer = all(isinstance(loads[key], int) for key in keys)
+    divide = (lambda work: -(-work // num_resources)) if integer \
+        else (lambda work: work / num_resources)
+    levels = max(_level_bound([(bottom_level[key], loads[key])
+                               for key in keys], total, divide),
+                 _level_bound([(top_level[key] + loads[key], loads[key])
+                               for key in keys], total, divide))
+    return Bounds(critical_path, divide(total), levels)
+
+
+def _level_bound(tasks, total, divide):
+    """Largest s + divide(W(s)), where W(s) is the work of the tasks
+    (bottom level, load) that must run before the last s time units"""
+    # W(s) is piecewise linear: the work of a task decreases with slope
+    # -1 between bottom level - load and bottom level
+    changes = sorted([(level - load, 1) for level, load in tasks] +
+                     [(level, -1) for level, load in tasks])
+    bound = divide(total)
+    work, slope, previous = total, 0, 0
+    for s, change in changes:
+        work -= slope * (s - previous)
+        previous = s
+        slope += change
+        bound = max(bound, s + divide(work))
+    return bound
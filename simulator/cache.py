@@ -0,0 +1,338 @@
+"""Module caching generated graphs and the data derived from them.
+
+Experiments often generate the same graphs again and again, and then
+recompute their topological order, levels and priorities. A GraphCache
+keeps each graph together with these derived artifacts:
+- graphs from Graph.generate_graph are keyed on their generation
+  parameters;
+- other graphs (e.g., imported ones) are keyed on a structural hash
+  (see structural_hash).
+
+The cache has an in-memory tier, bounded in bytes with least recently
+used eviction, and an optional on-disk tier (a directory of graph files,
+see simulator.storage) that can be shared by several processes. Files
+are written under a temporary name, then renamed, so that processes
+never read partial files.
+
+Priority vectors are cached in memory for each function object. On disk,
+they are keyed on the name of the function and a fingerprint of its code
+(so editing the function invalidates them, but editing a function that
+it calls does not); vectors of lambdas and nested functions (closures)
+are only cached in memory, as their names are not unique.
+
+Example
+-------
+>>> import simulator.schedulers as schedulers
+>>> from simulator.simulator import simulate
+>>> cache = GraphCache(directory='graph_cache')
+>>> graph = cache.generate_graph(10000, (2, 20), (1, 20), True, 1234)
+>>> cache.apply_priority(graph, schedulers.priority_by_cp)
+>>> makespan = simulate(graph, 20)
+"""
+
+import hashlib
+import marshal
+import os
+import weakref
+from array import array
+from collections import OrderedDict
+
+from simulator.compact import CompactGraph
+from simulator.graph import Graph
+from simulator.levels import ensure_levels
+from simulator.schedulers import priority_vector, set_priorities
+from simulator.storage import save_graph, load_graph, GraphFileError, \
+    _replacing
+
+# Rough memory used by a Task object in a Graph (object, dict, two sets)
+# and by each edge (an entry in two sets)
+TASK_BYTES = 700
+EDGE_BYTES = 80
+
+
+def structural_hash(graph):
+    """
+    Computes a hash of the structure of a graph.
+
+    Two graphs have the same hash if their tasks (identifiers and loads,
+    in the same order) and edges are the same.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to hash
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest
+    """
+    compact = graph if isinstance(graph, CompactGraph) \
+        else CompactGraph.from_graph(graph)
+    digest = hashlib.sha256(b'structure')
+    digest.update(repr(list(compact.ids)).encode()
+                  if isinstance(compact.ids, list)
+                  else memoryview(compact.ids).cast('B'))
+    for column in [compact.loads, compact.succ_offsets,
+                   compact.succ_indices]:
+        digest.update(memoryview(column).cast('B'))
+    return digest.hexdigest()
+
+
+def generation_key(num_tasks, load_range, dependency_range, rename=False,
+                   rng_seed=None, compact=False, mode='legacy'):
+    """Computes the cache key of a generated graph"""
+    parameters = (num_tasks, tuple(load_range), tuple(dependency_range),
+                  bool(rename), rng_seed, bool(compact), mode)
+    return hashlib.sha256(repr(parameters).encode()).hexdigest()
+
+
+def _function_name(function):
+    """Name used to cache the priorities computed by a function on disk:
+    its qualified name and a fingerprint of its code (None if it has no
+    unique name or no code)"""
+    name = getattr(function, '__qualname__', None)
+    code = getattr(function, '__code__', None)
+    if name is None or code is None or '<locals>' in name or \
+            '<lambda>' in name:
+        return None
+    fingerprint = hashlib.sha256(marshal.dumps(code)).hexdigest()[:16]
+    return f'{function.__module__}.{name}-{fingerprint}'
+
+
+def _size(graph, priorities):
+    """Estimated memory used by a graph and its priority vectors"""
+    size = sum(len(vector) * getattr(vector, 'itemsize', 8)
+               for vector in priorities.values())
+    if isinstance(graph, CompactGraph):
+        columns = [graph.ids, graph.loads, graph.succ_offsets,
+                   graph.succ_indices, graph.pred_offsets,
+                   graph.pred_indices, graph.priority,
+                   graph.topological_order, graph.depth, graph.top_level,
+                   graph.bottom_level, graph.height]
+        return size + sum(len(column) * getattr(column, 'itemsize', 8)
+                          for column in columns)
+    num_edges = sum(len(task.successors) for task in graph.vertices.values())
+    return size + TASK_BYTES * len(graph.vertices) + EDGE_BYTES * num_edges
+
+
+class GraphCache:
+    """
+    Two-tier cache of graphs and derived data.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Maximum estimated size of the in-memory tier
+    directory : str
+        Directory of the on-disk tier (None if there is none)
+    hits, misses : int
+        Number of graphs found / not found in the cache
+    """
+    def __init__(self, max_bytes=1 << 30, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        # key -> [graph, dict of priority vectors, estimated size]
+        self._entries = OrderedDict()
+        self._size = 0
+        # graph -> key, to find the entry of a graph given by the user
+        self._keys = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def generate_graph(self, num_tasks, load_range, dependency_range,
+                       rename=False, rng_seed=None, compact=False,
+                       mode='legacy', levels=True):
+        """
+        Returns a generated graph, from the cache if possible.
+
+        Parameters
+        ----------
+        num_tasks, load_range, dependency_range, rename, rng_seed,
+        compact, mode
+            Same as in Graph.generate_graph
+        levels : bool [default = True]
+            True if the levels of the graph should be computed (and cached)
+
+        Returns
+        -------
+        Graph or CompactGraph object
+            Generated graph. The same object is returned for the same
+            parameters, so its priorities may have been changed since
+            (use apply_priority to set them).
+        """
+        key = generation_key(num_tasks, load_range, dependency_range, rename,
+                             rng_seed, compact, mode)
+        graph = self._get(key, compact)
+        if graph is None:
+            graph = Graph.generate_graph(num_tasks, load_range,
+                                         dependency_range, rename, rng_seed,
+                                         compact, mode)
+            if levels:
+                ensure_levels(graph)
+            self._put(key, graph)
+        return graph
+
+    def add_graph(self, graph):
+        """
+        Adds a graph to the cache, keyed on its structure.
+
+        Parameters
+        ----------
+        graph : Graph or CompactGraph object
+            Graph to add
+
+        Returns
+        -------
+        Graph or CompactGraph object
+            The cached graph with the same structure (the graph itself if
+            there was none)
+        """
+        compact = isinstance(graph, CompactGraph)
+        # Graphs and CompactGraphs are different entries
+        key = structural_hash(graph) + ('-compact' if compact else '')
+        cached = self._get(key, compact)
+        if cached is not None:
+            return cached
+        self._put(key, graph)
+        return graph
+
+    def priority(self, graph, function):
+        """
+        Returns the priorities computed by a function for a cached graph.
+
+        Vectors are computed once (see schedulers.priority_vector), without
+        changing the graph, and cached with it (the graph is cached again
+        if it was evicted).
+
+        Parameters
+        ----------
+        graph : Graph or CompactGraph object
+            Graph returned by generate_graph or add_graph
+        function : function
+            Priority function (e.g., from simulator.schedulers)
+
+        Returns
+        -------
+        array
+            Priority of each task (see schedulers.get_priorities), which
+            can be given to simulate(..., priorities=...)
+        """
+        key = self._keys[graph]
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if function in entry[1]:
+                return entry[1][function]
+        name = _function_name(function)
+        num_tasks = len(graph) if isinstance(graph, CompactGraph) \
+            else len(graph.vertices)
+        vector = self._load_priority(key, name, num_tasks)
+        if vector is None:
+            vector = priority_vector(graph, function)
+            self._save_priority(key, name, vector)
+        if entry is None:
+            # The graph was evicted but is still used: it is cached again
+            self._put(key, graph, save=False)
+            entry = self._entries[key]
+        size = len(vector) * getattr(vector, 'itemsize', 8)
+        entry[1][function] = vector
+        entry[2] += size
+        self._size += size
+        self._evict()
+        return vector
+
+    def apply_priority(self, graph, function):
+        """
+        Sets the priorities of a cached graph as computed by a function.
+
+        Parameters are the same as in priority.
+        """
+        set_priorities(graph, self.priority(graph, function))
+
+    def clear(self):
+        """Empties the in-memory tier (files on disk are kept)"""
+        self._entries.clear()
+        self._size = 0
+
+    def _get(self, key, compact):
+        """Finds a graph in memory, then on disk"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        path = self._path(key, 'dag')
+        if path is not None and os.path.exists(path):
+            try:
+                graph = load_graph(path, compact)
+            except GraphFileError:
+                return None
+            self.hits += 1
+            self._put(key, graph, save=False)
+            return graph
+        self.misses += 1
+        return None
+
+    def _put(self, key, graph, save=True):
+        """Stores a graph in memory and, if possible, on disk"""
+        self._keys[graph] = key
+        size = _size(graph, {})
+        self._entries[key] = [graph, dict(), size]
+        self._size += size
+        path = self._path(key, 'dag')
+        if save and path is not None:
+            try:
+                save_graph(graph, path)
+            except ValueError:  # identifiers that cannot be saved
+                pass
+        self._evict()
+
+    def _evict(self):
+        """Removes least recently used entries above the size bound.
+
+        The most recent entry is always kept.
+        """
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+    def _path(self, key, extension):
+        """Name of a file of the on-disk tier (None if there is none)"""
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f'{key}.{extension}')
+
+    def _save_priority(self, key, name, vector):
+        """Writes a priority vector on disk: its typecode, then its data"""
+        if name is None:
+            return
+        path = self._path(key, f'{name}.prio')
+        # Vectors of non-numeric priorities (lists) are only kept in memory
+        if path is not None and isinstance(vector, array):
+            with _replacing(path) as file:
+                file.write(vector.typecode.encode())
+                vector.tofile(file)
+
+    def _load_priority(self, key, name, num_tasks):
+        """Reads a priority vector of num_tasks priorities from disk (None
+        if there is none, or if the file is invalid)"""
+        if name is None:
+            return None
+        path = self._path(key, f'{name}.prio')
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, 'rb') as file:
+            try:
+                vector = array(file.read(1).decode())
+                vector.frombytes(file.read())
+            except (ValueError, TypeError, UnicodeDecodeError):
+                return None
+        return vector if len(vector) == num_tasks else None
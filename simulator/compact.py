@@ -0,0 +1,371 @@
+"""Module containing a compact, array-backed representation of task graphs.
+
+A CompactGraph stores the same information as a Graph, but in a few
+contiguous buffers instead of one Task object (with two sets) per task.
+Tasks are referred to by their index (0 to n-1) in these buffers, and
+adjacency lists use the CSR (compressed sparse row) layout: the successors
+of task i are succ_indices[succ_offsets[i]:succ_offsets[i+1]].
+
+All buffers are arrays from the standard 'array' module, so they support
+the buffer protocol and can be wrapped by NumPy without copies
+(e.g., numpy.frombuffer(graph.loads, dtype=numpy.int64)).
+"""
+
+from array import array
+
+from simulator.graph import Graph, Task
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+def typed_array(values):
+    """Creates an array of 64-bit integers, or of doubles if any value
+    is not an integer.
+
+    Parameters
+    ----------
+    values : iterable of numbers
+        Values to store
+
+    Returns
+    -------
+    array object
+        Array of typecode 'q' or 'd'
+    """
+    values = values if isinstance(values, (list, array)) else list(values)
+    if isinstance(values, array):
+        return array(values.typecode, values)
+    if all(isinstance(value, int) for value in values):
+        return array('q', values)
+    return array('d', values)
+
+
+def _csr(num_rows, rows):
+    """Builds the (offsets, indices) arrays of a list of rows"""
+    offsets = array('q', [0]) * (num_rows + 1)
+    indices = array('i')
+    for i, row in enumerate(rows):
+        indices.extend(row)
+        offsets[i + 1] = len(indices)
+    return offsets, indices
+
+
+def _transpose(num_rows, offsets, indices):
+    """Builds the CSR arrays of the transposed adjacency.
+
+    Rows of the result are sorted by index, as each row is filled while
+    going through the original rows in order.
+    """
+    if np is not None:
+        return _numpy_transpose(num_rows, offsets, indices)
+    counts = array('q', [0]) * (num_rows + 1)
+    for j in indices:
+        counts[j + 1] += 1
+    for i in range(num_rows):
+        counts[i + 1] += counts[i]
+    t_offsets = array('q', counts)
+    t_indices = array('i', [0]) * len(indices)
+    for i in range(num_rows):
+        for k in range(offsets[i], offsets[i + 1]):
+            j = indices[k]
+            t_indices[counts[j]] = i
+            counts[j] += 1
+    return t_offsets, t_indices
+
+
+def _numpy_transpose(num_rows, offsets, indices):
+    """Vectorized version of _transpose (a stable sort of the edges)"""
+    targets = np.frombuffer(indices, dtype=np.int32)
+    sources = np.repeat(np.arange(num_rows, dtype=np.int32),
+                        np.diff(np.frombuffer(offsets, dtype=np.int64)))
+    t_offsets = array('q', [0]) * (num_rows + 1)
+    np.cumsum(np.bincount(targets, minlength=num_rows),
+              out=np.frombuffer(t_offsets, dtype=np.int64)[1:])
+    t_indices = array('i')
+    t_indices.frombytes(
+        sources[np.argsort(targets, kind='stable')].tobytes())
+    return t_offsets, t_indices
+
+
+class CompactGraph:
+    """
+    Array-backed DAG of tasks for scheduling algorithms.
+
+    Attributes
+    ----------
+    ids : array of Task.id (or list if identifiers are not integers)
+        Identifier of the task at each index
+    loads : array of int (or float)
+        Processing time of each task
+    succ_offsets, succ_indices : arrays of int
+        CSR representation of the successors of each task
+    pred_offsets, pred_indices : arrays of int
+        CSR representation of the predecessors of each task
+    priority : array of int (or float)
+        Priority of each task - to be computed
+    topological_order : array of int
+        Task indices in topological order
+    level_offsets : array of int
+        Index in topological_order where each depth level starts
+    depth : array of int
+        Depth (level index) of each task in the topological order
+    top_level, bottom_level, height : arrays of int (or float)
+        Levels of each task - to be computed (see simulator.levels)
+    """
+    def __init__(self, ids, loads, succ_offsets, succ_indices,
+                 pred_offsets=None, pred_indices=None):
+        num_tasks = len(loads)
+        self.ids = ids
+        self.loads = loads
+        self.succ_offsets = succ_offsets
+        self.succ_indices = succ_indices
+        if pred_offsets is None:
+            pred_offsets, pred_indices = _transpose(num_tasks, succ_offsets,
+                                                    succ_indices)
+        self.pred_offsets = pred_offsets
+        self.pred_indices = pred_indices
+        self.priority = array('q', [-1]) * num_tasks
+        self.topological_order = array('i')
+        self.level_offsets = array('q')
+        self.depth = array('i')
+        self.top_level = array('q')
+        self.bottom_level = array('q')
+        self.height = array('q')
+
+    def __len__(self):
+        return len(self.loads)
+
+    def __repr__(self):
+        """Simplified representation of the graph"""
+        return (f'CompactGraph of {len(self)} tasks and ' +
+                f'{len(self.succ_indices)} edges')
+
+    def successors(self, index):
+        """Returns the indices of the successors of a task"""
+        return self.succ_indices[self.succ_offsets[index]:
+                                 self.succ_offsets[index + 1]]
+
+    def predecessors(self, index):
+        """Returns the indices of the predecessors of a task"""
+        return self.pred_indices[self.pred_offsets[index]:
+                                 self.pred_offsets[index + 1]]
+
+    def out_degree(self, index):
+        """Returns the number of successors of a task"""
+        return self.succ_offsets[index + 1] - self.succ_offsets[index]
+
+    def in_degree(self, index):
+        """Returns the number of predecessors of a task"""
+        return self.pred_offsets[index + 1] - self.pred_offsets[index]
+
+    def topological_ordering(self):
+        """Computes a topological order for the graph in O(V+E).
+
+        Follows the same rules as Graph.topological_ordering: entry tasks
+        come first in index order, and each following level is sorted by
+        task identifier.
+
+        Returns
+        -------
+        array of int
+            Depth (level index) of each task
+
+        Raises
+        ------
+        CycleError
+            If the graph contains a cycle
+        """
+        num_tasks = len(self)
+        ids = self.ids
+        succ_offsets = self.succ_offsets
+        succ_indices = self.succ_indices
+        in_degree = array('q', (self.in_degree(i) for i in range(num_tasks)))
+        level = [i for i in range(num_tasks) if in_degree[i] == 0]
+        order = array('i')
+        level_offsets = array('q')
+        depth = array('i', [0]) * num_tasks
+        current_depth = 0
+        while level:
+            level_offsets.append(len(order))
+            next_level = list()
+            for i in level:
+                depth[i] = current_depth
+                for k in range(succ_offsets[i], succ_offsets[i + 1]):
+                    j = succ_indices[k]
+                    in_degree[j] -= 1
+                    if in_degree[j] == 0:
+                        next_level.append(j)
+            order.extend(level)
+            next_level.sort(key=ids.__getitem__)
+            level = next_level
+            current_depth += 1
+        if len(order) != num_tasks:
+            # All remaining tasks still have a predecessor among them, so
+            # ordering them as a Graph raises a CycleError with the cycle(s)
+            remaining = [i for i in range(num_tasks) if in_degree[i] > 0]
+            self.subgraph(remaining).topological_ordering()
+
+        self.topological_order = order
+        self.level_offsets = level_offsets
+        self.depth = depth
+        return depth
+
+    def subgraph(self, indices):
+        """Builds a Graph with only some of the tasks (and their edges)"""
+        graph = Graph()
+        for i in indices:
+            graph.vertices[self.ids[i]] = Task(self.ids[i], self.loads[i])
+        for i in indices:
+            id = self.ids[i]
+            for j in self.successors(i):
+                succ_id = self.ids[j]
+                if succ_id in graph.vertices:
+                    graph.vertices[id].successors.add(succ_id)
+                    graph.vertices[succ_id].predecessors.add(id)
+        return graph
+
+    @staticmethod
+    def from_graph(graph):
+        """
+        Converts a Graph into a CompactGraph.
+
+        Task indices follow the insertion order of graph.vertices.
+
+        Parameters
+        ----------
+        graph : Graph object
+            Graph to convert
+
+        Returns
+        -------
+        CompactGraph object
+            Graph with the same tasks, edges, priorities and order
+        """
+        ids = list(graph.vertices)
+        index = {id: i for i, id in enumerate(ids)}
+        tasks = graph.vertices.values()
+        succ_offsets, succ_indices = _csr(
+            len(ids),
+            (sorted(index[s] for s in task.successors) for task in tasks))
+        pred_offsets, pred_indices = _csr(
+            len(ids),
+            (sorted(index[p] for p in task.predecessors) for task in tasks))
+        compact = CompactGraph(typed_array(ids) if _integer_ids(ids) else ids,
+                               typed_array(task.load for task in tasks),
+                               succ_offsets, succ_indices,
+                               pred_offsets, pred_indices)
+        compact.priority = typed_array(task.priority for task in tasks)
+        compact.topological_order = array(
+            'i', (index[id] for id in graph.topological_order))
+        compact.level_offsets = array('q', graph.level_offsets)
+        compact.depth = array('i', (graph.depth.get(id, 0) for id in ids))
+        if len(graph.height) == len(ids):
+            compact.top_level = typed_array(task.top_level for task in tasks)
+            compact.bottom_level = typed_array(task.bottom_level
+                                               for task in tasks)
+            compact.height = typed_array(graph.height[id] for id in ids)
+        return compact
+
+    @staticmethod
+    def from_tasks(tasks):
+        """
+        Builds a CompactGraph from a stream of tasks.
+
+        Parameters
+        ----------
+        tasks : iterable of (Task.id, load, list of Task.id)
+            Identifier, load and predecessors of each task, with
+            predecessors always appearing before their successors
+            (as produced by generator.generate_tasks)
+
+        Returns
+        -------
+        CompactGraph object
+            DAG of tasks, with its topological order computed
+        """
+        ids = list()
+        loads = list()
+        index = dict()
+        pred_offsets = array('q', [0])
+        pred_indices = array('i')
+        for id, load, predecessors in tasks:
+            index[id] = len(ids)
+            ids.append(id)
+            loads.append(load)
+            pred_indices.extend(sorted(index[p] for p in predecessors))
+            pred_offsets.append(len(pred_indices))
+        succ_offsets, succ_indices = _transpose(len(ids), pred_offsets,
+                                                pred_indices)
+        compact = CompactGraph(typed_array(ids) if _integer_ids(ids) else ids,
+                               typed_array(loads), succ_offsets, succ_indices,
+                               pred_offsets, pred_indices)
+        compact.topological_ordering()
+        return compact
+
+    @staticmethod
+    def from_chunks(chunks):
+        """
+        Builds a CompactGraph from chunks of tasks.
+
+        Parameters
+        ----------
+        chunks : iterable of (ids, loads, pred_offsets, pred_indices)
+            Chunks of tasks, as produced by generator.generate_chunks
+
+        Returns
+        -------
+        CompactGraph object
+            DAG of tasks, with its topological order computed
+        """
+        ids = array('q')
+        loads = array('q')
+        pred_offsets = array('q', [0])
+        pred_indices = array('i')
+        for chunk_ids, chunk_loads, chunk_offsets, chunk_indices in chunks:
+            ids.extend(chunk_ids)
+            loads.extend(chunk_loads)
+            shift = len(pred_indices)
+            pred_offsets.extend(offset + shift
+                                for offset in chunk_offsets[1:])
+            pred_indices.extend(chunk_indices)
+        succ_offsets, succ_indices = _transpose(len(ids), pred_offsets,
+                                                pred_indices)
+        compact = CompactGraph(ids, loads, succ_offsets, succ_indices,
+                               pred_offsets, pred_indices)
+        compact.topological_ordering()
+        return compact
+
+    def to_graph(self):
+        """
+        Converts the CompactGraph into a Graph.
+
+        Returns
+        -------
+        Graph object
+            Graph with the same tasks, edges, priorities and order
+        """
+        graph = Graph()
+        ids = self.ids
+        has_levels = len(self.height) == len(self)
+        for i in range(len(self)):
+            task = Task(ids[i], self.loads[i])
+            task.priority = self.priority[i]
+            if has_levels:
+                task.top_level = self.top_level[i]
+                task.bottom_level = self.bottom_level[i]
+                graph.height[task.id] = self.height[i]
+            task.predecessors.update(ids[j] for j in self.predecessors(i))
+            task.successors.update(ids[j] for j in self.successors(i))
+            graph.vertices[task.id] = task
+        graph.topological_order = [ids[i] for i in self.topological_order]
+        graph.level_offsets = list(self.level_offsets)
+        graph.depth = {ids[i]: depth for i, depth in enumerate(self.depth)}
+        return graph
+
+
+def _integer_ids(ids):
+    """Checks if task identifiers can be stored in an integer array"""
+    return all(type(id) is int for id in ids)
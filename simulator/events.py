@@ -0,0 +1,152 @@
+"""Module containing the event queues of the simulator.
+
+An event queue stores the completion events of running tasks, as
+(time, task key, resource id), and returns them in batches: all events
+that happen at the same time, sorted by task key. The simulator handles
+a whole batch before starting new tasks.
+
+Two implementations are available:
+- HeapEventQueue: a binary heap, O(log n) per event, for any loads;
+- BucketEventQueue: a circular array of buckets indexed by completion
+  time (a calendar queue with buckets of width one), O(1) per event,
+  for integer loads, plus O(1) per empty bucket skipped between batches.
+Both return the same batches in the same order.
+
+The buckets skipped during a simulation are at most its makespan, which
+is at most the total load, so 'auto' only chooses buckets when the mean
+load is small: with sparse or large loads (a chain of tasks of load
+60000), skipping empty buckets costs much more than a heap.
+"""
+
+import heapq   # for heaps (it implements only min-heaps)
+
+# Largest load for which 'auto' chooses a BucketEventQueue
+MAX_BUCKETS = 1 << 16
+# Largest mean load for which 'auto' chooses a BucketEventQueue
+MAX_MEAN_LOAD = 8
+
+
+class HeapEventQueue:
+    """
+    Event queue based on a binary heap.
+
+    Attributes
+    ----------
+    events : list of (time, task key, resource id)
+        Heap of events
+    """
+    def __init__(self):
+        self.events = list()
+
+    def __len__(self):
+        return len(self.events)
+
+    def push(self, time, key, res_id):
+        """Adds the completion event of a task"""
+        heapq.heappush(self.events, (time, key, res_id))
+
+    def peek_time(self):
+        """Time of the earliest event"""
+        return self.events[0][0]
+
+    def pop_batch(self):
+        """Removes all the earliest events.
+
+        Returns
+        -------
+        time : int or float
+            Time of the events
+        batch : list of (task key, resource id)
+            Events at that time, sorted by task key
+        """
+        time, key, res_id = heapq.heappop(self.events)
+        batch = [(key, res_id)]
+        while self.events and self.events[0][0] == time:
+            _, key, res_id = heapq.heappop(self.events)
+            batch.append((key, res_id))
+        return time, batch
+
+
+class BucketEventQueue:
+    """
+    Event queue based on buckets indexed by (integer) completion time.
+
+    Events must happen at most max_delay time units after the time of the
+    last batch, which holds when max_delay is the largest task load.
+
+    Attributes
+    ----------
+    buckets : list of lists of (task key, resource id)
+        Events of each time, modulo the number of buckets
+    time : int
+        Time of the last batch
+    """
+    def __init__(self, max_delay):
+        self.buckets = [list() for _ in range(max_delay + 1)]
+        self.time = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, time, key, res_id):
+        """Adds the completion event of a task"""
+        self.buckets[time % len(self.buckets)].append((key, res_id))
+        self._count += 1
+
+    def pop_batch(self):
+        """Removes all the earliest events (see HeapEventQueue.pop_batch)"""
+        buckets = self.buckets
+        size = len(buckets)
+        time = self.time
+        while not buckets[time % size]:
+            time += 1
+        batch = buckets[time % size]
+        buckets[time % size] = list()
+        self.time = time
+        self._count -= len(batch)
+        batch.sort()
+        return time, batch
+
+
+def make_event_queue(kind, loads):
+    """
+    Creates an event queue for a simulation.
+
+    Parameters
+    ----------
+    kind : str
+        'heap', 'bucket', or 'auto' (a BucketEventQueue if all loads are
+        integers no larger than MAX_BUCKETS, with a mean no larger than
+        MAX_MEAN_LOAD, a HeapEventQueue otherwise)
+    loads : iterable of numbers
+        Loads of all tasks
+
+    Returns
+    -------
+    HeapEventQueue or BucketEventQueue object
+        Empty event queue
+
+    Raises
+    ------
+    ValueError
+        If kind is 'bucket' and some loads are not non-negative integers
+    """
+    if kind == 'heap':
+        return HeapEventQueue()
+    if kind not in ['bucket', 'auto']:
+        raise ValueError(f'unknown event queue {kind!r}')
+    max_load = total = count = 0
+    for load in loads:
+        if not isinstance(load, int) or load < 0:
+            if kind == 'bucket':
+                raise ValueError('bucket event queues require non-negative '
+                                 'integer loads')
+            return HeapEventQueue()
+        max_load = max(max_load, load)
+        total += load
+        count += 1
+    if kind == 'auto' and (max_load > MAX_BUCKETS or
+                           total > MAX_MEAN_LOAD * count):
+        return HeapEventQueue()
+    return BucketEventQueue(max_load)
@@ -0,0 +1,249 @@
+"""Module executing graphs of Python callables.
+
+The simulator predicts the makespan of a graph; execute runs it for real:
+each task is bound to a callable, and ready tasks are dispatched to a
+pool of workers in priority order, following the same list-scheduling
+policy as simulate. Three backends are available:
+- 'thread': a ThreadPoolExecutor (for I/O-bound or GIL-releasing code);
+- 'process': a ProcessPoolExecutor (callables must be picklable);
+- 'asyncio': an event loop, where coroutine functions run as asyncio
+  tasks and other callables in threads.
+
+The report of an execution contains the measured start and finish time
+of each task and the makespan predicted by the simulator, which can be
+used to calibrate loads against actual running times.
+
+Example
+-------
+>>> functions = {id: partial(time.sleep, task.load / 100)
+...              for id, task in graph.vertices.items()}
+>>> report = execute(graph, functions, 4, backend='thread')
+>>> report.makespan, report.simulated_makespan * report.time_per_load
+"""
+
+import asyncio
+import heapq   # for heaps (it implements only min-heaps)
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, \
+    wait, FIRST_COMPLETED
+
+from simulator.compact import CompactGraph, typed_array
+from simulator.resources import ResourcePool
+from simulator.schedule import Schedule
+from simulator.simulator import simulate, _view
+
+BACKENDS = ['thread', 'process', 'asyncio']
+
+
+class ExecutionReport:
+    """
+    Report of the execution of a graph.
+
+    Attributes
+    ----------
+    results : dict of (Task.id, result)
+        Value returned by the callable of each task
+    schedule : Schedule object
+        Measured start and finish time (in seconds since the beginning of
+        the execution) and worker (slot from 0 to num_workers - 1) of
+        each task
+    makespan : float
+        Measured execution time (s)
+    simulated_makespan : int or float
+        Makespan predicted by simulate (in load units)
+    loads : list of numbers
+        Load of each task, in the order of the schedule
+    """
+    def __init__(self, results, schedule, makespan, simulated_makespan,
+                 loads):
+        self.results = results
+        self.schedule = schedule
+        self.makespan = makespan
+        self.simulated_makespan = simulated_makespan
+        self.loads = loads
+
+    def __repr__(self):
+        return (f'ExecutionReport({len(self.results)} tasks, makespan='
+                f'{self.makespan:.6f} s, simulated makespan='
+                f'{self.simulated_makespan})')
+
+    @property
+    def durations(self):
+        """Measured running time of each task (s)"""
+        return [finish - start for start, finish
+                in zip(self.schedule.start, self.schedule.finish)]
+
+    @property
+    def time_per_load(self):
+        """Average running time per load unit (s), to convert simulated
+        times into seconds"""
+        total_load = sum(self.loads)
+        return sum(self.durations) / total_load if total_load else 0.0
+
+
+def _timed(function):
+    """Runs a callable and returns its start time, finish time and
+    result"""
+    start = time.perf_counter()
+    result = function()
+    return start, time.perf_counter(), result
+
+
+async def _timed_async(function):
+    """Same as _timed for coroutine functions"""
+    start = time.perf_counter()
+    result = await function()
+    return start, time.perf_counter(), result
+
+
+def execute(graph, functions, num_workers, backend='thread',
+            priorities=None):
+    """
+    Executes a graph of callables.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        DAG of tasks (it is not modified)
+    functions : dict of (Task.id, callable)
+        Callable (without arguments) run for each task
+    num_workers : int
+        Number of tasks run at the same time
+    backend : str [default = 'thread']
+        'thread', 'process' or 'asyncio'
+    priorities : sequence of numbers [optional]
+        Priority of each task (see simulate); the priorities stored in
+        the graph are used by default
+
+    Returns
+    -------
+    ExecutionReport object
+        Results, measured schedule and simulated makespan
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown
+    Exception
+        The first exception raised by a callable, once the running tasks
+        have finished (no new task is started after it)
+
+    Notes
+    -----
+    Times are measured with time.perf_counter in the workers, which is
+    a system-wide clock on Linux and macOS, so it can be compared across
+    processes.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f'unknown backend {backend!r}')
+    keys, loads, successors, remaining, priority, _ = _view(graph)
+    if priorities is not None:
+        priority = priorities if isinstance(graph, CompactGraph) \
+            else dict(zip(keys, priorities))
+    ids = graph.ids if isinstance(graph, CompactGraph) else list(keys)
+    tasks = _Dispatcher(keys, ids, successors, remaining, priority,
+                        functions, num_workers)
+    if backend == 'asyncio':
+        asyncio.run(_run_asyncio(tasks))
+    else:
+        pool = ThreadPoolExecutor if backend == 'thread' \
+            else ProcessPoolExecutor
+        with pool(num_workers) as executor:
+            _run_pool(tasks, executor)
+
+    # All tasks have finished (see _run_pool)
+    start_time = min(tasks.start.values(), default=0)
+    schedule = Schedule(ids,
+                        typed_array([tasks.start[key] - start_time
+                                     for key in keys]),
+                        typed_array([tasks.finish[key] - start_time
+                                     for key in keys]),
+                        typed_array([tasks.worker[key] for key in keys]))
+    simulated = simulate(graph, num_workers, quiet=True,
+                         priorities=priorities)
+    return ExecutionReport({tasks.id_of(key): tasks.results[key]
+                            for key in keys},
+                           schedule, max(schedule.finish, default=0.0),
+                           simulated, [loads[key] for key in keys])
+
+
+class _Dispatcher:
+    """State of an execution shared by the backends: ready tasks ordered
+    by (priority, key), free workers, and measurements"""
+    def __init__(self, keys, ids, successors, remaining, priority,
+                 functions, num_workers):
+        self.successors = successors
+        self.remaining = remaining
+        self.priority = priority
+        self.functions = functions
+        self.workers = ResourcePool(num_workers)
+        self.ready = [(priority[key], key) for key in keys
+                      if not remaining[key]]
+        heapq.heapify(self.ready)
+        self.id_of = (lambda key: ids[key]) if isinstance(keys, range) \
+            else (lambda key: key)
+        self.start, self.finish, self.worker, self.results = \
+            dict(), dict(), dict(), dict()
+        self.error = None
+
+    def next_tasks(self):
+        """Pops the ready tasks that can start: (key, worker, callable)"""
+        while self.error is None and self.workers and self.ready:
+            _, key = heapq.heappop(self.ready)
+            worker = self.workers.acquire()
+            self.worker[key] = worker
+            yield key, worker, self.functions[self.id_of(key)]
+
+    def done(self, key, worker, outcome):
+        """Records a finished task and releases its successors"""
+        self.workers.release(worker)
+        try:
+            start, finish, result = outcome()
+        except Exception as error:
+            if self.error is None:
+                self.error = error
+            return
+        self.start[key], self.finish[key] = start, finish
+        self.results[key] = result
+        for succ in self.successors(key):
+            self.remaining[succ] -= 1
+            if not self.remaining[succ]:
+                heapq.heappush(self.ready, (self.priority[succ], succ))
+
+
+def _run_pool(tasks, executor):
+    """Executes the tasks with a concurrent.futures executor"""
+    running = dict()
+    while True:
+        for key, worker, function in tasks.next_tasks():
+            running[executor.submit(_timed, function)] = (key, worker)
+        if not running:
+            break
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+        # Handled in order of key, as in the simulator
+        for future in sorted(finished, key=lambda f: running[f][0]):
+            key, worker = running.pop(future)
+            tasks.done(key, worker, future.result)
+    if tasks.error is not None:
+        raise tasks.error
+
+
+async def _run_asyncio(tasks):
+    """Executes the tasks in an asyncio event loop"""
+    running = dict()
+    while True:
+        for key, worker, function in tasks.next_tasks():
+            if asyncio.iscoroutinefunction(function):
+                coroutine = _timed_async(function)
+            else:
+                coroutine = asyncio.to_thread(_timed, function)
+            running[asyncio.ensure_future(coroutine)] = (key, worker)
+        if not running:
+            break
+        finished, _ = await asyncio.wait(running,
+                                         return_when=asyncio.FIRST_COMPLETED)
+        for future in sorted(finished, key=lambda f: running[f][0]):
+            key, worker = running.pop(future)
+            tasks.done(key, worker, future.result)
+    if tasks.error is not None:
+        raise tasks.error
@@ -0,0 +1,234 @@
+"""Module containing the random generation of task graphs.
+
+Three generation modes are available (parameter 'mode'):
+- 'legacy': draws random numbers one task at a time, in the same order
+  as previous versions of Graph.generate_graph, so the same seed gives
+  the same graphs bit for bit;
+- 'python': draws loads and numbers of predecessors in batches with
+  random.Random.choices (no additional module needed);
+- 'numpy': draws loads, numbers of predecessors and predecessors in
+  vectorized form with a NumPy Generator (requires NumPy).
+
+All modes use a private random number generator per call, so they never
+touch the global state of the 'random' module and can run in several
+threads at the same time. For a given mode, seed and chunk size, the
+generated graph is always the same.
+
+The 'python' and 'numpy' modes generate tasks in chunks (see
+generate_chunks), which can be consumed one at a time to stream very
+large graphs, or gathered into a CompactGraph without Task objects.
+"""
+
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+MODES = ['legacy', 'python', 'numpy']
+# Default number of tasks per chunk
+CHUNK_SIZE = 1 << 16
+
+
+def generate_tasks(
+        num_tasks,
+        load_range,
+        dependency_range,
+        rename=False,
+        rng_seed=None
+        ):
+    """
+    Generates the tasks of a random graph one at a time ('legacy' mode).
+
+    Parameters are the same as in Graph.generate_graph.
+
+    Yields
+    ------
+    (Task.id, int, list of Task.id)
+        Identifier, load and predecessors of each task. Predecessors are
+        always generated before their successors.
+    """
+    min_load, max_load = load_range
+    min_dep, max_dep = dependency_range
+
+    # Translation of ordered to unordered ids if necessary
+    id = [i for i in range(num_tasks)]
+    if rename == True:
+        # Same sequence as seeding the global generator with rng_seed-1
+        random.Random(rng_seed-1).shuffle(id)
+
+    rng = random.Random(rng_seed)  # private random number generator
+    # Generate tasks
+    # The first one has to be a top (entry) vertex
+    load = rng.randrange(min_load, max_load)
+    yield id[0], load, []
+    # The other ones need to have their dependencies created
+    for task in range(1, num_tasks):
+        # Creates task
+        load = rng.randrange(min_load, max_load)
+        # Checks how many dependencies it should have
+        num_dep = rng.randrange(min_dep, max_dep)
+        # Checks if we have enough tasks to cover that
+        if num_dep < task:  # we do
+            # Gets a sample of valid predecessors
+            predecessors = rng.sample(range(task), k=num_dep)
+        else:  # we do not have enough tasks in the graph to depend
+            # so we just use all the previous tasks
+            predecessors = range(task)
+        yield id[task], load, [id[pred] for pred in predecessors]
+
+
+def generate_chunks(
+        num_tasks,
+        load_range,
+        dependency_range,
+        rename=False,
+        rng_seed=None,
+        mode='python',
+        chunk_size=CHUNK_SIZE
+        ):
+    """
+    Generates the tasks of a random graph in chunks.
+
+    Parameters
+    ----------
+    num_tasks, load_range, dependency_range, rename, rng_seed
+        Same as in Graph.generate_graph
+    mode : str [default = 'python']
+        'python' or 'numpy' (see the module documentation)
+    chunk_size : int [default = CHUNK_SIZE]
+        Number of tasks per chunk
+
+    Yields
+    ------
+    (ids, loads, pred_offsets, pred_indices)
+        Arrays describing consecutive tasks: their identifiers, their loads,
+        and their predecessors in CSR form. Offsets start at 0 in each
+        chunk, and predecessors are given by generation index (the
+        position of the task in the stream, not its identifier).
+        Predecessors of each task are sorted.
+
+    Raises
+    ------
+    ImportError
+        If mode is 'numpy' and NumPy is not installed
+    """
+    if mode == 'numpy':
+        if np is None:
+            raise ImportError("mode 'numpy' requires NumPy")
+        draw = _numpy_chunk
+        rng = np.random.default_rng(rng_seed)
+        ids = rng.permutation(num_tasks) if rename \
+            else np.arange(num_tasks)
+    elif mode == 'python':
+        draw = _python_chunk
+        rng = random.Random(rng_seed)
+        ids = list(range(num_tasks))
+        if rename:
+            rng.shuffle(ids)
+    else:
+        raise ValueError(f'unknown generation mode {mode!r}')
+
+    for start in range(0, num_tasks, chunk_size):
+        end = min(start + chunk_size, num_tasks)
+        loads, pred_offsets, pred_indices = draw(rng, start, end, load_range,
+                                                 dependency_range)
+        yield _as_array('q', ids[start:end]), loads, pred_offsets, \
+            pred_indices
+
+
+def _python_chunk(rng, start, end, load_range, dependency_range):
+    """Draws tasks start to end-1 with a random.Random"""
+    min_load, max_load = load_range
+    min_dep, max_dep = dependency_range
+    size = end - start
+    loads = array('q', rng.choices(range(min_load, max_load), k=size))
+    num_deps = rng.choices(range(min_dep, max_dep), k=size)
+    pred_offsets = array('q', [0])
+    pred_indices = array('i')
+    for task, num_dep in zip(range(start, end), num_deps):
+        if num_dep < task:
+            pred_indices.extend(sorted(rng.sample(range(task), k=num_dep)))
+        else:
+            pred_indices.extend(range(task))
+        pred_offsets.append(len(pred_indices))
+    return loads, pred_offsets, pred_indices
+
+
+def _numpy_chunk(rng, start, end, load_range, dependency_range):
+    """Draws tasks start to end-1 with a NumPy Generator.
+
+    Predecessors of all tasks of the chunk are drawn at once (with
+    replacement). The few tasks that got the same predecessor twice have
+    their predecessors drawn again, without replacement.
+    """
+    min_load, max_load = load_range
+    min_dep, max_dep = dependency_range
+    size = end - start
+    tasks = np.arange(start, end)
+    loads = rng.integers(min_load, max_load, size=size)
+    num_deps = rng.integers(min_dep, max_dep, size=size)
+    # Tasks with fewer possible predecessors than drawn depend on all
+    sampled = num_deps < tasks
+    counts = np.where(sampled, num_deps, tasks)
+    pred_offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=pred_offsets[1:])
+    pred_indices = np.empty(pred_offsets[-1], dtype=np.int64)
+
+    owners = np.repeat(tasks[sampled], counts[sampled])
+    draws = rng.integers(0, owners)
+    # Sorts predecessors by task, then by index
+    draws = draws[np.lexsort((draws, owners))]
+    repeated = (owners[1:] == owners[:-1]) & (draws[1:] == draws[:-1])
+    if repeated.any():
+        local = np.flatnonzero(sampled)
+        segment = np.zeros(len(local) + 1, dtype=np.int64)
+        np.cumsum(counts[sampled], out=segment[1:])
+        for s in np.unique(np.searchsorted(segment, np.flatnonzero(repeated),
+                                           side='right') - 1):
+            task = start + local[s]
+            draws[segment[s]:segment[s + 1]] = np.sort(
+                rng.choice(task, size=counts[local[s]], replace=False))
+
+    slots = np.repeat(sampled, counts)
+    pred_indices[slots] = draws
+    for i in np.flatnonzero(~sampled):
+        pred_indices[pred_offsets[i]:pred_offsets[i + 1]] = np.arange(
+            start + i)
+    return (_as_array('q', loads), _as_array('q', pred_offsets),
+            _as_array('i', pred_indices))
+
+
+def _as_array(typecode, values):
+    """Converts a NumPy array (or any sequence) into an array"""
+    if np is not None and isinstance(values, np.ndarray):
+        result = array(typecode)
+        dtype = np.int32 if typecode == 'i' else np.int64
+        result.frombytes(values.astype(dtype).tobytes())
+        return result
+    return array(typecode, values)
+
+
+def iter_tasks(chunks):
+    """
+    Converts chunks into a stream of tasks.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Chunks from generate_chunks
+
+    Yields
+    ------
+    (Task.id, int, list of Task.id)
+        Same as generate_tasks
+    """
+    ids = array('q')
+    for chunk_ids, loads, pred_offsets, pred_indices in chunks:
+        ids.extend(chunk_ids)
+        for i in range(len(chunk_ids)):
+            yield chunk_ids[i], loads[i], [
+                ids[j] for j in pred_indices[pred_offsets[i]:
+                                             pred_offsets[i + 1]]]
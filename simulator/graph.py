@@ -5,7 +5,23 @@ dependencies, and others.
 """
 
 
-import random
+import heapq   # for heaps (it implements only min-heaps)
+
+from simulator.generator import generate_tasks, generate_chunks, iter_tasks
+
+class CycleError(ValueError):
+    """
+    Error raised when a graph of tasks is not acyclic.
+
+    Attributes
+    ----------
+    vertices : list of Task.id
+        Tasks involved in the cycle(s)
+    """
+    def __init__(self, vertices):
+        self.vertices = vertices
+        super().__init__(f'Graph contains a cycle among tasks {vertices}')
+
 
 class Task:
     """
@@ -60,10 +76,36 @@ class Graph:
         Tasks in the graph
     topological_order : list of Task.id
         List of tasks in topological order
+    level_offsets : list of int
+        Index in topological_order where each depth level starts (empty
+        after the graph is edited, as the order is no longer grouped by
+        depth)
+    depth : dict of (Task.id, int)
+        Depth (level index) of each task in the topological order
+    height : dict of (Task.id, int)
+        Number of tasks in the longest path from each task to a bottom
+        vertex - to be computed (see simulator.levels)
+
+    Notes
+    -----
+    The methods add_task, remove_task, add_edge, remove_edge and set_load
+    edit the graph while keeping its topological order, depths and (if
+    computed) levels up to date. The order is repaired with the algorithm
+    of Pearce and Kelly, which only moves the tasks between the two ends
+    of a new edge, and levels are only recomputed for the tasks whose
+    levels change:
+    Pearce, D.J. and Kelly, P.H., 2007. A dynamic topological sort
+    algorithm for directed acyclic graphs. Journal of Experimental
+    Algorithmics, 11, pp.1-7.
     """
     def __init__(self):
         self.vertices = dict()
         self.topological_order = list()
+        self.level_offsets = list()
+        self.depth = dict()
+        self.height = dict()
+        # Index of each task in topological_order (built when editing)
+        self._position = None
 
     def __repr__(self):
         """Simplified representation of the graph"""
@@ -75,56 +117,368 @@ class Graph:
         return text
 
     def topological_ordering(self):
-        """Computed a topological order for the graph"""
-        self.topological_order = list()
-        checked_vertices = set()  # covered vertices
-        to_check = set()          # successors of covered vertices
-        # First step: find all top (entry) vertices
-        for id, vertex in self.vertices.items():
-            # No predecessor == top
-            if not vertex.predecessors:
-                checked_vertices.add(id)
-                self.topological_order.append(id)
-                # Adds successors to the list of vertices to check
-                to_check.update(list(vertex.successors))
-        # Second step: find an order for all other vertices
-        while to_check:
-            # Making sure the traversal is not adding a vertex more than once
-            to_check = to_check - checked_vertices
-            to_check_later = set()  # Vertices to check in another iteration
-            # Iterates over vertices to check
-            for id in to_check:
-                # Checks if all predecessors have been checked
-                vertex = self.vertices[id]
-                if vertex.predecessors.issubset(checked_vertices):
-                    # Then it can join the topological order
-                    self.topological_order.append(id)
-                    # Adds its successors can be considered for checking
-                    to_check_later.update(list(vertex.successors))
-                    # And adds it to the list of checked vertices
-                    checked_vertices.add(id)
-                else:
-                    # Adds it to be checked again later
-                    to_check_later.add(id)
-            # Updates the set to check for a new pass
-            to_check = to_check_later
-        # Checking if all vertices are in the topological_order
-        if len(self.vertices) != len(self.topological_order):
-            print('Error: topological order is missing items.')
+        """Computes a topological order for the graph in O(V log V + E).
+
+        Vertices are grouped by depth: entry vertices come first in
+        insertion order, and each following level is sorted by identifier,
+        so the order does not depend on the iteration order of sets. The
+        sorts take O(V log V) time; the rest of the pass is O(V+E). Levels
+        whose identifiers cannot be compared (e.g., integers and strings)
+        are in insertion order instead.
+
+        Returns
+        -------
+        dict of (Task.id, int)
+            Depth (level index) of each task, i.e., the number of edges in
+            the longest path from an entry vertex to the task
+
+        Raises
+        ------
+        CycleError
+            If the graph contains a cycle
+        """
+        vertices = self.vertices
+        # Number of predecessors of each vertex not yet in the order
+        in_degree = {id: len(task.predecessors)
+                     for id, task in vertices.items()}
+        # First level: all top (entry) vertices
+        level = [id for id, degree in in_degree.items() if degree == 0]
+        order = list()
+        level_offsets = list()
+        depth = dict()
+        current_depth = 0
+        insertion = None    # index of each vertex, if ids are not sortable
+        while level:
+            level_offsets.append(len(order))
+            next_level = list()
+            for id in level:
+                depth[id] = current_depth
+                # A successor joins the next level once its last
+                # predecessor has been ordered
+                for succ_id in vertices[id].successors:
+                    in_degree[succ_id] -= 1
+                    if in_degree[succ_id] == 0:
+                        next_level.append(succ_id)
+            order.extend(level)
+            try:
+                next_level.sort()
+            except TypeError:  # identifiers of different types
+                if insertion is None:
+                    insertion = {id: i for i, id in enumerate(vertices)}
+                next_level.sort(key=insertion.__getitem__)
+            level = next_level
+            current_depth += 1
+        # Vertices left with predecessors belong to or depend on a cycle
+        if len(order) != len(vertices):
+            raise CycleError(self._cyclic_vertices(in_degree))
+
+        self.topological_order = order
+        self.level_offsets = level_offsets
+        self.depth = depth
+        self._position = None
+        return depth
+
+    def _cyclic_vertices(self, in_degree):
+        """Filters the vertices left out of a topological order.
+
+        Vertices that only lead to exit vertices are peeled off, leaving
+        the ones on a cycle (or between two cycles).
+        """
+        remaining = {id for id, degree in in_degree.items() if degree > 0}
+        out_degree = {id: len(self.vertices[id].successors & remaining)
+                      for id in remaining}
+        stack = [id for id, degree in out_degree.items() if degree == 0]
+        while stack:
+            id = stack.pop()
+            remaining.discard(id)
+            for pred_id in self.vertices[id].predecessors:
+                if pred_id in remaining:
+                    out_degree[pred_id] -= 1
+                    if out_degree[pred_id] == 0:
+                        stack.append(pred_id)
+        return sorted(remaining)
 
     def reset_predecessors(self):
-        """Resets the lists of predecessors of each task"""
+        """Resets the lists of predecessors of each task.
+
+        Only needed if the sets of predecessors were modified by hand, as
+        the simulator no longer removes finished tasks from them.
+        """
         for id, task in self.vertices.items():
             for succ_id in task.successors:
                 self.vertices[succ_id].predecessors.add(id)
 
+    def _positions(self):
+        """Index of each task in the topological order, computing the
+        order first if needed"""
+        if len(self.topological_order) != len(self.vertices):
+            self.topological_ordering()
+        if self._position is None or \
+                len(self._position) != len(self.topological_order):
+            self._position = {id: i for i, id
+                              in enumerate(self.topological_order)}
+        return self._position
+
+    def _has_levels(self):
+        """Checks if the levels of all tasks are computed"""
+        return len(self.height) == len(self.vertices)
+
+    def add_task(self, id, load, predecessors=(), successors=()):
+        """Adds a task to the graph.
+
+        Parameters
+        ----------
+        id : Task.id
+            Identifier of the new task
+        load : int
+            Processing time of the task
+        predecessors, successors : iterables of Task.id [optional]
+            Tasks to connect to the new task
+
+        Returns
+        -------
+        set of Task.id
+            Tasks whose edges or levels changed (see add_edge)
+
+        Raises
+        ------
+        ValueError
+            If a task with the same identifier exists
+        CycleError
+            If the edges would create a cycle (the graph is not modified)
+        KeyError
+            If a predecessor or successor is not in the graph (the graph
+            is not modified)
+        """
+        if id in self.vertices:
+            raise ValueError(f'task {id} already exists')
+        position = self._positions()
+        levels = self._has_levels()
+        task = Task(id, load)
+        self.vertices[id] = task
+        # A task without edges can go anywhere, e.g., at the end
+        position[id] = len(self.topological_order)
+        self.topological_order.append(id)
+        self.level_offsets = list()
+        self.depth[id] = 0
+        if levels:
+            task.top_level = 0
+            task.bottom_level = load
+            self.height[id] = 1
+        changed = {id}
+        try:
+            for pred_id in predecessors:
+                changed |= self.add_edge(pred_id, id)
+            for succ_id in successors:
+                changed |= self.add_edge(id, succ_id)
+        except (CycleError, KeyError):
+            # Removes the task with the edges already added (restoring
+            # the levels of their other ends)
+            self.remove_task(id)
+            raise
+        return changed
+
+    def remove_task(self, id):
+        """Removes a task and its edges from the graph.
+
+        Removing the task from the topological order takes O(V) time.
+
+        Returns
+        -------
+        set of Task.id
+            Remaining tasks whose edges or levels changed
+        """
+        task = self.vertices[id]
+        changed = set()
+        for pred_id in list(task.predecessors):
+            changed |= self.remove_edge(pred_id, id)
+        for succ_id in list(task.successors):
+            changed |= self.remove_edge(id, succ_id)
+        position = self._positions()
+        index = position.pop(id)
+        del self.topological_order[index]
+        for i in range(index, len(self.topological_order)):
+            position[self.topological_order[i]] = i
+        del self.vertices[id]
+        self.depth.pop(id, None)
+        self.height.pop(id, None)
+        changed.discard(id)
+        return changed
+
+    def add_edge(self, pred_id, succ_id):
+        """Adds a dependency between two tasks.
+
+        Returns
+        -------
+        set of Task.id
+            The two tasks and the tasks whose levels changed
+
+        Raises
+        ------
+        CycleError
+            If the edge would create a cycle (the graph is not modified);
+            its vertices are the path from succ_id to pred_id
+        """
+        pred, succ = self.vertices[pred_id], self.vertices[succ_id]
+        if succ_id in pred.successors:
+            return set()
+        position = self._positions()
+        if pred_id == succ_id:
+            raise CycleError([pred_id])
+        if position[pred_id] > position[succ_id]:
+            self._reorder(pred_id, succ_id)
+        pred.successors.add(succ_id)
+        succ.predecessors.add(pred_id)
+        self.level_offsets = list()
+        return {pred_id, succ_id} | self._update_levels([succ_id], [pred_id])
+
+    def remove_edge(self, pred_id, succ_id):
+        """Removes a dependency between two tasks.
+
+        The topological order stays valid without changes.
+
+        Returns
+        -------
+        set of Task.id
+            The two tasks and the tasks whose levels changed
+        """
+        pred, succ = self.vertices[pred_id], self.vertices[succ_id]
+        if succ_id not in pred.successors:
+            return set()
+        self._positions()
+        pred.successors.discard(succ_id)
+        succ.predecessors.discard(pred_id)
+        self.level_offsets = list()
+        return {pred_id, succ_id} | self._update_levels([succ_id], [pred_id])
+
+    def set_load(self, id, load):
+        """Changes the processing time of a task.
+
+        Returns
+        -------
+        set of Task.id
+            The task and the tasks whose levels changed
+        """
+        task = self.vertices[id]
+        self._positions()
+        task.load = load
+        return {id} | self._update_levels(task.successors, [id])
+
+    def _reorder(self, pred_id, succ_id):
+        """Repairs the order before adding an edge from a task to an
+        earlier one (Pearce-Kelly).
+
+        Tasks reachable from succ_id and tasks reaching pred_id, between
+        the two in the order, are moved so the former come after the
+        latter, reusing the same positions.
+        """
+        vertices, order, position = self.vertices, self.topological_order, \
+            self._position
+        lower, upper = position[succ_id], position[pred_id]
+        # Tasks reachable from succ_id before pred_id (or a cycle)
+        forward = {succ_id: None}
+        stack = [succ_id]
+        while stack:
+            id = stack.pop()
+            for next_id in vertices[id].successors:
+                if next_id == pred_id:
+                    # Path succ_id -> ... -> id -> pred_id
+                    path = [id]
+                    while forward[path[-1]] is not None:
+                        path.append(forward[path[-1]])
+                    raise CycleError(path[::-1] + [pred_id])
+                if next_id not in forward and position[next_id] < upper:
+                    forward[next_id] = id
+                    stack.append(next_id)
+        # Tasks reaching pred_id after succ_id
+        backward = {pred_id}
+        stack = [pred_id]
+        while stack:
+            id = stack.pop()
+            for next_id in vertices[id].predecessors:
+                if next_id not in backward and position[next_id] > lower:
+                    backward.add(next_id)
+                    stack.append(next_id)
+        # Backward tasks first, then forward tasks, in the freed positions
+        backward = sorted(backward, key=position.__getitem__)
+        forward = sorted(forward, key=position.__getitem__)
+        slots = sorted(position[id] for id in backward + forward)
+        for slot, id in zip(slots, backward + forward):
+            order[slot] = id
+            position[id] = slot
+
+    def _update_levels(self, forward, backward):
+        """Updates depths and levels after an edit.
+
+        Depths and top levels are recomputed from the predecessors of the
+        tasks in forward, and bottom levels and heights from the
+        successors of the tasks in backward; changes are propagated in
+        topological order, so each task is updated at most once.
+
+        Returns
+        -------
+        set of Task.id
+            Tasks whose depth or levels changed
+        """
+        vertices, position = self.vertices, self._position
+        levels = self._has_levels()
+        changed = set()
+        heap = [(position[id], id) for id in set(forward)]
+        heapq.heapify(heap)
+        queued = set(forward)
+        while heap:
+            _, id = heapq.heappop(heap)
+            queued.discard(id)
+            task = vertices[id]
+            depth = max((self.depth[p] + 1 for p in task.predecessors),
+                        default=0)
+            top_level = max((vertices[p].top_level + vertices[p].load
+                             for p in task.predecessors), default=0) \
+                if levels else task.top_level
+            if depth == self.depth[id] and top_level == task.top_level:
+                continue
+            self.depth[id] = depth
+            task.top_level = top_level
+            changed.add(id)
+            for succ_id in task.successors:
+                if succ_id not in queued:
+                    queued.add(succ_id)
+                    heapq.heappush(heap, (position[succ_id], succ_id))
+        if not levels:
+            return changed
+        heap = [(-position[id], id) for id in set(backward)]
+        heapq.heapify(heap)
+        queued = set(backward)
+        while heap:
+            _, id = heapq.heappop(heap)
+            queued.discard(id)
+            task = vertices[id]
+            bottom_level = task.load + max(
+                (vertices[s].bottom_level for s in task.successors),
+                default=0)
+            height = 1 + max((self.height[s] for s in task.successors),
+                             default=0)
+            if bottom_level == task.bottom_level and \
+                    height == self.height[id]:
+                continue
+            task.bottom_level = bottom_level
+            self.height[id] = height
+            changed.add(id)
+            for pred_id in task.predecessors:
+                if pred_id not in queued:
+                    queued.add(pred_id)
+                    heapq.heappush(heap, (-position[pred_id], pred_id))
+        return changed
+
     @staticmethod
     def generate_graph(
             num_tasks,
             load_range,
             dependency_range,
             rename=False,
-            rng_seed=None
+            rng_seed=None,
+            compact=False,
+            mode='legacy'
             ):
         """
         Generates a graph of tasks.
@@ -141,45 +495,40 @@ class Graph:
             True if task identifiers have to be shuffled
         rng_seed : int [optional]
             Random number generator seed
+        compact : bool [default = False]
+            True if the graph should be built directly as a CompactGraph,
+            without creating Task objects
+        mode : str [default = 'legacy']
+            How random numbers are drawn: 'legacy' (same graphs as previous
+            versions), 'python' (batched) or 'numpy' (vectorized).
+            See simulator.generator for details.
 
         Returns
         -------
-        Graph object
+        Graph or CompactGraph object
             DAG of tasks
         """
+        if mode == 'legacy':
+            tasks = generate_tasks(num_tasks, load_range, dependency_range,
+                                   rename, rng_seed)
+            if compact:
+                from simulator.compact import CompactGraph
+                return CompactGraph.from_tasks(tasks)
+        else:
+            chunks = generate_chunks(num_tasks, load_range, dependency_range,
+                                     rename, rng_seed, mode)
+            if compact:
+                from simulator.compact import CompactGraph
+                return CompactGraph.from_chunks(chunks)
+            tasks = iter_tasks(chunks)
+
         graph = Graph()        # graph to generate and return
-        min_load, max_load = load_range
-        min_dep, max_dep = dependency_range
-
-        # Translation of ordered to unordered ids if necessary
-        id = [i for i in range(num_tasks)]
-        if rename == True:
-            random.seed(rng_seed-1)  # set random seed for the shuffle
-            random.shuffle(id)
-
-        random.seed(rng_seed)  # set random seed
-        # Generate tasks
-        # The first one has to be a top (entry) vertex
-        load = random.randrange(min_load, max_load)
-        graph.vertices[id[0]] = Task(id[0], load)
-        # The other ones need to have their dependencies created
-        for task in range(1, num_tasks):
-            # Creates task
-            load = random.randrange(min_load, max_load)
-            graph.vertices[id[task]] = Task(id[task], load)
-            # Checks how many dependencies it should have
-            num_dep = random.randrange(min_dep, max_dep)
-            # Checks if we have enough tasks to cover that
-            if num_dep < task:  # we do
-                # Gets a sample of valid predecessors and updates them
-                for pred in random.sample(range(task), k=num_dep):
-                    graph.vertices[id[task]].predecessors.add(id[pred])
-                    graph.vertices[id[pred]].successors.add(id[task])
-            else:  # we do not have enough tasks in the graph to depend
-                # so we just use all the previous tasks
-                for pred in range(task):
-                    graph.vertices[id[task]].predecessors.add(id[pred])
-                    graph.vertices[id[pred]].successors.add(id[task])
+        for id, load, predecessors in tasks:
+            task = Task(id, load)
+            graph.vertices[id] = task
+            for pred_id in predecessors:
+                task.predecessors.add(pred_id)
+                graph.vertices[pred_id].successors.add(id)
 
         # Last thing to generate: the topological order
         graph.topological_ordering()
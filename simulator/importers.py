@@ -0,0 +1,383 @@
+"""Module importing task graphs from workflow and benchmark formats.
+
+Supported formats:
+- DOT (Graphviz): directed graphs whose nodes have a load attribute
+  ('a [load=5]; a -> b -> c;'). Subgraphs are flattened (their
+  statements are read), but edges to or from a subgraph ('a -> {b c}')
+  and multi-line comments are not supported;
+- STG (Standard Task Graph set of Kasahara et al.): the number of tasks,
+  then one line per task with its identifier, processing time, number of
+  predecessors and predecessors, including a dummy entry task 0 and a
+  dummy exit task n + 1 of processing time 0;
+- WfCommons JSON (and Pegasus-style traces): the tasks (or jobs) of the
+  workflow, with their 'runtimeInSeconds' (or 'runtime'), 'parents' and
+  'children'. Tasks can be referred to by name or by id, and the tasks
+  of the specification and of the execution of a workflow (WfFormat 1.5)
+  are merged by id.
+
+Files are read as streams: the parsers keep one line (DOT, STG) or one
+task (JSON) in memory at a time, and the graph is accumulated in arrays
+(identifiers, loads, edges), from which a CompactGraph is built directly
+with its topological order. A Graph is only built from it if requested.
+
+Example
+-------
+>>> graph = read_graph('montage.json', compact=True)
+>>> schedulers.priority_by_cp(graph)
+>>> makespan = simulate(graph, 64)
+"""
+
+import json
+import os
+import re
+from array import array
+
+from simulator.compact import CompactGraph, typed_array, _transpose, \
+    _integer_ids
+
+FORMATS = ['dot', 'stg', 'wfcommons']
+# Format of each file extension (see read_graph)
+EXTENSIONS = {'.dot': 'dot', '.gv': 'dot', '.stg': 'stg',
+              '.json': 'wfcommons'}
+
+
+class GraphFormatError(ValueError):
+    """Error raised when a file does not follow its format"""
+
+
+class _Builder:
+    """Accumulates tasks and edges in arrays and builds a CompactGraph.
+
+    Tasks can be referred to before they are defined (with the default
+    load), and by several names (aliases).
+    """
+    def __init__(self, default_load):
+        self.default_load = default_load
+        self.index = dict()
+        self.ids = list()
+        self.loads = list()
+        self.sources = array('i')
+        self.targets = array('i')
+
+    def task(self, id):
+        """Returns the index of a task, adding it if it is new"""
+        i = self.index.get(id)
+        if i is None:
+            i = self.index[id] = len(self.ids)
+            self.ids.append(id)
+            self.loads.append(self.default_load)
+        return i
+
+    def define(self, id, aliases=()):
+        """Returns the index of a task also known by other names"""
+        i = self.index.get(id)
+        for alias in aliases:
+            if i is None:
+                i = self.index.get(alias)
+        if i is None:
+            i = self.task(id)
+        self.ids[i] = id
+        for name in (id,) + tuple(aliases):
+            self.index[name] = i
+        return i
+
+    def edge(self, pred, succ):
+        """Adds an edge between two task indices"""
+        self.sources.append(pred)
+        self.targets.append(succ)
+
+    def build(self, compact):
+        """Builds the graph, with its topological order"""
+        num_tasks = len(self.ids)
+        succ_offsets, succ_indices = _rows(num_tasks, self.sources,
+                                           self.targets)
+        pred_offsets, pred_indices = _transpose(num_tasks, succ_offsets,
+                                                succ_indices)
+        # Identifiers are sorted by the topological order, so they are all
+        # integers or all strings
+        ids = typed_array(self.ids) if _integer_ids(self.ids) \
+            else [str(id) for id in self.ids]
+        graph = CompactGraph(ids, typed_array(self.loads), succ_offsets,
+                             succ_indices, pred_offsets, pred_indices)
+        graph.topological_ordering()
+        return graph if compact else graph.to_graph()
+
+
+def _rows(num_rows, sources, targets):
+    """Builds the CSR arrays of a list of edges (counting sort), with
+    sorted rows and without duplicate edges"""
+    counts = array('q', [0]) * (num_rows + 1)
+    for i in sources:
+        counts[i + 1] += 1
+    for i in range(num_rows):
+        counts[i + 1] += counts[i]
+    grouped = array('i', [0]) * len(sources)
+    position = array('q', counts)
+    for i, j in zip(sources, targets):
+        grouped[position[i]] = j
+        position[i] += 1
+    offsets = array('q', [0]) * (num_rows + 1)
+    indices = array('i')
+    for i in range(num_rows):
+        indices.extend(sorted(set(grouped[counts[i]:counts[i + 1]])))
+        offsets[i + 1] = len(indices)
+    return offsets, indices
+
+
+def _number(text):
+    """Converts a text into an int, or a float if it is not an integer"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+# Tokens of DOT: edge operators, quoted strings, comments (outside quoted
+# strings, which may contain '//'), punctuation and identifiers (words or
+# numerals)
+_DOT_TOKEN = re.compile(r'->|--|"(?:[^"\\]|\\.)*"|//[^\n]*|[\[\]{};,=]|'
+                        r'-?[\w.]+')
+_DOT_KEYWORDS = {'strict', 'digraph', 'graph', 'subgraph', 'node', 'edge'}
+
+
+def _dot_statements(file):
+    """Yields the statements of a DOT file as lists of tokens; statements
+    end with ';', a brace or the end of a line (outside brackets)"""
+    statement = list()
+    brackets = 0
+    for line_number, line in enumerate(file, 1):
+        if line.lstrip().startswith('#'):
+            continue
+        for token in _DOT_TOKEN.findall(line):
+            if token.startswith('//'):
+                break
+            if token == '[':
+                brackets += 1
+            elif token == ']':
+                brackets -= 1
+            if token in ';{}' and not brackets:
+                if statement:
+                    yield line_number, statement
+                statement = list()
+            else:
+                statement.append(token)
+        if statement and not brackets:
+            yield line_number, statement
+            statement = list()
+    if statement:
+        yield line_number, statement
+
+
+def _dot_id(token):
+    """Task identifier of a DOT identifier (an int if it is one)"""
+    if token.startswith('"'):
+        return token[1:-1].replace('\\"', '"')
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def _read_dot(file, builder, path, load_attribute):
+    """Parses a DOT file into a builder"""
+    header = True
+    for line_number, tokens in _dot_statements(file):
+        if header and 'digraph' not in tokens:
+            raise GraphFormatError(f'{path}:{line_number}: not a directed '
+                                   f'graph')
+        header = False
+        if tokens[0] in _DOT_KEYWORDS:
+            continue    # header, subgraph or default attributes
+        if '--' in tokens:
+            raise GraphFormatError(f'{path}:{line_number}: undirected edge')
+        if '[' in tokens:
+            nodes, attributes = tokens[:tokens.index('[')], \
+                tokens[tokens.index('['):]
+        else:
+            nodes, attributes = tokens, []
+        if '=' in nodes:
+            continue    # graph attribute
+        if len(nodes) % 2 == 0 or any(token != '->'
+                                      for token in nodes[1::2]):
+            raise GraphFormatError(f'{path}:{line_number}: invalid '
+                                   f'statement {" ".join(tokens)!r}')
+        indices = [builder.task(_dot_id(token)) for token in nodes[::2]]
+        if len(indices) == 1:
+            # Node statement: looks for the load in the attribute lists
+            for k in range(len(attributes) - 2):
+                if attributes[k] == load_attribute and \
+                        attributes[k + 1] == '=':
+                    value = _dot_id(attributes[k + 2])
+                    try:
+                        builder.loads[indices[0]] = _number(str(value))
+                    except ValueError:
+                        raise GraphFormatError(
+                            f'{path}:{line_number}: invalid load '
+                            f'{value!r}') from None
+        for pred, succ in zip(indices, indices[1:]):
+            builder.edge(pred, succ)
+
+
+def _read_stg(file, builder, path, dummies):
+    """Parses an STG file into a builder"""
+    def tokens():
+        for line_number, line in enumerate(file, 1):
+            if not line.lstrip().startswith('#'):
+                for token in line.split():
+                    yield line_number, token
+
+    stream = tokens()
+    line_number = 0
+
+    def integer():
+        nonlocal line_number
+        try:
+            line_number, token = next(stream)
+            return int(token)
+        except StopIteration:
+            raise GraphFormatError(f'{path}: unexpected end of file') \
+                from None
+        except ValueError:
+            raise GraphFormatError(f'{path}:{line_number}: integer '
+                                   f'expected') from None
+
+    num_tasks = integer()
+    exit_id = num_tasks + 1
+    # Other lines (after the tasks) are comments or metadata
+    for _ in range(num_tasks + 2):
+        id, load, num_predecessors = integer(), integer(), integer()
+        predecessors = [integer() for _ in range(num_predecessors)]
+        if not dummies and id in (0, exit_id):
+            continue
+        i = builder.task(id)
+        builder.loads[i] = load
+        for pred_id in predecessors:
+            if not dummies and pred_id == 0:
+                continue
+            if pred_id not in builder.index:
+                raise GraphFormatError(f'{path}:{line_number}: predecessor '
+                                       f'{pred_id} of task {id} is not '
+                                       f'defined before it')
+            builder.edge(builder.index[pred_id], i)
+
+
+def _json_tasks(file, block_size):
+    """Yields the objects of the arrays named 'tasks' or 'jobs' of a JSON
+    file, reading it by blocks"""
+    decoder = json.JSONDecoder()
+    key = re.compile(r'"(?:tasks|jobs)"\s*:\s*\[')
+    space = re.compile(r'[\s,]*')
+    buffer, position = '', 0
+    in_array = False
+    end_of_file = False
+    while True:
+        if in_array:
+            position = space.match(buffer, position).end()
+            if position < len(buffer):
+                if buffer[position] == ']':
+                    in_array = False
+                    position += 1
+                    continue
+                try:
+                    value, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if end_of_file:
+                        raise
+                else:
+                    if isinstance(value, dict):
+                        yield value
+                    continue
+        else:
+            match = key.search(buffer, position)
+            if match is not None:
+                in_array = True
+                position = match.end()
+                continue
+            # Keeps the end of the buffer, which may start a key
+            position = max(position, len(buffer) - 16)
+        if end_of_file:
+            return
+        block = file.read(block_size)
+        end_of_file = not block
+        buffer = buffer[position:] + block
+        position = 0
+
+
+def _json_id(reference):
+    """Name of a task in a list of parents or children"""
+    if isinstance(reference, dict):
+        return reference.get('id', reference.get('name'))
+    return reference
+
+
+def _read_wfcommons(file, builder, path, block_size):
+    """Parses a WfCommons JSON file into a builder"""
+    try:
+        for task in _json_tasks(file, block_size):
+            names = [task[key] for key in ('id', 'name') if key in task]
+            if not names:
+                raise GraphFormatError(f'{path}: task without id or name')
+            i = builder.define(names[0], names[1:])
+            load = task.get('runtimeInSeconds', task.get('runtime'))
+            if load is not None:
+                builder.loads[i] = load
+            for parent in task.get('parents', ()):
+                builder.edge(builder.task(_json_id(parent)), i)
+            for child in task.get('children', ()):
+                builder.edge(i, builder.task(_json_id(child)))
+    except json.JSONDecodeError as error:
+        raise GraphFormatError(f'{path}: {error}') from None
+
+
+def read_graph(path, format=None, compact=False, default_load=1,
+               load_attribute='load', dummies=True, block_size=1 << 16):
+    """
+    Reads a task graph from a file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Name of the file to read
+    format : str [optional]
+        'dot', 'stg' or 'wfcommons' (by default, found from the extension
+        of the file, see EXTENSIONS)
+    compact : bool [default = False]
+        True if the graph should be built as a CompactGraph
+    default_load : int or float [default = 1]
+        Load of the tasks without one (DOT, WfCommons)
+    load_attribute : str [default = 'load']
+        Attribute of the nodes containing their load (DOT)
+    dummies : bool [default = True]
+        True if the dummy entry and exit tasks should be kept (STG)
+    block_size : int [default = 65536]
+        Number of characters read at once (WfCommons)
+
+    Returns
+    -------
+    Graph or CompactGraph object
+        DAG of tasks, with its topological order computed
+
+    Raises
+    ------
+    GraphFormatError
+        If the format is unknown or the file does not follow it
+    CycleError
+        If the graph contains a cycle
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in EXTENSIONS:
+            raise GraphFormatError(f'{path}: unknown extension, the '
+                                   f'format is needed')
+        format = EXTENSIONS[extension]
+    if format not in FORMATS:
+        raise GraphFormatError(f'unknown format {format!r}')
+    builder = _Builder(default_load)
+    with open(path) as file:
+        if format == 'dot':
+            _read_dot(file, builder, path, load_attribute)
+        elif format == 'stg':
+            _read_stg(file, builder, path, dummies)
+        else:
+            _read_wfcommons(file, builder, path, block_size)
+    return builder.build(compact)
@@ -0,0 +1,197 @@
+"""Module computing the top and bottom levels of the tasks of a DAG.
+
+Levels are computed in a single pass over the topological order (O(V+E)):
+- top level: largest weight of a path from a top vertex to the task,
+  excluding the task's weight;
+- bottom level: largest weight of a path from the task to a bottom
+  vertex, including the task's weight;
+- height: number of tasks in the longest path from the task to a bottom
+  vertex (the bottom level with unitary weights), as used by HLF.
+
+Results are cached in the graph (Task.top_level, Task.bottom_level and
+Graph.height, or the columns of the same names in a CompactGraph), so
+level-based priorities can reuse them through ensure_levels.
+
+If NumPy is available, compute_levels(graph, vectorized=True) processes
+a whole depth level of the topological order at a time.
+"""
+
+from simulator.compact import CompactGraph, typed_array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+def has_levels(graph):
+    """Checks if the levels of all tasks are cached in the graph"""
+    if isinstance(graph, CompactGraph):
+        return len(graph.height) == len(graph)
+    return len(graph.height) == len(graph.vertices)
+
+
+def ensure_levels(graph):
+    """Computes the levels of the graph if they are not cached yet.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to update levels
+    """
+    if not has_levels(graph):
+        compute_levels(graph)
+
+
+def compute_levels(graph, vectorized=False):
+    """Computes the top level, bottom level and height of all tasks.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to update levels
+    vectorized : bool [default = False]
+        True if the computation should use NumPy (one operation per depth
+        level instead of one per edge)
+
+    Raises
+    ------
+    ImportError
+        If vectorized is True and NumPy is not installed
+    """
+    if vectorized:
+        if np is None:
+            raise ImportError('vectorized levels require NumPy')
+        compact = graph if isinstance(graph, CompactGraph) \
+            else CompactGraph.from_graph(graph)
+        top, bottom, height = _numpy_levels(compact)
+        _store(graph, top.tolist(), bottom.tolist(), height.tolist())
+    elif isinstance(graph, CompactGraph):
+        _compact_levels(graph)
+    else:
+        _graph_levels(graph)
+
+
+def _graph_levels(graph):
+    """Pure Python level computation for a Graph"""
+    vertices = graph.vertices
+    if len(graph.topological_order) != len(vertices):
+        graph.topological_ordering()
+    order = graph.topological_order
+    for id in order:
+        task = vertices[id]
+        top_level = 0
+        for pred_id in task.predecessors:
+            pred = vertices[pred_id]
+            top_level = max(top_level, pred.top_level + pred.load)
+        task.top_level = top_level
+    height = dict()
+    for id in reversed(order):
+        task = vertices[id]
+        bottom_level = 0
+        task_height = 0
+        for succ_id in task.successors:
+            bottom_level = max(bottom_level, vertices[succ_id].bottom_level)
+            task_height = max(task_height, height[succ_id])
+        task.bottom_level = task.load + bottom_level
+        height[id] = task_height + 1
+    graph.height = height
+
+
+def _compact_levels(graph):
+    """Pure Python level computation for a CompactGraph"""
+    num_tasks = len(graph)
+    if len(graph.topological_order) != num_tasks:
+        graph.topological_ordering()
+    loads = graph.loads
+    pred_offsets, pred_indices = graph.pred_offsets, graph.pred_indices
+    succ_offsets, succ_indices = graph.succ_offsets, graph.succ_indices
+    top = [0] * num_tasks
+    bottom = [0] * num_tasks
+    height = [0] * num_tasks
+    for i in graph.topological_order:
+        top_level = 0
+        for k in range(pred_offsets[i], pred_offsets[i + 1]):
+            j = pred_indices[k]
+            top_level = max(top_level, top[j] + loads[j])
+        top[i] = top_level
+    for i in reversed(graph.topological_order):
+        bottom_level = 0
+        task_height = 0
+        for k in range(succ_offsets[i], succ_offsets[i + 1]):
+            j = succ_indices[k]
+            bottom_level = max(bottom_level, bottom[j])
+            task_height = max(task_height, height[j])
+        bottom[i] = loads[i] + bottom_level
+        height[i] = task_height + 1
+    _store(graph, top, bottom, height)
+
+
+def _numpy_levels(graph):
+    """Vectorized level computation over the depth levels of a CompactGraph.
+
+    Edges are grouped by the depth of one of their ends, so all edges
+    reaching the same depth level are handled by a few array operations.
+    """
+    num_tasks = len(graph)
+    # The order must be grouped by depth (it is not after edits)
+    if len(graph.topological_order) != num_tasks or \
+            (num_tasks and not graph.level_offsets):
+        graph.topological_ordering()
+    loads = np.asarray(graph.loads)
+    depth = np.asarray(graph.depth, dtype=np.int64)
+    num_levels = len(graph.level_offsets)
+    out_degree = np.diff(np.asarray(graph.succ_offsets, dtype=np.int64))
+    sources = np.repeat(np.arange(num_tasks), out_degree)
+    targets = np.asarray(graph.succ_indices, dtype=np.int64)
+
+    def sweep(groups, others, levels, combine):
+        """Calls combine once per depth level for the edges (groups[e],
+        others[e]) whose first end is in the level.
+
+        Edges are sorted by depth and then by task, so the edges of each
+        task are contiguous and can be reduced with ufunc.reduceat.
+        """
+        permutation = np.lexsort((groups, depth[groups]))
+        groups = groups[permutation]
+        others = others[permutation]
+        bounds = np.searchsorted(depth[groups], np.arange(num_levels + 1))
+        for level in levels:
+            start, end = bounds[level], bounds[level + 1]
+            if start == end:
+                continue
+            group = groups[start:end]
+            firsts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+            combine(group[firsts], others[start:end], firsts)
+
+    top = np.zeros(num_tasks, dtype=loads.dtype)
+    bottom = loads.copy()
+    height = np.ones(num_tasks, dtype=np.int64)
+
+    def update_top(tasks, preds, firsts):
+        top[tasks] = np.maximum.reduceat(top[preds] + loads[preds], firsts)
+
+    def update_bottom(tasks, succs, firsts):
+        bottom[tasks] = loads[tasks] + np.maximum.reduceat(bottom[succs],
+                                                           firsts)
+        height[tasks] = 1 + np.maximum.reduceat(height[succs], firsts)
+
+    # Top levels: a task is updated from its predecessors (lower depths)
+    sweep(targets, sources, range(num_levels), update_top)
+    # Bottom levels: a task is updated from its successors (higher depths)
+    sweep(sources, targets, reversed(range(num_levels)), update_bottom)
+    return top, bottom, height
+
+
+def _store(graph, top, bottom, height):
+    """Caches levels (lists indexed by position) in the graph"""
+    if isinstance(graph, CompactGraph):
+        graph.top_level = typed_array(top)
+        graph.bottom_level = typed_array(bottom)
+        graph.height = typed_array(height)
+        return
+    graph.height = dict()
+    for i, (id, task) in enumerate(graph.vertices.items()):
+        task.top_level = top[i]
+        task.bottom_level = bottom[i]
+        graph.height[id] = height[i]
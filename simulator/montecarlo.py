@@ -0,0 +1,247 @@
+"""Module running Monte-Carlo simulations with stochastic task loads.
+
+The load of a task is rarely known exactly. A Monte-Carlo study draws
+many load vectors around the loads of the graph (following a noise
+model), simulates each of them with each priority function, and
+summarizes the distribution of the makespans:
+>>> results = monte_carlo(graph, 20, [schedulers.priority_by_id,
+...                                   schedulers.priority_by_cp],
+...                       num_replicates=1000, model='lognormal',
+...                       spread=0.2, rng_seed=1)
+>>> results['priority_by_cp'].percentile(95)
+
+The graph and the priorities are computed once and shared by all
+replicates, which only change the loads given to simulate. Load vectors
+are drawn in a single vectorized pass if NumPy is available, and
+replicates are simulated in parallel by a pool of processes.
+
+Noise models (each draw multiplies the load of a task by a random
+factor, except for 'exponential'):
+- 'uniform': factor uniform in [1 - spread, 1 + spread];
+- 'normal': factor normal with mean 1 and standard deviation spread
+  (truncated at zero);
+- 'lognormal': factor lognormal with mean 1 and shape spread;
+- 'exponential': load exponential with mean the load of the task;
+- a function (rng, loads, num_replicates) returning the load vectors,
+  for any other (e.g., per-task) distribution; rng is a NumPy Generator
+  if NumPy is installed, and a random.Random object otherwise.
+"""
+
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from simulator.compact import CompactGraph
+from simulator.schedulers import priority_vector
+from simulator.simulator import simulate
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+MODELS = ['uniform', 'normal', 'lognormal', 'exponential']
+
+
+def draw_loads(graph, num_replicates, model='lognormal', spread=0.1,
+               rng_seed=None):
+    """
+    Draws random load vectors for the tasks of a graph.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph of tasks (its loads are the reference loads)
+    num_replicates : int
+        Number of load vectors to draw
+    model : str or function [default = 'lognormal']
+        Noise model (see the description of the module)
+    spread : float [default = 0.1]
+        Relative variability of the loads
+    rng_seed : int [optional]
+        Random number generator seed
+
+    Returns
+    -------
+    list of lists of float
+        Load vectors, in the order of graph.vertices (or of the task
+        indices, for a CompactGraph)
+
+    Raises
+    ------
+    ValueError
+        If the model is unknown
+    """
+    if isinstance(graph, CompactGraph):
+        loads = list(graph.loads)
+    else:
+        loads = [task.load for task in graph.vertices.values()]
+    if callable(model):
+        rng = np.random.default_rng(rng_seed) if np is not None \
+            else random.Random(rng_seed)
+        return [list(vector) for vector
+                in model(rng, loads, num_replicates)]
+    if model not in MODELS:
+        raise ValueError(f'unknown noise model {model!r}')
+    if np is not None:
+        return _numpy_loads(loads, num_replicates, model, spread,
+                            rng_seed).tolist()
+    return _python_loads(loads, num_replicates, model, spread, rng_seed)
+
+
+def _numpy_loads(loads, num_replicates, model, spread, rng_seed):
+    """Draws all load vectors at once (num_replicates x tasks array)"""
+    rng = np.random.default_rng(rng_seed)
+    base = np.asarray(loads, dtype=np.float64)
+    size = (num_replicates, len(loads))
+    if model == 'uniform':
+        return base * rng.uniform(1 - spread, 1 + spread, size)
+    if model == 'normal':
+        return base * np.maximum(rng.normal(1, spread, size), 0)
+    if model == 'lognormal':
+        return base * rng.lognormal(-spread ** 2 / 2, spread, size)
+    return rng.exponential(1, size) * base
+
+
+def _python_loads(loads, num_replicates, model, spread, rng_seed):
+    """Pure Python version of _numpy_loads"""
+    rng = random.Random(rng_seed)
+    if model == 'uniform':
+        factor = lambda: rng.uniform(1 - spread, 1 + spread)
+    elif model == 'normal':
+        factor = lambda: max(rng.gauss(1, spread), 0)
+    elif model == 'lognormal':
+        factor = lambda: rng.lognormvariate(-spread ** 2 / 2, spread)
+    else:
+        factor = lambda: rng.expovariate(1)
+    return [[load * factor() for load in loads]
+            for _ in range(num_replicates)]
+
+
+class MonteCarloResult:
+    """
+    Makespans of the replicates of a Monte-Carlo study.
+
+    Attributes
+    ----------
+    makespans : list of numbers
+        Makespan of each replicate
+    """
+    def __init__(self, makespans):
+        self.makespans = makespans
+
+    def __repr__(self):
+        low, high = self.confidence_interval()
+        return (f'MonteCarloResult({len(self.makespans)} replicates, '
+                f'mean={self.mean:.3f}, 95% CI=[{low:.3f}, {high:.3f}])')
+
+    @property
+    def mean(self):
+        """Average makespan"""
+        return statistics.fmean(self.makespans)
+
+    @property
+    def stdev(self):
+        """Standard deviation of the makespans (0 for one replicate)"""
+        if len(self.makespans) < 2:
+            return 0.0
+        return statistics.stdev(self.makespans)
+
+    def percentile(self, q):
+        """Makespan below which q percent of the replicates fall (linear
+        interpolation between replicates)"""
+        values = sorted(self.makespans)
+        position = (len(values) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * \
+            (position - lower)
+
+    def confidence_interval(self, level=0.95):
+        """Confidence interval of the mean makespan (normal
+        approximation)"""
+        z = statistics.NormalDist().inv_cdf((1 + level) / 2)
+        margin = z * self.stdev / math.sqrt(len(self.makespans))
+        return self.mean - margin, self.mean + margin
+
+
+def _simulate_replicates(graph, num_resources, priorities, load_vectors,
+                         speeds):
+    """Simulates load vectors with each priority vector.
+
+    Returns
+    -------
+    dict of (str, list of numbers)
+        Makespans of each priority
+    """
+    return {name: [simulate(graph, num_resources, quiet=True,
+                            priorities=vector, loads=loads, speeds=speeds)
+                   for loads in load_vectors]
+            for name, vector in priorities.items()}
+
+
+def monte_carlo(graph, num_resources, priorities, num_replicates=100,
+                model='lognormal', spread=0.1, rng_seed=None, speeds=None,
+                max_workers=None):
+    """
+    Runs a Monte-Carlo study of the makespan.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph of tasks (it is not modified)
+    num_resources : int
+        Number of resources to simulate
+    priorities : list of functions
+        Priority functions to compare (e.g., from simulator.schedulers)
+    num_replicates : int [default = 100]
+        Number of load vectors to simulate
+    model, spread, rng_seed
+        Same as in draw_loads
+    speeds : list of numbers [optional]
+        Speed factor of each resource (see simulate)
+    max_workers : int [optional]
+        Number of processes (all cores by default, 1 to run in the
+        current process)
+
+    Returns
+    -------
+    dict of (str, MonteCarloResult object)
+        Results by name of priority function; all priorities are
+        simulated with the same load vectors
+
+    Raises
+    ------
+    ValueError
+        If num_replicates is not positive, or the model is unknown
+    """
+    if num_replicates < 1:
+        raise ValueError(f'at least one replicate is needed, got '
+                         f'{num_replicates}')
+    vectors = {function.__name__: priority_vector(graph, function)
+               for function in priorities}
+    load_vectors = draw_loads(graph, num_replicates, model, spread,
+                              rng_seed)
+    makespans = {name: list() for name in vectors}
+    if max_workers == 1:
+        chunks = [_simulate_replicates(graph, num_resources, vectors,
+                                       load_vectors, speeds)]
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            # One chunk of replicates per process, so the graph is only
+            # sent a few times
+            num_chunks = min(max_workers or os.cpu_count() or 1,
+                             num_replicates)
+            size = math.ceil(num_replicates / num_chunks)
+            futures = [executor.submit(_simulate_replicates, graph,
+                                       num_resources, vectors,
+                                       load_vectors[i:i + size], speeds)
+                       for i in range(0, num_replicates, size)]
+            chunks = [future.result() for future in futures]
+    for chunk in chunks:
+        for name, values in chunk.items():
+            makespans[name].extend(values)
+    return {name: MonteCarloResult(values)
+            for name, values in makespans.items()}
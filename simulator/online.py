@@ -0,0 +1,182 @@
+"""Module containing the online (streaming) simulator.
+
+simulate needs the whole graph at time zero. An OnlineSimulator instead
+receives tasks while it runs: each task is submitted with its load,
+priority, predecessors (among the tasks already submitted) and release
+time, and the simulation advances on demand, yielding START and END
+events lazily. Finished tasks are forgotten, so the memory used depends
+on the number of unfinished tasks, not on the length of the run.
+
+Edges are only given when a task is submitted (from its predecessors):
+edges cannot be added between tasks already submitted, so a task must be
+submitted after all its predecessors.
+
+Example
+-------
+>>> from simulator.trace import KINDS
+>>> online = OnlineSimulator(4)
+>>> online.submit('a', 5)
+>>> online.submit('b', 3, predecessors=['a'], release_time=2)
+>>> for kind, time, id, res_id in online.run(until=10):
+...     print(KINDS[kind], time, id, res_id)
+>>> online.submit('c', 1, release_time=12)
+>>> events = list(online.run())
+"""
+
+import heapq   # for heaps (it implements only min-heaps)
+
+from simulator.events import HeapEventQueue
+from simulator.resources import ResourcePool
+from simulator.trace import START, END
+
+
+class OnlineSimulator:
+    """
+    Simulation of tasks submitted over time.
+
+    Tasks are started following the same rules as simulate: by priority,
+    then identifier, and all tasks finishing at the same time are handled
+    before new tasks are started.
+
+    Parameters
+    ----------
+    num_resources : int
+        Number of resources to simulate
+    speeds : list of numbers [optional]
+        Speed factor of each resource (see simulate)
+
+    Attributes
+    ----------
+    time : int or float
+        Current time of the simulation
+    num_finished : int
+        Number of tasks finished so far
+    """
+    def __init__(self, num_resources, speeds=None):
+        self.time = 0
+        self.num_finished = 0
+        self._resources = ResourcePool(num_resources, speeds)
+        self._events = HeapEventQueue()
+        # Unfinished tasks: id -> [load, priority, number of unfinished
+        # predecessors, list of successors, True if released]
+        self._tasks = dict()
+        # Tasks waiting for their release time: (time, order, id)
+        self._releases = list()
+        self._num_submitted = 0
+        # Released tasks without unfinished predecessors: (priority, id)
+        self._ready = list()
+
+    def __len__(self):
+        """Number of unfinished tasks"""
+        return len(self._tasks)
+
+    def submit(self, id, load, priority=-1, predecessors=(),
+               release_time=None):
+        """
+        Adds a task to the simulation.
+
+        Parameters
+        ----------
+        id : Task.id
+            Task identifier (unique among unfinished tasks)
+        load : int or float
+            Processing time of the task
+        priority : number [default = -1]
+            Priority of the task (smaller values run first)
+        predecessors : iterable of Task.id [optional]
+            Tasks that must finish before this one starts; tasks that are
+            not unfinished tasks of the simulation are considered finished
+        release_time : int or float [optional]
+            Time at which the task arrives (default: the current time)
+
+        Raises
+        ------
+        ValueError
+            If an unfinished task has the same identifier, or the release
+            time is in the past
+        """
+        if id in self._tasks:
+            raise ValueError(f'task {id} is already in the simulation')
+        if release_time is None:
+            release_time = self.time
+        elif release_time < self.time:
+            raise ValueError(f'release time {release_time} is before the '
+                             f'current time {self.time}')
+        remaining = 0
+        for pred_id in set(predecessors):
+            pred = self._tasks.get(pred_id)
+            if pred is not None:
+                pred[3].append(id)
+                remaining += 1
+        self._tasks[id] = [load, priority, remaining, list(), False]
+        heapq.heappush(self._releases,
+                       (release_time, self._num_submitted, id))
+        self._num_submitted += 1
+
+    def run(self, until=None):
+        """
+        Advances the simulation.
+
+        Events are computed as they are consumed, so tasks can be
+        submitted between two events (with release times no earlier than
+        the current time).
+
+        Parameters
+        ----------
+        until : int or float [optional]
+            Time up to which the simulation runs (default: until all
+            submitted tasks have finished)
+
+        Yields
+        ------
+        (int, int or float, Task.id, int)
+            Event kind (trace.START or trace.END), time, task identifier
+            and resource id
+        """
+        tasks, ready, resources = self._tasks, self._ready, self._resources
+        events, releases = self._events, self._releases
+        while True:
+            # Starts ready tasks while there are free resources
+            while resources and ready:
+                res_id = resources.acquire()
+                _, id = heapq.heappop(ready)
+                end_time = self.time + resources.duration(res_id,
+                                                          tasks[id][0])
+                events.push(end_time, id, res_id)
+                yield START, self.time, id, res_id
+
+            # Moves to the next completion or release
+            times = list()
+            if events:
+                times.append(events.peek_time())
+            if releases:
+                times.append(releases[0][0])
+            if not times or (until is not None and min(times) > until):
+                if until is not None and until > self.time:
+                    self.time = until
+                return
+            next_time = min(times)
+            self.time = next_time
+
+            # The state is updated before events are yielded, so it stays
+            # consistent if the caller stops iterating
+            batch = list()
+            if events and events.peek_time() == next_time:
+                _, batch = events.pop_batch()
+                for id, res_id in batch:
+                    successors = tasks.pop(id)[3]
+                    self.num_finished += 1
+                    for succ_id in successors:
+                        succ = tasks[succ_id]
+                        succ[2] -= 1
+                        if not succ[2] and succ[4]:
+                            heapq.heappush(ready, (succ[1], succ_id))
+                    resources.release(res_id)
+            while releases and releases[0][0] == next_time:
+                _, _, id = heapq.heappop(releases)
+                task = tasks[id]
+                task[4] = True
+                if not task[2]:
+                    heapq.heappush(ready, (task[1], id))
+            for id, res_id in batch:
+                yield END, next_time, id, res_id
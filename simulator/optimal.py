@@ -0,0 +1,300 @@
+"""Module computing optimal schedules of small graphs.
+
+The priority functions of simulator.schedulers are heuristics. To know
+how good they are, optimal_schedule computes a schedule of minimal
+makespan (for identical resources, without preemption) by
+branch-and-bound, for graphs of up to a few tens of tasks:
+>>> result = optimal_schedule(graph, 4)
+>>> result.makespan, simulate(graph, 4, quiet=True)
+
+The search only starts tasks when a task finishes (or at time zero),
+which loses no optimal schedule: in an optimal schedule, every task can
+be moved earlier until it starts when a predecessor or the previous task
+of its resource finishes. At each of these times, it tries each set of
+ready tasks that fits on the free resources (including none, to leave
+resources idle until the next completion), and it:
+- starts from the makespan of the critical path heuristic, and prunes
+  the states whose lower bound (critical path, remaining work) cannot
+  improve on the best makespan found;
+- memoizes states (finished tasks as a bitmask, and remaining times of
+  the running tasks) with the earliest time they were reached, and
+  prunes states reached again later;
+- prunes dominated sets of tasks: leaving a resource idle while a ready
+  task would finish before the next completion, and starting
+  interchangeable tasks (same load, predecessors and successors) in
+  another order than their index.
+
+With max_workers > 1, the subtrees of the first decision are explored in
+parallel by a pool of processes (each with its own memoization).
+"""
+
+import heapq   # for heaps (it implements only min-heaps)
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from simulator.bounds import lower_bounds
+from simulator.compact import CompactGraph, typed_array
+from simulator.schedule import Schedule
+from simulator.schedulers import priority_by_cp
+from simulator.simulator import simulate, _view
+
+
+class OptimalResult:
+    """
+    Result of optimal_schedule.
+
+    Attributes
+    ----------
+    makespan : int or float
+        Best makespan found
+    schedule : Schedule object
+        Schedule with this makespan
+    optimal : bool
+        True if the makespan is proven optimal (False if the search was
+        stopped by max_nodes)
+    nodes : int
+        Number of states explored
+    """
+    def __init__(self, makespan, schedule, optimal, nodes):
+        self.makespan = makespan
+        self.schedule = schedule
+        self.optimal = optimal
+        self.nodes = nodes
+
+    def __repr__(self):
+        return (f'OptimalResult(makespan={self.makespan}, '
+                f'optimal={self.optimal}, nodes={self.nodes})')
+
+
+class _Search:
+    """Branch-and-bound over the states of the schedule; tasks are
+    referred to by their index from 0 to num_tasks - 1"""
+    def __init__(self, loads, successors, predecessors, num_resources,
+                 max_nodes):
+        num_tasks = len(loads)
+        self.loads = loads
+        self.successors = successors
+        self.num_resources = num_resources
+        self.max_nodes = max_nodes
+        self.all_tasks = (1 << num_tasks) - 1
+        self.pred_mask = [sum(1 << j for j in preds)
+                          for preds in predecessors]
+        self.integer = all(isinstance(load, int) for load in loads)
+        # Bottom levels, in reverse topological order
+        self.bottom_level = [0] * num_tasks
+        for i in reversed(_topological_order(successors, predecessors)):
+            self.bottom_level[i] = loads[i] + max(
+                (self.bottom_level[j] for j in successors[i]), default=0)
+        # Previous interchangeable task of each task (or -1)
+        self.twin = [-1] * num_tasks
+        last = dict()
+        for i in range(num_tasks):
+            signature = (loads[i], tuple(sorted(predecessors[i])),
+                         tuple(sorted(successors[i])))
+            self.twin[i] = last.get(signature, -1)
+            last[signature] = i
+        # Ready tasks are tried by decreasing bottom level
+        self.preference = sorted(range(num_tasks),
+                                 key=lambda i: -self.bottom_level[i])
+        self.nodes = 0
+        self.memo = dict()
+        self.best = None
+        self.best_start = None
+        self.stopped = False
+
+    def lower_bound(self, time, finished, running):
+        """Lower bound on the makespan of the schedules from a state"""
+        bound = time
+        work = 0
+        started = finished
+        for end, i in running:
+            started |= 1 << i
+            work += end - time
+            bound = max(bound, end + self.bottom_level[i] - self.loads[i])
+        for i in range(len(self.loads)):
+            if not started >> i & 1:
+                work += self.loads[i]
+                bound = max(bound, time + self.bottom_level[i])
+        if self.integer:
+            work = -(-work // self.num_resources)
+        else:
+            work /= self.num_resources
+        return max(bound, time + work)
+
+    def children(self, time, finished, running):
+        """Yields the states following a state, for each set of ready
+        tasks started: (time, finished, running, started tasks)"""
+        started = finished
+        for _, i in running:
+            started |= 1 << i
+        ready = [i for i in self.preference
+                 if not started >> i & 1
+                 and not self.pred_mask[i] & ~finished]
+        free = self.num_resources - len(running)
+        for size in range(min(free, len(ready)), -1, -1):
+            if not size and not running:
+                break
+            for tasks in itertools.combinations(ready, size):
+                chosen = started
+                for i in tasks:
+                    chosen |= 1 << i
+                if any(self.twin[i] >= 0 and not chosen >> self.twin[i] & 1
+                       for i in tasks):
+                    continue
+                new_running = running + [(time + self.loads[i], i)
+                                         for i in tasks]
+                next_time = min(new_running)[0]
+                if size < free and any(
+                        time + self.loads[i] <= next_time
+                        for i in ready if not chosen >> i & 1):
+                    continue    # dominated by also starting that task
+                # Moves to the next completion
+                new_finished = finished
+                for end, i in new_running:
+                    if end == next_time:
+                        new_finished |= 1 << i
+                yield (next_time, new_finished,
+                       [(end, i) for end, i in new_running
+                        if end != next_time], tasks)
+
+    def run(self, time, finished, running, start):
+        """Explores the states from a state (depth first)"""
+        if finished == self.all_tasks:
+            if self.best is None or time < self.best:
+                self.best, self.best_start = time, list(start)
+            return
+        if self.stopped:
+            return
+        if self.best is not None and \
+                self.lower_bound(time, finished, running) >= self.best:
+            return
+        key = (finished, tuple(sorted((end - time, i)
+                                      for end, i in running)))
+        if self.memo.get(key, time + 1) <= time:
+            return
+        self.memo[key] = time
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.stopped = True
+        for next_time, new_finished, new_running, tasks in \
+                self.children(time, finished, running):
+            for i in tasks:
+                start[i] = time
+            self.run(next_time, new_finished, new_running, start)
+
+
+def _topological_order(successors, predecessors):
+    """Topological order of task indices (Kahn's algorithm)"""
+    remaining = [len(preds) for preds in predecessors]
+    order = [i for i, count in enumerate(remaining) if not count]
+    for i in order:
+        for j in successors[i]:
+            remaining[j] -= 1
+            if not remaining[j]:
+                order.append(j)
+    return order
+
+
+def _explore(search, best, best_start, states):
+    """Explores subtrees in a worker process.
+
+    Returns
+    -------
+    (int or float, list, int, bool)
+        Best makespan, its start times, number of states explored, and
+        True if the search was stopped
+    """
+    search.best, search.best_start = best, best_start
+    for time, finished, running, start in states:
+        search.run(time, finished, running, start)
+    return search.best, search.best_start, search.nodes, search.stopped
+
+
+def optimal_schedule(graph, num_resources, max_workers=1, max_nodes=None):
+    """
+    Computes a schedule of minimal makespan.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        DAG of tasks (it is not modified); meant for a few tens of tasks
+    num_resources : int
+        Number of (identical) resources
+    max_workers : int [default = 1]
+        Number of processes exploring the search tree (None for all
+        cores)
+    max_nodes : int [optional]
+        Number of states after which the search stops (in each process),
+        returning the best schedule found so far
+
+    Returns
+    -------
+    OptimalResult object
+        Best makespan and schedule, and whether it is proven optimal
+    """
+    keys, loads, successors, in_degree, _, _ = _view(graph)
+    keys = list(keys)
+    index = {key: i for i, key in enumerate(keys)}
+    task_loads = [loads[key] for key in keys]
+    task_successors = [[index[succ] for succ in successors(key)]
+                       for key in keys]
+    task_predecessors = [[] for _ in keys]
+    for i, succs in enumerate(task_successors):
+        for j in succs:
+            task_predecessors[j].append(i)
+    ids = graph.ids if isinstance(graph, CompactGraph) else keys
+
+    # Upper bound: list schedule with critical path priorities
+    makespan, schedule = simulate(graph, num_resources, quiet=True,
+                                  schedule=True,
+                                  priorities=priority_by_cp(graph,
+                                                            vector=True))
+    search = _Search(task_loads, task_successors, task_predecessors,
+                     num_resources, max_nodes)
+    if makespan <= lower_bounds(graph, num_resources).value:
+        return OptimalResult(makespan, schedule, True, 0)
+    best, best_start = makespan, list(schedule.start)
+
+    root = (0, 0, [], [0] * len(keys))
+    if max_workers == 1:
+        best, best_start, nodes, stopped = _explore(search, best, best_start,
+                                                    [root])
+    else:
+        # Subtrees of the first decision, spread over the processes (the
+        # tasks started at time zero already have a start time of zero)
+        states = [(time, finished, running, [0] * len(keys))
+                  for time, finished, running, _
+                  in search.children(0, 0, [])]
+        num_chunks = min(max_workers or os.cpu_count() or 1, len(states))
+        with ProcessPoolExecutor(max_workers) as executor:
+            futures = [executor.submit(_explore, search, best, best_start,
+                                       states[i::num_chunks])
+                       for i in range(num_chunks)]
+            nodes, stopped = 0, False
+            for future in futures:
+                result = future.result()
+                if result[0] < best:
+                    best, best_start = result[0], result[1]
+                nodes += result[2]
+                stopped = stopped or result[3]
+    if best == makespan:
+        return OptimalResult(makespan, schedule, not stopped, nodes)
+    return OptimalResult(best, _schedule(ids, task_loads, best_start,
+                                         num_resources),
+                         not stopped, nodes)
+
+
+def _schedule(ids, loads, start, num_resources):
+    """Builds a Schedule from start times, assigning resources"""
+    free = list(range(num_resources))
+    running = list()   # (finish time, resource)
+    resource = [0] * len(loads)
+    for i in sorted(range(len(loads)), key=lambda i: start[i]):
+        while running and running[0][0] <= start[i]:
+            heapq.heappush(free, heapq.heappop(running)[1])
+        resource[i] = heapq.heappop(free)
+        heapq.heappush(running, (start[i] + loads[i], resource[i]))
+    return Schedule(ids, typed_array(start),
+                    typed_array(s + load for s, load in zip(start, loads)),
+                    typed_array(resource))
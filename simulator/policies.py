@@ -0,0 +1,110 @@
+"""Module containing dynamic scheduling policies.
+
+Priority functions (see simulator.schedulers) fix the priority of each
+task before the simulation. A policy instead computes priorities during
+the simulation, when tasks become ready and after each batch of tasks
+finishes, and can change the priority of tasks already in the ready
+queue (see simulator.ready.ReadyQueue):
+>>> makespan = simulate(graph, 20, policy=EnablingPolicy(graph))
+
+Priorities are numbers (smaller values are scheduled first); tasks with
+the same priority are scheduled in order of identifier.
+
+Implemented policies: Policy (static priorities of the graph),
+EnablingPolicy
+"""
+
+from simulator.compact import CompactGraph
+
+
+class Policy:
+    """
+    Base scheduling policy, which uses the priorities of the graph.
+
+    Subclasses override priority and/or update. Tasks are referred to by
+    their key: their identifier in a Graph, or their index in a
+    CompactGraph.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph that will be simulated
+    priorities : sequence of numbers [optional]
+        Priority of each task (see simulate), instead of the priorities
+        stored in the graph
+    """
+    def __init__(self, graph, priorities=None):
+        self.graph = graph
+        if isinstance(graph, CompactGraph):
+            self._priority = graph.priority if priorities is None \
+                else priorities
+        elif priorities is not None:
+            self._priority = dict(zip(graph.vertices, priorities))
+        else:
+            self._priority = {id: task.priority
+                              for id, task in graph.vertices.items()}
+
+    def priority(self, time, key):
+        """Returns the priority of a task that has just become ready"""
+        return self._priority[key]
+
+    def update(self, time, queue, finished):
+        """Called before tasks are started at a given time.
+
+        Parameters
+        ----------
+        time : int or float
+            Current time
+        queue : ReadyQueue object
+            Ready tasks, whose priorities can be changed
+        finished : list of keys
+            Tasks that have just finished (none at time zero)
+        """
+
+
+class EnablingPolicy(Policy):
+    """
+    Policy favouring the tasks that enable the most successors.
+
+    The priority of a ready task is minus the number of its successors
+    whose only unfinished predecessor it is, so it changes while the task
+    waits in the ready queue, as other predecessors of its successors
+    finish. The policy keeps the state of the simulation, so a new one
+    is needed for each simulation.
+    """
+    def __init__(self, graph):
+        super().__init__(graph)
+        if isinstance(graph, CompactGraph):
+            keys = range(len(graph))
+            self._successors = graph.successors
+            self._predecessors = graph.predecessors
+        else:
+            vertices = graph.vertices
+            keys = vertices.keys()
+            self._successors = lambda id: vertices[id].successors
+            self._predecessors = lambda id: vertices[id].predecessors
+        self._remaining = {key: len(self._predecessors(key)) for key in keys}
+        self._finished = set()
+        # Number of successors each task would enable
+        self._enabled = dict.fromkeys(keys, 0)
+        for key in keys:
+            if self._remaining[key] == 1:
+                pred, = self._predecessors(key)
+                self._enabled[pred] += 1
+
+    def priority(self, time, key):
+        return -self._enabled[key]
+
+    def update(self, time, queue, finished):
+        self._finished.update(finished)
+        for key in finished:
+            for succ in self._successors(key):
+                self._remaining[succ] -= 1
+                if self._remaining[succ] == 1:
+                    # Finds the last unfinished predecessor
+                    for pred in self._predecessors(succ):
+                        if pred not in self._finished:
+                            break
+                    self._enabled[pred] += 1
+                    if pred in queue:
+                        queue.update(pred, -self._enabled[pred])
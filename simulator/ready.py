@@ -0,0 +1,108 @@
+"""Module containing the ready queue of the simulator.
+
+The ready queue holds the tasks whose predecessors have all finished,
+ordered by (priority, task key): priorities are plain numbers, and tasks
+with the same priority are ordered by identifier (or index, for a
+CompactGraph), so comparisons never call Python-level methods and the
+order is deterministic.
+
+Unlike a plain heapq list, a ReadyQueue is indexed by task key: the
+priority of a queued task can be read, changed or the task removed,
+which dynamic scheduling policies need (see simulator.policies).
+Changes use lazy deletion: the old heap entry stays in place and is
+skipped when it reaches the top, so all operations are O(log n)
+(amortized) and use the C implementation of heapq. When stale entries
+outnumber the queued tasks by more than STALE_RATIO to one (e.g., with a
+policy changing every priority at each step), the heap is rebuilt from
+the queued tasks, so its size stays proportional to the queue.
+"""
+
+import heapq   # for heaps (it implements only min-heaps)
+
+# Number of stale heap entries per queued task above which the heap is
+# rebuilt
+STALE_RATIO = 2
+
+
+class ReadyQueue:
+    """
+    Indexed min-heap of (priority, task key).
+
+    Attributes
+    ----------
+    pushes, pops, updates : int
+        Number of tasks inserted, removed by pop and changed by update
+    """
+    def __init__(self, entries=()):
+        # Current priority of each queued task
+        self._priority = dict()
+        self._heap = list()
+        self.pushes = 0
+        self.pops = 0
+        self.updates = 0
+        for priority, key in entries:
+            self._priority[key] = priority
+            self._heap.append((priority, key))
+            self.pushes += 1
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._priority)
+
+    def __contains__(self, key):
+        return key in self._priority
+
+    def priority(self, key):
+        """Current priority of a queued task"""
+        return self._priority[key]
+
+    def push(self, priority, key):
+        """Inserts a task (that is not already queued)"""
+        self._priority[key] = priority
+        heapq.heappush(self._heap, (priority, key))
+        self.pushes += 1
+
+    def update(self, key, priority):
+        """Changes the priority of a queued task (up or down)"""
+        if self._priority[key] != priority:
+            self._priority[key] = priority
+            heapq.heappush(self._heap, (priority, key))
+            self.updates += 1
+            self._compact()
+
+    def remove(self, key):
+        """Removes a queued task"""
+        del self._priority[key]
+        self._compact()
+
+    def _compact(self):
+        """Rebuilds the heap if it has too many stale entries"""
+        live = len(self._priority)
+        if len(self._heap) - live > STALE_RATIO * live:
+            self._heap = [(priority, key)
+                          for key, priority in self._priority.items()]
+            heapq.heapify(self._heap)
+
+    def _skip_stale(self):
+        """Drops heap entries of removed tasks or outdated priorities"""
+        heap = self._heap
+        current = self._priority
+        while heap:
+            priority, key = heap[0]
+            if key in current and current[key] == priority:
+                return
+            heapq.heappop(heap)
+
+    def peek(self):
+        """Returns the (priority, key) of the first task without removing
+        it"""
+        self._skip_stale()
+        return self._heap[0]
+
+    def pop(self):
+        """Removes the first task and returns its key"""
+        self._skip_stale()
+        _, key = heapq.heappop(self._heap)
+        del self._priority[key]
+        self.pops += 1
+        return key
@@ -0,0 +1,235 @@
+"""Module reducing the size of graphs before simulating them.
+
+Two reductions are available:
+- transitive reduction: removes each edge (u, w) implied by a longer path
+  from u to w. A task only becomes ready when its last predecessor
+  finishes, which is never the start of an implied edge, so the schedule
+  of the list scheduler (and its makespan) does not change;
+- chain contraction: merges a task v with its only predecessor u when v
+  is the only successor of u, into one task of load u.load + v.load
+  (keeping the identifier and priority of u). In general, this changes
+  the schedule (and the makespan may be longer or shorter). By default,
+  chains are only contracted where the schedule is kept with identical
+  resources: when v has a load and every task scheduled before v (smaller
+  (priority, id)) is an ancestor or a descendant of v, so no other task
+  can be ready when v is. A task v without load is never contracted
+  safely: it finishes in a second batch at the time u finishes, so its
+  successors only compete for resources after the tasks already ready
+  at that time have been started.
+
+Both use bitsets (Python integers) of descendants and ancestors, which
+take O(V^2) bits in the worst case, so they are meant for graphs of up to
+a few tens of thousands of tasks.
+
+Example
+-------
+>>> reduction = reduce_graph(graph, chains=True)
+>>> print(reduction)
+>>> makespan = simulate(reduction.graph, 20)
+"""
+
+from simulator.compact import CompactGraph
+from simulator.graph import Graph, Task
+
+
+class Reduction:
+    """
+    Result of the reduction of a graph.
+
+    Attributes
+    ----------
+    graph : Graph or CompactGraph object
+        Reduced graph (of the same class as the original graph)
+    chains : dict of (Task.id, list of Task.id)
+        Tasks merged into each task of the reduced graph (only for
+        contracted chains, starting with the task itself)
+    num_tasks, num_edges : (int, int)
+        Number of tasks / edges before and after the reduction
+    """
+    def __init__(self, graph, chains, num_tasks, num_edges):
+        self.graph = graph
+        self.chains = chains
+        self.num_tasks = num_tasks
+        self.num_edges = num_edges
+
+    def __repr__(self):
+        return (f'Reduction(tasks: {self.num_tasks[0]} -> '
+                f'{self.num_tasks[1]}, edges: {self.num_edges[0]} -> '
+                f'{self.num_edges[1]})')
+
+
+def _copy(graph):
+    """Copies the tasks and edges of a Graph"""
+    copy = Graph()
+    for id, task in graph.vertices.items():
+        new = Task(id, task.load)
+        new.priority = task.priority
+        new.predecessors = set(task.predecessors)
+        new.successors = set(task.successors)
+        copy.vertices[id] = new
+    return copy
+
+
+def _num_edges(graph):
+    """Number of edges of a Graph"""
+    return sum(len(task.successors) for task in graph.vertices.values())
+
+
+def _ranks(graph, compact):
+    """Rank of each task in the order of the simulator: (priority, key),
+    where the key of a task is its index for a CompactGraph"""
+    if compact:
+        key = {id: i for i, id in enumerate(graph.vertices)}.__getitem__
+    else:
+        key = lambda id: id
+    order = sorted(graph.vertices,
+                   key=lambda id: (graph.vertices[id].priority, key(id)))
+    return {id: rank for rank, id in enumerate(order)}
+
+
+def _transitive_reduction(graph, order, bit):
+    """Removes the implied edges of a Graph in place.
+
+    Returns
+    -------
+    dict of (Task.id, int)
+        Bitset of the descendants of each task (including itself)
+    """
+    vertices = graph.vertices
+    position = {id: i for i, id in enumerate(order)}
+    reach = dict()
+    for id in reversed(order):
+        task = vertices[id]
+        reachable = 0
+        # The closest successors first: an edge is implied if its end is
+        # reachable from a closer successor
+        for succ_id in sorted(task.successors, key=position.__getitem__):
+            if reachable >> bit[succ_id] & 1:
+                task.successors.discard(succ_id)
+                vertices[succ_id].predecessors.discard(id)
+            else:
+                reachable |= reach[succ_id]
+        reach[id] = reachable | (1 << bit[id])
+    return reach
+
+
+def _descendants(graph, order, bit):
+    """Bitset of the descendants of each task (including itself)"""
+    reach = dict()
+    for id in reversed(order):
+        reachable = 1 << bit[id]
+        for succ_id in graph.vertices[id].successors:
+            reachable |= reach[succ_id]
+        reach[id] = reachable
+    return reach
+
+
+def _ancestors(graph, order, bit):
+    """Bitset of the ancestors of each task (including itself)"""
+    reach = dict()
+    for id in order:
+        reachable = 1 << bit[id]
+        for pred_id in graph.vertices[id].predecessors:
+            reachable |= reach[pred_id]
+        reach[id] = reachable
+    return reach
+
+
+def _contract_chains(graph, order, safe, rank, descendants):
+    """Merges single-successor / single-predecessor pairs of a Graph in
+    place.
+
+    Returns
+    -------
+    dict of (Task.id, list of Task.id)
+        Tasks merged into each remaining task
+    """
+    vertices = graph.vertices
+    if safe:
+        ancestors = _ancestors(graph, order, rank)
+    chains = dict()
+    for id in order:
+        if id not in vertices:     # already merged
+            continue
+        task = vertices[id]
+        while len(task.successors) == 1:
+            succ_id, = task.successors
+            succ = vertices[succ_id]
+            if len(succ.predecessors) != 1:
+                break
+            if safe:
+                # A successor without load finishes in a later batch at
+                # the same time, after the tasks ready at that time have
+                # been started, which the merged task would not do
+                if not succ.load:
+                    break
+                # Tasks before succ_id in the order of the simulator must
+                # all be related to it
+                related = ancestors[succ_id] | descendants[succ_id]
+                earlier = (1 << rank[succ_id]) - 1
+                if earlier & ~related:
+                    break
+            # Merges succ into task
+            chains.setdefault(id, [id]).extend(chains.pop(succ_id,
+                                                          [succ_id]))
+            task.load += succ.load
+            task.successors = succ.successors
+            for next_id in succ.successors:
+                predecessors = vertices[next_id].predecessors
+                predecessors.discard(succ_id)
+                predecessors.add(id)
+            del vertices[succ_id]
+    return chains
+
+
+def reduce_graph(graph, transitive=True, chains=False, safe=True):
+    """
+    Reduces a graph before simulating it.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to reduce (it is not modified); its priorities must be set
+        before contracting chains
+    transitive : bool [default = True]
+        True if implied edges should be removed
+    chains : bool [default = False]
+        True if chains of tasks should be contracted
+    safe : bool [default = True]
+        True if chains should only be contracted where the schedule is
+        guaranteed not to change (see the description of the module)
+
+    Returns
+    -------
+    Reduction object
+        Reduced graph and statistics
+
+    Notes
+    -----
+    Chains contracted with safe=True keep the schedule with identical
+    resources only; with resources of different speeds, the merged task runs entirely
+    on the resource of its first task.
+    """
+    compact = isinstance(graph, CompactGraph)
+    original = graph.to_graph() if compact else graph
+    reduced = _copy(original)
+    num_tasks, num_edges = len(reduced.vertices), _num_edges(reduced)
+    order = original.topological_order
+    if len(order) != len(original.vertices):
+        reduced.topological_ordering()
+        order = reduced.topological_order
+    rank = _ranks(reduced, compact)
+    descendants = None    # only needed to contract chains safely
+    if transitive:
+        descendants = _transitive_reduction(reduced, order, rank)
+    elif chains and safe:
+        descendants = _descendants(reduced, order, rank)
+    merged = dict()
+    if chains:
+        merged = _contract_chains(reduced, order, safe, rank, descendants)
+    reduced.topological_ordering()
+    num_tasks = (num_tasks, len(reduced.vertices))
+    num_edges = (num_edges, _num_edges(reduced))
+    if compact:
+        reduced = CompactGraph.from_graph(reduced)
+    return Reduction(reduced, merged, num_tasks, num_edges)
@@ -0,0 +1,73 @@
+"""Module containing the pool of resources used by the simulator.
+
+The pool keeps the free resources and decides which one runs the next
+task, in O(1) or O(log R) per operation so simulations with many
+thousands of resources scale with the number of tasks.
+
+Resources may have different speeds: a task of load L runs for L / speed
+time units on a resource. With identical resources, the pool gives them
+out in the order in which they became free (first resource 0, 1, ...).
+With different speeds, it gives out the fastest free resource first,
+and the one with the smallest identifier among equally fast ones.
+"""
+
+import heapq   # for heaps (it implements only min-heaps)
+from collections import deque
+
+
+class ResourcePool:
+    """
+    Pool of free resources.
+
+    Attributes
+    ----------
+    num_resources : int
+        Total number of resources
+    speeds : list of numbers or None
+        Speed factor of each resource (None if they are all identical)
+    """
+    def __init__(self, num_resources, speeds=None):
+        if speeds is not None:
+            if len(speeds) != num_resources:
+                raise ValueError(f'{len(speeds)} speeds given for '
+                                 f'{num_resources} resources')
+            if any(speed <= 0 for speed in speeds):
+                raise ValueError('resource speeds must be positive')
+            if all(speed == 1 for speed in speeds):
+                speeds = None
+        self.num_resources = num_resources
+        self.speeds = speeds
+        if speeds is None:
+            self._free = deque(range(num_resources))
+        else:
+            # Fastest resources first, then by identifier
+            self._free = [(-speeds[i], i) for i in range(num_resources)]
+            heapq.heapify(self._free)
+
+    def __len__(self):
+        """Number of free resources"""
+        return len(self._free)
+
+    @property
+    def uniform(self):
+        """True if all resources have the same speed"""
+        return self.speeds is None
+
+    def acquire(self):
+        """Removes a free resource from the pool and returns its id"""
+        if self.speeds is None:
+            return self._free.popleft()
+        return heapq.heappop(self._free)[1]
+
+    def release(self, res_id):
+        """Puts a resource back in the pool"""
+        if self.speeds is None:
+            self._free.append(res_id)
+        else:
+            heapq.heappush(self._free, (-self.speeds[res_id], res_id))
+
+    def duration(self, res_id, load):
+        """Time needed by a resource to process a load"""
+        if self.speeds is None:
+            return load
+        return load / self.speeds[res_id]
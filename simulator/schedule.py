@@ -0,0 +1,228 @@
+"""Module containing the schedules computed by the simulator.
+
+simulate(..., schedule=True) returns a Schedule: the start time, finish
+time and resource of each task, stored in parallel arrays. Schedules can
+be checked with validate_schedule and exported (streamed, one line per
+task) to CSV with write_csv or to the Chrome trace format with
+write_chrome_trace, which can be opened in chrome://tracing or Perfetto
+to display a Gantt chart.
+"""
+
+import json
+import math
+from array import array
+
+from simulator.compact import CompactGraph, typed_array
+from simulator.stats import SimulationHooks
+
+
+class ScheduleError(ValueError):
+    """Error raised when a schedule does not respect its graph"""
+
+
+class Schedule:
+    """
+    Schedule of a graph of tasks.
+
+    Arrays are in the order of the vertices of the graph (insertion order
+    for a Graph, index order for a CompactGraph).
+
+    Attributes
+    ----------
+    ids : list or array of Task.id
+        Identifier of each task
+    start, finish : array of numbers
+        Start and finish time of each task
+    resource : array of int
+        Resource that ran each task
+    """
+    def __init__(self, ids, start, finish, resource):
+        self.ids = ids
+        self.start = start
+        self.finish = finish
+        self.resource = resource
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f'Schedule({len(self)} tasks, makespan={self.makespan})'
+
+    @property
+    def makespan(self):
+        """Finish time of the last task"""
+        return max(self.finish, default=0)
+
+
+class ScheduleRecorder(SimulationHooks):
+    """
+    Hooks recording the schedule of a simulation.
+
+    Parameters
+    ----------
+    keys : iterable
+        Keys of the tasks, in vertex order (identifiers for a Graph,
+        range of indices for a CompactGraph)
+    """
+    def __init__(self, keys):
+        num_tasks = len(keys)
+        # Keys of a CompactGraph are already positions
+        self._position = None if isinstance(keys, range) \
+            else {key: i for i, key in enumerate(keys)}
+        self._start = [0] * num_tasks
+        self._finish = [0] * num_tasks
+        self._resource = array('i', [-1]) * num_tasks
+
+    def start(self, time, key, res_id):
+        i = key if self._position is None else self._position[key]
+        self._start[i] = time
+        self._resource[i] = res_id
+
+    def finish(self, time, key, res_id):
+        i = key if self._position is None else self._position[key]
+        self._finish[i] = time
+
+    def schedule(self, ids):
+        """Returns the recorded schedule of the tasks with the given ids"""
+        return Schedule(ids, typed_array(self._start),
+                        typed_array(self._finish), self._resource)
+
+
+def _after(time, reference):
+    """True if time is strictly after reference (up to rounding errors)"""
+    return time > reference and not math.isclose(time, reference)
+
+
+def validate_schedule(graph, schedule, num_resources=None, speeds=None):
+    """
+    Checks that a schedule respects a graph of tasks.
+
+    Checks that each task runs for its load (divided by the speed of its
+    resource), after all its predecessors have finished, and that no
+    resource runs two tasks at the same time.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph of tasks
+    schedule : Schedule object
+        Schedule of the graph
+    num_resources : int [optional]
+        Number of resources (to check resource ids)
+    speeds : list of numbers [optional]
+        Speed factor of each resource (see simulate)
+
+    Raises
+    ------
+    ScheduleError
+        On the first violated constraint
+
+    Notes
+    -----
+    Task and precedence checks take O(V+E) time. Overlaps are found by
+    grouping the tasks by resource in one pass, then sorting the tasks of
+    each resource by start time, so this check takes O(V log V) time in
+    the worst case, not linear time (close to linear for schedules from
+    the simulator, whose tasks are mostly in start order already).
+    """
+    ids = schedule.ids
+    start, finish, resource = schedule.start, schedule.finish, \
+        schedule.resource
+    if isinstance(graph, CompactGraph):
+        num_tasks = len(graph)
+        if len(schedule) != num_tasks:
+            raise ScheduleError(f'schedule of {len(schedule)} tasks for a '
+                                f'graph of {num_tasks} tasks')
+        loads = graph.loads
+        edges = ((i, j) for i in range(num_tasks)
+                 for j in graph.successors(i))
+    else:
+        vertices = graph.vertices
+        if len(schedule) != len(vertices):
+            raise ScheduleError(f'schedule of {len(schedule)} tasks for a '
+                                f'graph of {len(vertices)} tasks')
+        position = {id: i for i, id in enumerate(ids)}
+        if any(id not in position for id in vertices):
+            raise ScheduleError('schedule and graph have different tasks')
+        loads = [vertices[id].load for id in ids]
+        edges = ((position[id], position[succ])
+                 for id, task in vertices.items()
+                 for succ in task.successors)
+
+    # Tasks
+    for i in range(len(schedule)):
+        res_id = resource[i]
+        if res_id < 0 or (num_resources is not None and
+                          res_id >= num_resources):
+            raise ScheduleError(f'task {ids[i]} runs on invalid resource '
+                                f'{res_id}')
+        duration = loads[i] if speeds is None else loads[i] / speeds[res_id]
+        if start[i] < 0 or not math.isclose(finish[i] - start[i], duration):
+            raise ScheduleError(f'task {ids[i]} runs from {start[i]} to '
+                                f'{finish[i]} instead of for {duration}')
+    # Precedence
+    for i, j in edges:
+        if _after(finish[i], start[j]):
+            raise ScheduleError(f'task {ids[j]} starts at {start[j]} before '
+                                f'its predecessor {ids[i]} finishes at '
+                                f'{finish[i]}')
+    # Overlaps
+    tasks = dict()    # tasks of each resource
+    for i in range(len(schedule)):
+        tasks.setdefault(resource[i], []).append(i)
+    for res_id, order in tasks.items():
+        order.sort(key=lambda i: (start[i], finish[i]))
+        for i, j in zip(order, order[1:]):
+            if _after(finish[i], start[j]):
+                raise ScheduleError(f'tasks {ids[i]} and {ids[j]} overlap '
+                                    f'on resource {res_id}')
+
+
+def write_csv(schedule, path):
+    """
+    Writes a schedule in a CSV file.
+
+    Columns are task, start, finish and resource, one line per task.
+
+    Parameters
+    ----------
+    schedule : Schedule object
+        Schedule to write
+    path : str
+        Name of the file
+    """
+    ids, start, finish, resource = schedule.ids, schedule.start, \
+        schedule.finish, schedule.resource
+    with open(path, 'w') as file:
+        file.write('task,start,finish,resource\n')
+        file.writelines(f'{ids[i]},{start[i]},{finish[i]},{resource[i]}\n'
+                        for i in range(len(schedule)))
+
+
+def write_chrome_trace(schedule, path, time_scale=1):
+    """
+    Writes a schedule in the Chrome trace format (JSON).
+
+    Each task is a complete event ('ph': 'X') on the thread of its
+    resource.
+
+    Parameters
+    ----------
+    schedule : Schedule object
+        Schedule to write
+    path : str
+        Name of the file
+    time_scale : number [default = 1]
+        Microseconds per time unit of the schedule
+    """
+    ids, start, finish, resource = schedule.ids, schedule.start, \
+        schedule.finish, schedule.resource
+    with open(path, 'w') as file:
+        file.write('{"traceEvents": [\n')
+        file.writelines(
+            f'{"," if i else ""}{{"name": {json.dumps(f"task {ids[i]}")}, '
+            f'"ph": "X", "pid": 0, "tid": {resource[i]}, '
+            f'"ts": {start[i] * time_scale}, '
+            f'"dur": {(finish[i] - start[i]) * time_scale}}}\n'
+            for i in range(len(schedule)))
+        file.write('], "displayTimeUnit": "ms"}\n')
@@ -7,82 +7,180 @@ As the simulator uses a min-heap to implement the priority queue,
 negative values should be used when higher values represent higher
 priorities.
 
-Implemented functions: priority_by_{id, topological_order}
-Functions with interfaces but no implementation:
-    priority_by_{lpt, spt, successors, hlf, cp}
+Implemented functions: priority_by_{id, topological_order, lpt, spt,
+successors, hlf, cp}
+
+All functions accept either a Graph or a CompactGraph. For the latter,
+priorities are written in its priority column.
+
+With vector=True, a function returns the priorities as an array (in
+the order of graph.vertices, or of the task indices for a CompactGraph)
+instead of writing them in the graph. Such vectors can be given to
+simulate(..., priorities=vector), so several priorities can be computed
+once and simulated (even at the same time) on the same read-only graph.
+
+After editing a Graph (e.g., Graph.add_edge), update_priorities only
+recomputes the priorities of the tasks affected by the edit.
 """
 
-def priority_by_id(graph):
+import inspect
+
+from simulator.compact import CompactGraph, typed_array
+from simulator.levels import ensure_levels, has_levels
+
+
+def _tasks(graph):
+    """Tasks of a Graph in the order of its vertices"""
+    return graph.vertices.values()
+
+
+def _apply(graph, priorities, vector):
+    """Returns a priority vector, or writes it in the graph"""
+    if vector:
+        return priorities
+    set_priorities(graph, priorities)
+
+
+def priority_by_id(graph, vector=False):
     """Sets the priority of each task as its identifier.
     Smaller identifiers mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
     """
-    for id, task in graph.vertices.items():
-        task.priority = id
+    if isinstance(graph, CompactGraph):
+        ids = graph.ids
+    else:
+        ids = list(graph.vertices)
+    # Identifiers that are not numbers are kept in a list
+    if all(isinstance(id, int) for id in ids):
+        priorities = typed_array(ids)
+    else:
+        priorities = list(ids)
+    return _apply(graph, priorities, vector)
     
 
-def priority_by_topological_order(graph):
+def priority_by_topological_order(graph, vector=False):
     """Sets the priority of each task as its order in the topology.
     Smaller indexes mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
     """
-    for i in range(len(graph.topological_order)):
-        id = graph.topological_order[i]
-        graph.vertices[id].priority = i
+    priorities = typed_array([-1] * len(graph.topological_order))
+    if isinstance(graph, CompactGraph):
+        for i, index in enumerate(graph.topological_order):
+            priorities[index] = i
+    else:
+        position = {id: i for i, id in enumerate(graph.vertices)}
+        for i, id in enumerate(graph.topological_order):
+            priorities[position[id]] = i
+    return _apply(graph, priorities, vector)
 
-def priority_by_lpt(graph):
+def priority_by_lpt(graph, vector=False):
     """Sets the priority of each task as its load.
     Higher loads mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
     """
-    for (load, task) in graph.vertices.items():
-        task.priority *= int(task.load)
+    if isinstance(graph, CompactGraph):
+        loads = graph.loads
+    else:
+        loads = (task.load for task in _tasks(graph))
+    priorities = typed_array(-int(load) for load in loads)
+    return _apply(graph, priorities, vector)
         
 
-def priority_by_spt(graph):
+def priority_by_spt(graph, vector=False):
     """Sets the priority of each task as its load.
     Lower loads mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
     """
-    for (load, task) in graph.vertices.items():
-        task.priority = int(task.load)
+    if isinstance(graph, CompactGraph):
+        loads = graph.loads
+    else:
+        loads = (task.load for task in _tasks(graph))
+    priorities = typed_array(int(load) for load in loads)
+    return _apply(graph, priorities, vector)
 
-def priority_by_successors(graph):
+def priority_by_successors(graph, vector=False):
     """Sets the priority of each task as its number of successors.
     Higher numbers of successors mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
     """
-    for successors, task in graph.vertices.items():
-        task.priority *= int(len(task.successors))
+    if isinstance(graph, CompactGraph):
+        priorities = typed_array(-graph.out_degree(i)
+                                 for i in range(len(graph)))
+    else:
+        priorities = typed_array(-len(task.successors)
+                                 for task in _tasks(graph))
+    return _apply(graph, priorities, vector)
 
-def priority_by_hlf(graph):
+def priority_by_hlf(graph, vector=False):
     """Sets the priority of each task following HLF.
     Higher levels mean higher priorities.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
 
     Notes
     -----
@@ -91,34 +189,32 @@ def priority_by_hlf(graph):
     Operations research, 9(6), pp.841-848.
 
     The algorithm is thought for unitary tasks and precedence trees.
-    It is supposed to be adapted here to work with any kind of graph.
+    Here, the level of a task is its height: the number of tasks in the
+    longest path from it to a bottom vertex, which works with any DAG.
+    Heights are computed once and cached (see simulator.levels).
     """
-    k = len(graph.vertices)
-    for i in range(k):
-        if graph.vertices[(k - i) - 1].id == 0:
-            continue
-        graph.vertices[i].priority = graph.vertices[(k - i) - 1].id * graph.vertices[i].priority
-
-def dfs(graph, visited, v, id, i = 1, s = 1, hbl = 0):
-    if i == 1 and len(graph.vertices[v].successors) == 0:
-        return graph.vertices[v].load
-    visited[v] = True
-    assert(type(v) == int)
-    if i == len(graph.vertices) - id - 1:
-        return s
-    else: 
-        for u in graph.vertices[v].successors:
-            if visited[u] == False:
-                return dfs(graph, visited, u, id, i + 1, s + graph.vertices[v].load)
-
-def priority_by_cp(graph):
+    ensure_levels(graph)
+    if isinstance(graph, CompactGraph):
+        priorities = typed_array(-height for height in graph.height)
+    else:
+        priorities = typed_array(-graph.height[id] for id in graph.vertices)
+    return _apply(graph, priorities, vector)
+
+def priority_by_cp(graph, vector=False):
     """Sets the priority of each task as its critical path value.
     Higher critical path values mean a higher priority.
 
     Parameters
     ----------
-    graph : Graph object
+    graph : Graph or CompactGraph object
         Graph to update priorities
+    vector : bool [default = False]
+        True if the priorities should be returned instead
+
+    Returns
+    -------
+    array or None
+        Priority of each task if vector is True
 
     Notes
     -----
@@ -127,11 +223,130 @@ def priority_by_cp(graph):
 
     The critical path of a vertex here is to be computed based on
     the value of its bottom level. Chapter 7.3 in the same book explains how
-    to compute the top and bottom levels of vertices.
+    to compute the top and bottom levels of vertices. Levels are computed
+    once in O(V+E) and cached (see simulator.levels).
+    """
+    ensure_levels(graph)
+    if isinstance(graph, CompactGraph):
+        priorities = typed_array(-level for level in graph.bottom_level)
+    else:
+        priorities = typed_array(-task.bottom_level
+                                 for task in _tasks(graph))
+    return _apply(graph, priorities, vector)
+
+
+def reset_priorities(graph):
+    """Sets the priority of each task back to its initial value (-1).
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to update priorities
+    """
+    if isinstance(graph, CompactGraph):
+        graph.priority = typed_array([-1] * len(graph))
+        return
+    for task in graph.vertices.values():
+        task.priority = -1
+
+def get_priorities(graph):
+    """Returns a copy of the priorities of all tasks.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to read priorities
+
+    Returns
+    -------
+    array
+        Priority of each task, in the order of graph.vertices
+        (or of the task indices, for a CompactGraph)
+    """
+    if isinstance(graph, CompactGraph):
+        return typed_array(graph.priority)
+    return typed_array(task.priority for task in graph.vertices.values())
+
+def set_priorities(graph, priorities):
+    """Sets the priorities of all tasks from a vector.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to update priorities
+    priorities : sequence
+        Priority of each task, as returned by get_priorities
+    """
+    if isinstance(graph, CompactGraph):
+        graph.priority = typed_array(priorities)
+        return
+    for task, priority in zip(graph.vertices.values(), priorities):
+        task.priority = priority
+
+def priority_vector(graph, function):
+    """Returns the priorities computed by a priority function.
+
+    Functions with a vector parameter (such as those of this module)
+    compute the vector without changing the graph. Other functions are
+    run from the initial priorities, and the previous priorities of the
+    graph are restored afterwards.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph of tasks
+    function : function
+        Priority function
+
+    Returns
+    -------
+    array or list
+        Priority of each task (see get_priorities)
     """
-    size = len(graph.vertices)
-    visited = [False] * size
-    for i in range(len(graph.vertices)):
-        s = dfs(graph, visited, i, graph.vertices[i].id) 
-        graph.vertices[i].priority = -1 * s
-        visited = [False] * size
\ No newline at end of file
+    if 'vector' in inspect.signature(function).parameters:
+        return function(graph, vector=True)
+    previous = get_priorities(graph)
+    reset_priorities(graph)
+    function(graph)
+    priorities = get_priorities(graph)
+    set_priorities(graph, previous)
+    return priorities
+
+def update_priorities(graph, function, tasks):
+    """Updates the priorities of some tasks after an edit of the graph.
+
+    Functions whose priorities only depend on the task itself and on its
+    levels (by id, lpt, spt, successors, hlf and cp) are applied to the
+    given tasks only; other functions are applied to the whole graph.
+
+    Parameters
+    ----------
+    graph : Graph object
+        Graph to update priorities
+    function : function
+        Priority function used for the graph
+    tasks : iterable of Task.id
+        Tasks changed by the edit (as returned by the editing methods of
+        Graph, e.g., Graph.add_edge)
+    """
+    if isinstance(graph, CompactGraph) or function not in _LOCAL or \
+            (function in [priority_by_hlf, priority_by_cp] and
+             not has_levels(graph)):
+        function(graph)
+        return
+    priority = _LOCAL[function]
+    vertices = graph.vertices
+    for id in tasks:
+        if id in vertices:
+            vertices[id].priority = priority(graph, vertices[id])
+
+# Priority of a task for the functions that update_priorities applies
+# locally
+_LOCAL = {
+    priority_by_id: lambda graph, task: task.id,
+    priority_by_lpt: lambda graph, task: -int(task.load),
+    priority_by_spt: lambda graph, task: int(task.load),
+    priority_by_successors: lambda graph, task: -len(task.successors),
+    priority_by_hlf: lambda graph, task: -graph.height[task.id],
+    priority_by_cp: lambda graph, task: -task.bottom_level,
+}
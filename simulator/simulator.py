@@ -2,87 +2,298 @@
 
 The simulator takes a DAG of tasks and a number of resources, and
 computes how the tasks would execute following their priorities.
+
+The graph is only read during a simulation: the number of unfinished
+predecessors of each task is tracked in a private counter, so the same
+graph can be simulated many times in a row (or from several threads at
+the same time) without having to reset it.
 """
 
 import heapq   # for heaps (it implements only min-heaps)
 
+from simulator.bounds import _bounds
+from simulator.compact import CompactGraph
+from simulator.events import make_event_queue
+from simulator.ready import ReadyQueue
+from simulator.resources import ResourcePool
+from simulator.schedule import ScheduleRecorder
+from simulator.stats import SimulationStats, SimulationHooks, \
+    DebugHooks, HookList
+
+
+def _view(graph):
+    """Read-only view of a graph used by the simulation engine.
+
+    Tasks are referred to by a key: their identifier in a Graph, or their
+    index in a CompactGraph.
 
-def simulate(graph, num_resources, debug=False):
+    Returns
+    -------
+    keys : iterable
+        Keys of all tasks
+    loads : mapping of (key, load)
+        Processing time of each task
+    successors : function
+        Returns the keys of the successors of a task
+    in_degree : list or dict of (key, int)
+        Number of predecessors of each task (a new object that the caller
+        can modify)
+    priority : mapping of (key, priority)
+        Priority of each task
+    describe : function
+        Returns the text used to describe a task in debug messages
+    """
+    if isinstance(graph, CompactGraph):
+        keys = range(len(graph))
+        in_degree = [graph.in_degree(i) for i in keys]
+        ids = graph.ids
+        return (keys, graph.loads, graph.successors, in_degree,
+                graph.priority, lambda i: f'task {ids[i]}')
+
+    vertices = graph.vertices
+    loads = {id: task.load for id, task in vertices.items()}
+    successors = {id: task.successors for id, task in vertices.items()}
+    in_degree = {id: len(task.predecessors) for id, task in vertices.items()}
+    priority = {id: task.priority for id, task in vertices.items()}
+    return (vertices.keys(), loads, successors.__getitem__, in_degree,
+            priority, lambda id: f'task {id}')
+
+
+def simulate(graph, num_resources, debug=False, event_queue='auto',
+             speeds=None, quiet=False, stats=False, hooks=None,
+             schedule=False, policy=None, priorities=None, loads=None):
     """Simulation engine.
 
     Parameters
     ----------
-    graph : Graph object
-        DAG of tasks to run
+    graph : Graph or CompactGraph object
+        DAG of tasks to run (it is not modified)
     num_resources : int
-        Number of identical resources to simulate
+        Number of resources to simulate
     debug : bool [default = False]
         True if debug messages should be printed
+    event_queue : str [default = 'auto']
+        Event queue implementation: 'heap', 'bucket' (integer loads only)
+        or 'auto' (see simulator.events); all give the same results
+    speeds : list of numbers [optional]
+        Speed factor of each resource (a task of load L runs for L / speed
+        time units); resources are identical by default
+    quiet : bool [default = False]
+        True if the start and makespan messages should not be printed
+    stats : bool [default = False]
+        True if statistics of the simulation should be returned
+    hooks : SimulationHooks object [optional]
+        Callbacks for tasks becoming ready, starting and finishing (see
+        simulator.stats)
+    schedule : bool [default = False]
+        True if the schedule (start time, finish time and resource of
+        each task) should be returned
+    policy : Policy object [optional]
+        Dynamic scheduling policy computing the priorities during the
+        simulation (see simulator.policies); the priorities of the graph
+        are used by default
+    priorities : sequence of numbers [optional]
+        Priority of each task, in the order of graph.vertices (or of the
+        task indices, for a CompactGraph), used instead of the priorities
+        stored in the graph (see the vector parameter of the functions in
+        simulator.schedulers)
+    loads : sequence of numbers [optional]
+        Load of each task, in the same order as priorities, used instead
+        of the loads stored in the graph (see simulator.montecarlo)
 
     Returns
     -------
-    int
-        Makespan
+    int, or tuple
+        Makespan, followed by the SimulationStats object if stats is True
+        (including a lower bound on the makespan and the gap to it) and
+        by the Schedule object if schedule is True
+
+    Notes
+    -----
+    Tasks with the same priority are started in order of identifier
+    (or index, for a CompactGraph). All tasks finishing at the same time
+    are handled before new tasks are started.
+    Without debug messages, statistics, hooks and policy, the simulation
+    runs an uninstrumented loop.
     """
-    print('* Starting the simulation *')
+    if not quiet:
+        print('* Starting the simulation *')
+    keys, graph_loads, successors, remaining, priority, describe = \
+        _view(graph)
+    if priorities is not None:
+        if len(priorities) != len(keys):
+            raise ValueError(f'{len(priorities)} priorities given for '
+                             f'{len(keys)} tasks')
+        priority = priorities if isinstance(graph, CompactGraph) \
+            else dict(zip(keys, priorities))
+    if loads is not None:
+        if len(loads) != len(keys):
+            raise ValueError(f'{len(loads)} loads given for '
+                             f'{len(keys)} tasks')
+        loads = loads if isinstance(graph, CompactGraph) \
+            else dict(zip(keys, loads))
+    else:
+        loads = graph_loads
     if debug:
-        print(f'- Graph of {len(graph.vertices)} tasks running on' +
+        print(f'- Graph of {len(keys)} tasks running on' +
               f' {num_resources} resources')
 
     # Setup:
-    # - Creates a list of free resources
-    free_resources = [i for i in range(num_resources)]
-    # - Puts all available tasks (top tasks) in the priority queue
-    priority_queue = list()
-    for task in graph.vertices.values():
-        if not task.predecessors:
-            priority_queue.append(task)
-            if debug:
-                print(f'- {task} is ready to run')
+    # - Creates the pool of free resources
+    free_resources = ResourcePool(num_resources, speeds)
+    # - Finds all available tasks (top tasks)
+    # 'remaining' counts the predecessors that have not finished yet
+    ready = [key for key in keys if not remaining[key]]
+    # - Creates the event queue of the simulator, which returns batches
+    # of (task key, resource id) for all tasks finishing at the same time
+    if free_resources.uniform:
+        events = make_event_queue(event_queue, (loads[key] for key in keys))
+    elif event_queue == 'bucket':
+        raise ValueError('bucket event queues require identical resources')
+    else:  # durations depend on resource speeds
+        events = make_event_queue('heap', ())
+    # - Gathers the instrumentation
+    all_hooks = ([DebugHooks(describe)] if debug else []) + \
+        ([hooks] if hooks is not None else [])
+    if schedule:
+        recorder = ScheduleRecorder(keys)
+        all_hooks.append(recorder)
+
+    if stats or all_hooks or policy is not None:
+        if not all_hooks:
+            all_hooks = SimulationHooks()
+        elif len(all_hooks) == 1:
+            all_hooks = all_hooks[0]
+        else:
+            all_hooks = HookList(all_hooks)
+        statistics = SimulationStats(len(keys), num_resources)
+        if stats:
+            statistics.lower_bound = _bounds(keys, loads, successors,
+                                             remaining.copy(), num_resources,
+                                             speeds).value
+        time = _instrumented_loop(loads, successors, remaining, priority,
+                                  ready, free_resources, events, all_hooks,
+                                  statistics, policy)
+    else:
+        statistics = None
+        time = _loop(loads, successors, remaining, priority, ready,
+                     free_resources, events)
+
+    # No more events
+    if not quiet:
+        print(f'* Total execution time (makespan) = {time}\n')
+    if not (stats or schedule):
+        return time
+    results = (time,)
+    if stats:
+        results += (statistics,)
+    if schedule:
+        ids = graph.ids if isinstance(graph, CompactGraph) else list(keys)
+        results += (recorder.schedule(ids),)
+    return results
+
+
+def _loop(loads, successors, remaining, priority, ready, free_resources,
+          events):
+    """Main loop of the simulation; returns the makespan"""
+    # Puts all available tasks in the priority queue
+    # format of an entry: (priority, task key)
+    priority_queue = [(priority[key], key) for key in ready]
     heapq.heapify(priority_queue)
-    # - Sets the start time as zero
+    # Sets the start time as zero
     time = 0
-    # - Creates the bootstrapping event in the event queue of the simulator
-    # format of an event: (time, task id, resource id)
-    events = [(time, None, None)]
+    # No task has finished at time zero (bootstrapping batch)
+    batch = list()
 
     # Simulation runs while there are events to handle
     # Steps:
-    # 1. remove the first event, see if there are any new free tasks
+    # 1. handle all tasks that finished at this time, see if there are
+    #    any new free tasks
     # 2. schedule available tasks while there are available resources
-    while events:
+    # 3. move to the next time with events
+    while True:
         # Step 1
-        time, task_id, res_id = heapq.heappop(events)
-        if task_id != None:
+        for key, res_id in batch:
             # event: task finished running
-            task = graph.vertices[task_id]
-            if debug:
-                print(f'[t={time}]: END {task}, resource {res_id}')
-
-            # removes the task from the predecessors of its successors
-            for succ_id in task.successors:
-                successor = graph.vertices[succ_id]
-                successor.predecessors.remove(task_id)
-                # if it has no predecessors, it is free to run
-                if not successor.predecessors:
-                    heapq.heappush(priority_queue, successor)
-                    if debug:
-                        print(f'- {successor} is now ready to run')
-
-            # adds the resource to the list of available resources
-            free_resources.append(res_id)
+            # one less predecessor to wait for in each successor
+            for succ in successors(key):
+                remaining[succ] -= 1
+                # if it has no predecessors left, it is free to run
+                if not remaining[succ]:
+                    heapq.heappush(priority_queue, (priority[succ], succ))
+            # puts the resource back in the pool of available resources
+            free_resources.release(res_id)
 
         # Step 2
         while free_resources and priority_queue:
             # pops the first free resource and free task
-            res_id = free_resources.pop(0)
-            task = heapq.heappop(priority_queue)
-            end_time = time + task.load
+            res_id = free_resources.acquire()
+            _, key = heapq.heappop(priority_queue)
+            end_time = time + free_resources.duration(res_id, loads[key])
             # creates the event for the task's execution
-            heapq.heappush(events, (end_time, task.id, res_id))
-            if debug:
-                print(f'[t={time}]: START {task}, resource {res_id}')
+            events.push(end_time, key, res_id)
 
-    # No more events
-    print(f'* Total execution time (makespan) = {time}\n')
-    return time
+        # Step 3
+        if not events:
+            return time
+        time, batch = events.pop_batch()
+
+
+def _instrumented_loop(loads, successors, remaining, priority, ready,
+                       free_resources, events, hooks, stats, policy):
+    """Same as _loop, also calling hooks, filling stats and computing
+    priorities with a policy (if not None)"""
+    for key in ready:
+        hooks.ready(0, key)
+    priority_queue = ReadyQueue(
+        (priority[key] if policy is None else policy.priority(0, key), key)
+        for key in ready)
+    stats.peak_ready = len(priority_queue)
+    busy_time = stats.busy_time
+    unstarted = stats.num_tasks
+    time = 0
+    batch = list()
+
+    while True:
+        # Step 1
+        for key, res_id in batch:
+            hooks.finish(time, key, res_id)
+            for succ in successors(key):
+                remaining[succ] -= 1
+                if not remaining[succ]:
+                    hooks.ready(time, succ)
+                    priority_queue.push(
+                        priority[succ] if policy is None
+                        else policy.priority(time, succ), succ)
+            free_resources.release(res_id)
+        stats.peak_ready = max(stats.peak_ready, len(priority_queue))
+        if policy is not None:
+            policy.update(time, priority_queue, [key for key, _ in batch])
+
+        # Step 2
+        while free_resources and priority_queue:
+            res_id = free_resources.acquire()
+            key = priority_queue.pop()
+            unstarted -= 1
+            duration = free_resources.duration(res_id, loads[key])
+            busy_time[res_id] += duration
+            events.push(time + duration, key, res_id)
+            hooks.start(time, key, res_id)
+
+        # Step 3
+        if not events:
+            stats.makespan = time
+            stats.ready_pushes = priority_queue.pushes
+            stats.ready_pops = priority_queue.pops
+            stats.ready_updates = priority_queue.updates
+            return time
+        idle = len(free_resources)
+        previous = time
+        time, batch = events.pop_batch()
+        stats.batches += 1
+        stats.events += len(batch)
+        # Free resources stay idle until the next batch
+        if unstarted:
+            stats.idle_dependencies += idle * (time - previous)
+        else:
+            stats.idle_drain += idle * (time - previous)
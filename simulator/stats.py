@@ -0,0 +1,139 @@
+"""Module containing the statistics and event hooks of the simulator.
+
+simulate(..., stats=True) returns a SimulationStats object with the
+makespan, and simulate(..., hooks=...) calls the methods of a
+SimulationHooks object when tasks become ready, start and finish.
+Simulations without statistics, hooks or debug messages run a loop
+without any instrumentation, so these features cost nothing when they
+are not used.
+"""
+
+
+class SimulationStats:
+    """
+    Statistics of a simulation.
+
+    Attributes
+    ----------
+    makespan : int or float
+        Total execution time
+    num_tasks : int
+        Number of tasks
+    events : int
+        Number of events processed (task completions)
+    batches : int
+        Number of batches of events (distinct completion times)
+    ready_pushes, ready_pops : int
+        Number of insertions in / removals from the ready (priority) queue
+    ready_updates : int
+        Number of priority changes of queued tasks (by a policy)
+    peak_ready : int
+        Largest number of tasks waiting in the ready queue at once
+    busy_time : list of numbers
+        Time spent running tasks by each resource
+    idle_dependencies : int or float
+        Idle resource time while unstarted tasks were waiting for their
+        predecessors
+    idle_drain : int or float
+        Idle resource time after all tasks had started (including the
+        resources that finished before the makespan)
+    lower_bound : int or float
+        Lower bound on the makespan of any schedule (see simulator.bounds)
+    """
+    def __init__(self, num_tasks, num_resources):
+        self.makespan = 0
+        self.num_tasks = num_tasks
+        self.events = 0
+        self.batches = 0
+        self.ready_pushes = 0
+        self.ready_pops = 0
+        self.ready_updates = 0
+        self.peak_ready = 0
+        self.busy_time = [0] * num_resources
+        self.idle_dependencies = 0
+        self.idle_drain = 0
+        self.lower_bound = 0
+
+    def __repr__(self):
+        return (f'SimulationStats(makespan={self.makespan}, '
+                f'num_tasks={self.num_tasks}, events={self.events}, '
+                f'utilization={self.total_utilization:.3f}, '
+                f'gap={self.gap:.3f})')
+
+    @property
+    def utilization(self):
+        """Fraction of the makespan each resource spent running tasks"""
+        if not self.makespan:
+            return [0.0] * len(self.busy_time)
+        return [busy / self.makespan for busy in self.busy_time]
+
+    @property
+    def total_utilization(self):
+        """Fraction of the total resource time spent running tasks"""
+        if not self.makespan or not self.busy_time:
+            return 0.0
+        return sum(self.busy_time) / (self.makespan * len(self.busy_time))
+
+    @property
+    def gap(self):
+        """Relative distance between the makespan and its lower bound
+        (an upper bound on the distance to the optimal makespan)"""
+        if not self.lower_bound:
+            return 0.0
+        return (self.makespan - self.lower_bound) / self.lower_bound
+
+    @property
+    def idle_time(self):
+        """Total idle resource time"""
+        return self.idle_dependencies + self.idle_drain
+
+
+class SimulationHooks:
+    """
+    Callbacks of a simulation, which do nothing by default.
+
+    Subclasses override the methods they need. Tasks are referred to by
+    their key: their identifier in a Graph, or their index in a
+    CompactGraph.
+    """
+    def ready(self, time, key):
+        """Called when a task has no unfinished predecessors left"""
+
+    def start(self, time, key, res_id):
+        """Called when a task starts running on a resource"""
+
+    def finish(self, time, key, res_id):
+        """Called when a task finishes running on a resource"""
+
+
+class DebugHooks(SimulationHooks):
+    """Hooks printing the debug messages of simulate"""
+    def __init__(self, describe):
+        self.describe = describe
+
+    def ready(self, time, key):
+        print(f'- {self.describe(key)} is ready to run')
+
+    def start(self, time, key, res_id):
+        print(f'[t={time}]: START {self.describe(key)}, resource {res_id}')
+
+    def finish(self, time, key, res_id):
+        print(f'[t={time}]: END {self.describe(key)}, resource {res_id}')
+
+
+class HookList(SimulationHooks):
+    """Calls several hooks in a row"""
+    def __init__(self, hooks):
+        self.hooks = hooks
+
+    def ready(self, time, key):
+        for hooks in self.hooks:
+            hooks.ready(time, key)
+
+    def start(self, time, key, res_id):
+        for hooks in self.hooks:
+            hooks.start(time, key, res_id)
+
+    def finish(self, time, key, res_id):
+        for hooks in self.hooks:
+            hooks.finish(time, key, res_id)
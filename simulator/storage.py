@@ -0,0 +1,248 @@
+"""Module saving and loading task graphs in a binary file format.
+
+A graph file contains the columns of a CompactGraph (identifiers, loads,
+CSR successors and predecessors, priorities) and, optionally, its
+topological order and levels. Loading a file memory-maps it: columns are
+read-only views of the file, so even a very large graph opens almost
+instantly, and processes loading the same file share its pages.
+
+File layout (little-endian, version 1)
+--------------------------------------
+- header: magic b'TASKDAG\\0', version, number of sections, flags,
+  number of tasks, number of edges;
+- section table: for each section, its name, typecode ('q', 'i' or 'd'),
+  CRC32, offset and size in bytes;
+- CRC32 of the header and section table;
+- sections, each starting at a multiple of 8 bytes.
+
+The header, the section table and the sizes of all sections are checked
+every time a file is loaded. The CRC32 of each section (a full read of the
+file) is only checked when loading with verify=True.
+"""
+
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+
+from simulator.compact import CompactGraph
+
+MAGIC = b'TASKDAG\0'
+VERSION = 1
+_HEADER = struct.Struct('<8sHHIQQ')
+_SECTION = struct.Struct('<8sc3xIQQ')
+_CRC = struct.Struct('<I4x')
+_ALIGNMENT = 8
+
+# Sections (CompactGraph attributes) always present in a file
+REQUIRED = ['ids', 'loads', 'succ_offsets', 'succ_indices',
+            'pred_offsets', 'pred_indices', 'priority']
+# Sections only saved if computed (and requested)
+ORDER = ['topological_order', 'level_offsets', 'depth']
+LEVELS = ['top_level', 'bottom_level', 'height']
+# Names of the sections in the file (at most 8 bytes)
+_NAMES = {'ids': b'ids', 'loads': b'loads', 'succ_offsets': b'succoff',
+          'succ_indices': b'succidx', 'pred_offsets': b'predoff',
+          'pred_indices': b'predidx', 'priority': b'priority',
+          'topological_order': b'order', 'level_offsets': b'lvloff',
+          'depth': b'depth', 'top_level': b'toplvl',
+          'bottom_level': b'botlvl', 'height': b'height'}
+_ATTRIBUTES = {name: attribute for attribute, name in _NAMES.items()}
+
+
+class GraphFileError(ValueError):
+    """Error raised when a graph file is invalid or corrupted"""
+
+
+def _typecode(column):
+    """Typecode of an array or memoryview"""
+    return getattr(column, 'typecode', None) or column.format
+
+
+def save_graph(graph, path, derived=True):
+    """
+    Saves a graph in a binary file.
+
+    The file is written under a temporary name, then renamed, so it is
+    replaced atomically.
+
+    Parameters
+    ----------
+    graph : Graph or CompactGraph object
+        Graph to save (task identifiers must be integers)
+    path : str or path-like
+        Name of the file to write
+    derived : bool [default = True]
+        True if the topological order and levels should also be saved
+        (when they have been computed)
+
+    Raises
+    ------
+    ValueError
+        If task identifiers are not integers
+    """
+    if sys.byteorder != 'little':
+        raise ValueError('graph files can only be written on little-endian '
+                         'machines')
+    compact = graph if isinstance(graph, CompactGraph) \
+        else CompactGraph.from_graph(graph)
+    if isinstance(compact.ids, list):  # only used for non-integer ids
+        raise ValueError('only graphs with integer task identifiers can be '
+                         'saved')
+    num_tasks = len(compact)
+    names = list(REQUIRED)
+    if derived and len(compact.topological_order) == num_tasks:
+        names += ORDER
+        if len(compact.height) == num_tasks:
+            names += LEVELS
+    columns = [getattr(compact, name) for name in names]
+
+    table_size = _HEADER.size + _SECTION.size * len(names) + _CRC.size
+    sections = list()
+    offset = table_size
+    for name, column in zip(names, columns):
+        data = memoryview(column).cast('B')
+        sections.append(_SECTION.pack(_NAMES[name],
+                                      _typecode(column).encode(),
+                                      zlib.crc32(data), offset, len(data)))
+        offset += _aligned(len(data))
+    header = _HEADER.pack(MAGIC, VERSION, len(names), 0, num_tasks,
+                          len(compact.succ_indices)) + b''.join(sections)
+
+    with _replacing(path) as file:
+        file.write(header)
+        file.write(_CRC.pack(zlib.crc32(header)))
+        for column in columns:
+            data = memoryview(column).cast('B')
+            file.write(data)
+            file.write(b'\0' * (_aligned(len(data)) - len(data)))
+
+
+@contextlib.contextmanager
+def _replacing(path):
+    """Opens a temporary file in the directory of path, which replaces
+    path once it is written, so that readers (in other processes) never
+    see a partial file"""
+    temporary = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            yield file
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        raise
+
+
+def _aligned(size):
+    """Rounds a size up to the next multiple of _ALIGNMENT"""
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def load_graph(path, compact=True, verify=False):
+    """
+    Loads a graph from a binary file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Name of the file to read
+    compact : bool [default = True]
+        True to get a CompactGraph whose columns are read-only views of the
+        memory-mapped file (the priority column is copied so it can be
+        updated), False to get a Graph
+    verify : bool [default = False]
+        True if the checksum of every section should be checked (this
+        reads the whole file)
+
+    Returns
+    -------
+    CompactGraph or Graph object
+        Loaded graph
+
+    Raises
+    ------
+    GraphFileError
+        If the file is not a valid graph file or is corrupted
+    """
+    with open(path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise GraphFileError(f'{path} is not a graph file') from None
+    view = memoryview(buffer)
+    sections, num_tasks, num_edges = _read_table(view, path)
+
+    columns = dict()
+    for name, typecode, crc, offset, size in sections:
+        data = view[offset:offset + size]
+        if verify and zlib.crc32(data) != crc:
+            raise GraphFileError(f'{path}: checksum mismatch in section '
+                                 f'{name}')
+        columns[_ATTRIBUTES[name]] = data.cast(typecode)
+    _check_columns(columns, num_tasks, num_edges, path)
+
+    graph = CompactGraph(columns['ids'], columns['loads'],
+                         columns['succ_offsets'], columns['succ_indices'],
+                         columns['pred_offsets'], columns['pred_indices'])
+    # Priorities are copied, as priority functions update them
+    graph.priority = array(columns['priority'].format)
+    graph.priority.frombytes(columns['priority'].cast('B'))
+    for name in ORDER + LEVELS:
+        if name in columns:
+            setattr(graph, name, columns[name])
+    return graph if compact else graph.to_graph()
+
+
+def _read_table(view, path):
+    """Reads and checks the header and section table of a graph file"""
+    if len(view) < _HEADER.size:
+        raise GraphFileError(f'{path} is not a graph file')
+    magic, version, num_sections, _, num_tasks, num_edges = \
+        _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise GraphFileError(f'{path} is not a graph file')
+    if version != VERSION:
+        raise GraphFileError(f'{path}: unsupported version {version}')
+    table_size = _HEADER.size + _SECTION.size * num_sections
+    if len(view) < table_size + _CRC.size:
+        raise GraphFileError(f'{path}: truncated header')
+    (crc,) = _CRC.unpack_from(view, table_size)
+    if zlib.crc32(view[:table_size]) != crc:
+        raise GraphFileError(f'{path}: corrupted header')
+
+    sections = list()
+    for i in range(num_sections):
+        name, typecode, crc, offset, size = _SECTION.unpack_from(
+            view, _HEADER.size + i * _SECTION.size)
+        name = name.rstrip(b'\0')
+        typecode = typecode.decode()
+        if name not in _ATTRIBUTES or typecode not in 'qid':
+            raise GraphFileError(f'{path}: unknown section {name}')
+        if offset + size > len(view) or size % struct.calcsize(typecode):
+            raise GraphFileError(f'{path}: truncated section {name}')
+        sections.append((name, typecode, crc, offset, size))
+    return sections, num_tasks, num_edges
+
+
+def _check_columns(columns, num_tasks, num_edges, path):
+    """Checks that all columns have the sizes announced in the header"""
+    # Expected number of items of each section (None for any number)
+    sizes = {'succ_offsets': num_tasks + 1, 'pred_offsets': num_tasks + 1,
+             'succ_indices': num_edges, 'pred_indices': num_edges,
+             'level_offsets': None}
+    for name in REQUIRED:
+        if name not in columns:
+            raise GraphFileError(f'{path}: missing section {name}')
+    for name, column in columns.items():
+        expected = sizes.get(name, num_tasks)
+        if expected is not None and len(column) != expected:
+            raise GraphFileError(f'{path}: section {name} has '
+                                 f'{len(column)} items')
+    for offsets in ['succ_offsets', 'pred_offsets']:
+        if columns[offsets][0] != 0 or columns[offsets][-1] != num_edges:
+            raise GraphFileError(f'{path}: invalid section {offsets}')
@@ -0,0 +1,243 @@
+"""Module running parameter studies (sweeps) over the simulator.
+
+A sweep simulates every combination of graph parameters, random seeds,
+priority functions and numbers of resources. Each (graph parameters, seed)
+cell is one job of a process pool: the worker generates the graph itself,
+so graphs are never pickled, and reuses it for all priorities and resource
+counts. Results are rows of a tidy table (one makespan per row).
+
+Example
+-------
+>>> import simulator.schedulers as schedulers
+>>> from simulator.sweep import run_sweep
+>>> rows = run_sweep([{'num_tasks': 1000, 'load_range': (1, 10),
+...                    'dependency_range': (0, 5)}],
+...                  seeds=[1, 2, 3],
+...                  priorities=[schedulers.priority_by_id,
+...                              schedulers.priority_by_cp],
+...                  resources=[2, 4, 8])
+
+With bounds=True, each row also has a lower bound on the makespan and the
+gap to it (see simulator.bounds). With prune=True, a configuration (graph,
+number of resources) is no longer simulated once a priority reaches the
+lower bound, as no other priority can do better: the rows of the
+remaining priorities are skipped. Numbers of resources above the maximum
+useful parallelism of the graph (see simulator.analytics) are not
+simulated either, as their makespan is the critical path.
+"""
+
+import csv
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from simulator.analytics import analyze
+from simulator.bounds import lower_bounds
+from simulator.cache import GraphCache
+from simulator.graph import Graph
+from simulator.schedulers import priority_vector
+from simulator.simulator import simulate
+
+# Caches of the current process, by directory (see run_cell)
+_caches = dict()
+
+# Columns of the result table
+COLUMNS = ['num_tasks', 'load_range', 'dependency_range', 'rename',
+           'rng_seed', 'priority', 'num_resources', 'makespan']
+# Additional columns with bounds=True
+BOUND_COLUMNS = ['lower_bound', 'gap']
+
+
+def _cache(directory):
+    """Returns the GraphCache of the current process for a directory"""
+    if directory not in _caches:
+        _caches[directory] = GraphCache(directory=directory)
+    return _caches[directory]
+
+
+def run_cell(params, rng_seed, priorities, resources, compact=False,
+             cache_directory=None, bounds=False, prune=False):
+    """
+    Simulates one graph with several priorities and numbers of resources.
+
+    Parameters
+    ----------
+    params : dict
+        Arguments of Graph.generate_graph (except rng_seed and compact)
+    rng_seed : int
+        Random number generator seed of the graph
+    priorities : list of functions
+        Priority functions (e.g., from simulator.schedulers)
+    resources : list of int
+        Numbers of resources to simulate
+    compact : bool [default = False]
+        True if the graph should be generated as a CompactGraph
+    cache_directory : str [optional]
+        Directory of a GraphCache used to reuse graphs and priorities
+        across cells and sweeps
+    bounds : bool [default = False]
+        True if rows should include the lower bound and the gap
+    prune : bool [default = False]
+        True if a number of resources should be skipped for the next
+        priorities once a makespan reaches the lower bound, and if
+        numbers of resources above the maximum useful parallelism should
+        not be simulated
+
+    Returns
+    -------
+    list of dict
+        One row per (priority, number of resources) simulated
+    """
+    if cache_directory is None:
+        cache = None
+        graph = Graph.generate_graph(rng_seed=rng_seed, compact=compact,
+                                     **params)
+    else:
+        cache = _cache(cache_directory)
+        graph = cache.generate_graph(rng_seed=rng_seed, compact=compact,
+                                     **params)
+    if bounds or prune:
+        lower_bound = {num_resources: lower_bounds(graph, num_resources)
+                       for num_resources in resources}
+    if prune:
+        profile = analyze(graph)
+    best = dict()
+    rows = list()
+    for priority in priorities:
+        pending = [num_resources for num_resources in resources
+                   if not (prune and best.get(num_resources) ==
+                           lower_bound[num_resources].value)]
+        if not pending:
+            continue
+        # Priorities are computed as vectors, the graph is not modified
+        if cache is None:
+            vector = priority_vector(graph, priority)
+        else:
+            vector = cache.priority(graph, priority)
+        for num_resources in pending:
+            if prune and num_resources >= profile.max_parallelism:
+                # Every task starts at its top level
+                makespan = profile.critical_path
+            else:
+                makespan = simulate(graph, num_resources, quiet=True,
+                                    priorities=vector)
+            best[num_resources] = min(best.get(num_resources, makespan),
+                                      makespan)
+            row = {'rename': False}
+            row.update(params)
+            row.update(rng_seed=rng_seed, priority=priority.__name__,
+                       num_resources=num_resources, makespan=makespan)
+            if bounds:
+                row.update(lower_bound=lower_bound[num_resources].value,
+                           gap=lower_bound[num_resources].gap(makespan))
+            rows.append(row)
+    return rows
+
+
+def _cell_results(graph_grid, seeds, priorities, resources, max_workers,
+                  compact, cache_directory, bounds, prune, ordered):
+    """Runs run_cell for each (graph parameters, seed) and yields its rows.
+
+    Cells are yielded in input order if ordered is True, or as soon as
+    they complete otherwise.
+    """
+    cells = list(itertools.product(graph_grid, seeds))
+    if max_workers == 1:
+        for params, rng_seed in cells:
+            yield run_cell(params, rng_seed, priorities, resources, compact,
+                           cache_directory, bounds, prune)
+        return
+
+    with ProcessPoolExecutor(max_workers) as pool:
+        futures = [pool.submit(run_cell, params, rng_seed, priorities,
+                               resources, compact, cache_directory, bounds,
+                               prune)
+                   for params, rng_seed in cells]
+        for future in (futures if ordered else as_completed(futures)):
+            yield future.result()
+
+
+def iter_sweep(graph_grid, seeds, priorities, resources, max_workers=None,
+               compact=False, cache_directory=None, bounds=False,
+               prune=False):
+    """
+    Runs a sweep and yields its rows as soon as each graph is done.
+
+    Parameters
+    ----------
+    graph_grid : list of dict
+        Arguments of Graph.generate_graph (except rng_seed and compact)
+    seeds : list of int
+        Random number generator seeds (one graph per seed and parameters)
+    priorities : list of functions
+        Priority functions; they must be defined at module level so the
+        worker processes can find them
+    resources : list of int
+        Numbers of resources to simulate
+    max_workers : int [optional]
+        Number of worker processes (default: number of processors).
+        With 1, the sweep runs in the current process.
+    compact : bool [default = False]
+        True if graphs should be generated as CompactGraphs
+    cache_directory : str [optional]
+        Directory of an on-disk GraphCache shared by all workers, so
+        graphs and priorities are only computed once across sweeps
+    bounds : bool [default = False]
+        True if rows should include the lower bound on the makespan and
+        the gap to it (keys in BOUND_COLUMNS)
+    prune : bool [default = False]
+        True if configurations whose best makespan reaches the lower
+        bound should not be simulated with the next priorities (their
+        rows are skipped), and if numbers of resources above the maximum
+        useful parallelism should get the critical path without being
+        simulated
+
+    Yields
+    ------
+    dict
+        Row of the result table (keys in COLUMNS), in completion order
+    """
+    for rows in _cell_results(graph_grid, seeds, priorities, resources,
+                              max_workers, compact, cache_directory,
+                              bounds, prune, ordered=False):
+        yield from rows
+
+
+def run_sweep(graph_grid, seeds, priorities, resources, max_workers=None,
+              compact=False, cache_directory=None, bounds=False,
+              prune=False):
+    """
+    Runs a sweep and returns its result table.
+
+    Parameters are the same as in iter_sweep.
+
+    Returns
+    -------
+    list of dict
+        Rows of the result table, in the order of the inputs (graph
+        parameters, then seeds, priorities and numbers of resources)
+    """
+    return [row
+            for rows in _cell_results(graph_grid, seeds, priorities,
+                                      resources, max_workers, compact,
+                                      cache_directory, bounds, prune,
+                                      ordered=True)
+            for row in rows]
+
+
+def write_csv(rows, file, columns=COLUMNS):
+    """
+    Writes rows of a result table as CSV, one row at a time.
+
+    Parameters
+    ----------
+    rows : iterable of dict
+        Rows from run_sweep or iter_sweep
+    file : file object
+        Text file opened for writing (with newline='')
+    columns : list of str [default = COLUMNS]
+        Columns to write (e.g., COLUMNS + BOUND_COLUMNS)
+    """
+    writer = csv.DictWriter(file, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
@@ -0,0 +1,212 @@
+"""Module writing and reading binary traces of simulations.
+
+A TraceWriter is a SimulationHooks object that records the READY, START
+and END events of a simulation as fixed-size binary records, instead of
+the text of debug messages:
+>>> with TraceWriter('run.trace', graph) as trace:
+...     simulate(graph, 20, quiet=True, hooks=trace)
+Records are packed in a buffer that is written in large blocks, or kept
+in a ring buffer holding only the last events. Tasks can be sampled to
+keep traces of very large runs small. read_trace iterates over the
+events of a trace file, and replay passes them to other hooks (e.g.,
+simulator.stats.DebugHooks to print the usual debug messages).
+
+File layout (little-endian, version 1)
+--------------------------------------
+- header: magic b'TASKTRC\\0', version, record size, number of records;
+- records: time (double), task index in vertex order (int64), resource
+  id (int32, -1 for READY events) and event kind (uint8), padded to 24
+  bytes.
+"""
+
+import struct
+
+from simulator.compact import CompactGraph
+from simulator.stats import SimulationHooks
+
+MAGIC = b'TASKTRC\0'
+VERSION = 1
+_HEADER = struct.Struct('<8sHHxxxxQ')
+_RECORD = struct.Struct('<dqiB3x')
+# Event kinds
+READY = 0
+START = 1
+END = 2
+KINDS = ['READY', 'START', 'END']
+
+
+class TraceFileError(ValueError):
+    """Error raised when a trace file is invalid"""
+
+
+class TraceWriter(SimulationHooks):
+    """
+    Hooks writing the events of a simulation in a trace file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Name of the file to write
+    graph : Graph or CompactGraph object
+        Graph that will be simulated
+    buffer_size : int [default = 65536]
+        Number of records buffered before writing them
+    last : int [optional]
+        If given, only the last events are kept (in a ring buffer of this
+        many records) and written when the writer is closed
+    sample : int [default = 1]
+        Only the events of one task out of sample (by index) are recorded
+
+    Attributes
+    ----------
+    num_records : int
+        Number of records written (or kept) so far
+
+    Raises
+    ------
+    ValueError
+        If buffer_size, last or sample is not positive
+    """
+    def __init__(self, path, graph, buffer_size=65536, last=None, sample=1):
+        for name, value in [('buffer_size', buffer_size), ('last', last),
+                            ('sample', sample)]:
+            if value is not None and value < 1:
+                raise ValueError(f'{name} must be positive, got {value}')
+        if isinstance(graph, CompactGraph):
+            self._position = None
+        else:
+            self._position = {id: i for i, id in enumerate(graph.vertices)}
+        self._sample = sample
+        self._ring = last is not None
+        self._capacity = last if self._ring else buffer_size
+        self._buffer = bytearray(self._capacity * _RECORD.size)
+        self._count = 0        # records in the buffer
+        self._next = 0         # next slot of the ring buffer
+        self.num_records = 0
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _record(self, kind, time, key, res_id):
+        """Adds a record to the buffer"""
+        i = key if self._position is None else self._position[key]
+        if i % self._sample:
+            return
+        if self._ring:
+            _RECORD.pack_into(self._buffer, self._next * _RECORD.size,
+                              time, i, res_id, kind)
+            self._next = (self._next + 1) % self._capacity
+            self._count = min(self._count + 1, self._capacity)
+            self.num_records = self._count
+        else:
+            _RECORD.pack_into(self._buffer, self._count * _RECORD.size,
+                              time, i, res_id, kind)
+            self._count += 1
+            self.num_records += 1
+            if self._count == self._capacity:
+                self.flush()
+
+    def ready(self, time, key):
+        self._record(READY, time, key, -1)
+
+    def start(self, time, key, res_id):
+        self._record(START, time, key, res_id)
+
+    def finish(self, time, key, res_id):
+        self._record(END, time, key, res_id)
+
+    def flush(self):
+        """Writes the buffered records (except in a ring buffer)"""
+        if not self._ring and self._count:
+            self._file.write(memoryview(self._buffer)
+                             [:self._count * _RECORD.size])
+            self._count = 0
+
+    def close(self):
+        """Writes all remaining records and closes the file"""
+        if self._file.closed:
+            return
+        if self._ring:
+            # Oldest records first
+            view = memoryview(self._buffer)
+            if self._count == self._capacity:
+                self._file.write(view[self._next * _RECORD.size:])
+            self._file.write(view[:self._next * _RECORD.size])
+        else:
+            self.flush()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size,
+                                      self.num_records))
+        self._file.close()
+
+
+def read_trace(path, block_size=65536):
+    """
+    Iterates over the events of a trace file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Name of the file to read
+    block_size : int [default = 65536]
+        Number of records read at once
+
+    Yields
+    ------
+    (int, float, int, int)
+        Event kind (READY, START or END), time, task index (in vertex
+        order) and resource id (-1 for READY events)
+
+    Raises
+    ------
+    TraceFileError
+        If the file is not a valid trace file
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise TraceFileError(f'{path} is too short to be a trace file')
+        magic, version, record_size, num_records = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or \
+                record_size != _RECORD.size:
+            raise TraceFileError(f'{path} is not a trace file (version '
+                                 f'{VERSION})')
+        while num_records:
+            size = min(num_records, block_size)
+            data = file.read(size * _RECORD.size)
+            if len(data) < size * _RECORD.size:
+                raise TraceFileError(f'{path} is truncated')
+            for time, i, res_id, kind in _RECORD.iter_unpack(data):
+                yield kind, time, i, res_id
+            num_records -= size
+
+
+def replay(path, hooks, ids=None):
+    """
+    Passes the events of a trace file to simulation hooks.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Name of the trace file
+    hooks : SimulationHooks object
+        Hooks to call for each event
+    ids : list or array of Task.id [optional]
+        Identifier of each task, used as task key (e.g., list(vertices)
+        for a Graph); task indices are used otherwise
+    """
+    for kind, time, i, res_id in read_trace(path):
+        key = i if ids is None else ids[i]
+        if time.is_integer():
+            time = int(time)
+        if kind == READY:
+            hooks.ready(time, key)
+        elif kind == START:
+            hooks.start(time, key, res_id)
+        else:
+            hooks.finish(time, key, res_id)
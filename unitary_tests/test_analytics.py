@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.graph import Graph, Task
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.analytics import analyze, np
+
+
+def metrics(profile):
+    return (profile.num_tasks, profile.num_edges, profile.level_sizes,
+            profile.level_work, profile.total_work, profile.critical_path,
+            profile.profile, profile.max_parallelism)
+
+
+class AnalyticsTest(unittest.TestCase):
+    def setUp(self):
+        # 0 -> 1 -> 3, 0 -> 2, and 4 alone
+        self.graph = Graph()
+        for id, load in enumerate([2, 3, 1, 4, 5]):
+            self.graph.vertices[id] = Task(id, load)
+        for pred_id, succ_id in [(0, 1), (1, 3), (0, 2)]:
+            self.graph.vertices[pred_id].successors.add(succ_id)
+            self.graph.vertices[succ_id].predecessors.add(pred_id)
+        self.graph.topological_ordering()
+
+    def test_metrics(self):
+        profile = analyze(self.graph)
+        self.assertEqual(profile.num_tasks, 5)
+        self.assertEqual(profile.num_edges, 3)
+        self.assertEqual(profile.depth, 3)
+        self.assertEqual(profile.level_sizes, [2, 2, 1])
+        self.assertEqual(profile.width, 2)
+        self.assertEqual(profile.level_work, [7, 4, 4])
+        self.assertEqual(profile.total_work, 15)
+        self.assertEqual(profile.critical_path, 9)
+        self.assertAlmostEqual(profile.parallelism, 15 / 9)
+        # 0 and 4 run in [0, 2), 1, 2 and 4 in [2, 3), 1 and 4 in [3, 5)
+        self.assertEqual(profile.profile,
+                         [(0, 2), (2, 3), (3, 2), (5, 1), (9, 0)])
+        self.assertEqual(profile.max_parallelism, 3)
+
+    def test_useful_resources(self):
+        for seed in range(10):
+            graph = Graph.generate_graph(100, (0, 10), (0, 4), True, seed)
+            profile = analyze(graph)
+            for function in [schedulers.priority_by_id,
+                             schedulers.priority_by_spt,
+                             schedulers.priority_by_cp]:
+                function(graph)
+                for extra in [0, 1, 10]:
+                    self.assertEqual(
+                        simulate(graph, profile.max_parallelism + extra,
+                                 quiet=True),
+                        profile.critical_path)
+            self.assertEqual(sum(profile.level_sizes), 100)
+            self.assertEqual(profile.width, max(profile.level_sizes))
+
+    def test_compact(self):
+        for seed in range(5):
+            graph = Graph.generate_graph(100, (1, 10), (0, 4), True, seed)
+            compact = CompactGraph.from_graph(graph)
+            self.assertEqual(metrics(analyze(compact)),
+                             metrics(analyze(graph)))
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_vectorized(self):
+        for seed in range(5):
+            graph = Graph.generate_graph(100, (0, 10), (0, 4), True, seed)
+            compact = Graph.generate_graph(100, (0, 10), (0, 4), True, seed,
+                                           compact=True)
+            self.assertEqual(metrics(analyze(compact, vectorized=True)),
+                             metrics(analyze(graph)))
+            self.assertEqual(metrics(analyze(graph, vectorized=True)),
+                             metrics(analyze(graph)))
+
+    def test_edited(self):
+        self.graph.add_edge(4, 2)
+        self.assertEqual(analyze(self.graph).critical_path, 9)
+        self.graph.add_task(5, 6, predecessors=[4])
+        profile = analyze(self.graph)
+        self.assertEqual(profile.critical_path, 11)
+        self.assertEqual(profile.level_sizes, [2, 3, 1])
+        self.assertEqual(simulate(self.graph, profile.max_parallelism,
+                                  quiet=True), 11)
+
+    def test_empty(self):
+        profile = analyze(Graph())
+        self.assertEqual(profile.depth, 0)
+        self.assertEqual(profile.width, 0)
+        self.assertEqual(profile.critical_path, 0)
+        self.assertEqual(profile.parallelism, 0.0)
+        self.assertEqual(profile.max_parallelism, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.graph import Graph, Task
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.bounds import lower_bounds
+
+
+def fork(root_load, num_children):
+    graph = Graph()
+    graph.vertices[0] = Task(0, root_load)
+    for id in range(1, num_children + 1):
+        graph.vertices[id] = Task(id, 1)
+        graph.vertices[id].predecessors.add(0)
+        graph.vertices[0].successors.add(id)
+    graph.topological_ordering()
+    return graph
+
+
+class BoundsTest(unittest.TestCase):
+    def test_fork(self):
+        graph = fork(5, 10)
+        bounds = lower_bounds(graph, 2)
+        self.assertEqual(bounds.critical_path, 6)
+        self.assertEqual(bounds.work, 8)
+        # The children can only start after the root
+        self.assertEqual(bounds.levels, 10)
+        self.assertEqual(bounds.value, 10)
+        self.assertEqual(bounds.gap(simulate(graph, 2, quiet=True)), 0.0)
+        self.assertEqual(bounds.gap(15), 0.5)
+
+    def test_valid(self):
+        for seed in range(20):
+            graph = Graph.generate_graph(50, (1, 10), (0, 3), True, seed)
+            compact = CompactGraph.from_graph(graph)
+            schedulers.priority_by_cp(graph)
+            for num_resources in [1, 2, 4, 16]:
+                bounds = lower_bounds(graph, num_resources)
+                self.assertLessEqual(bounds.value,
+                                     simulate(graph, num_resources,
+                                              quiet=True))
+                self.assertGreaterEqual(bounds.levels, bounds.work)
+                self.assertGreaterEqual(bounds.levels, bounds.critical_path)
+                self.assertEqual(repr(lower_bounds(compact, num_resources)),
+                                 repr(bounds))
+            self.assertEqual(lower_bounds(graph, 1).value,
+                             sum(task.load for task
+                                 in graph.vertices.values()))
+
+    def test_loads_and_speeds(self):
+        graph = fork(5, 10)
+        loads = [2.5] + [0.5] * 10
+        bounds = lower_bounds(graph, 2, loads=loads)
+        self.assertEqual(bounds.critical_path, 3.0)
+        self.assertEqual(bounds.work, 3.75)
+        self.assertEqual(bounds.levels, 5.0)
+        bounds = lower_bounds(graph, 2, speeds=[1, 4])
+        self.assertEqual(bounds.critical_path, 1.5)
+        self.assertEqual(bounds.work, 3.0)
+        self.assertLessEqual(bounds.value,
+                             simulate(graph, 2, quiet=True, speeds=[1, 4]))
+
+    def test_empty(self):
+        bounds = lower_bounds(Graph(), 4)
+        self.assertEqual(bounds.value, 0)
+        self.assertEqual(bounds.gap(0), 0.0)
+
+
+class StatsTest(unittest.TestCase):
+    def test_gap(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        schedulers.priority_by_id(graph)
+        makespan, stats = simulate(graph, 2, quiet=True, stats=True)
+        self.assertEqual(stats.lower_bound, lower_bounds(graph, 2).value)
+        self.assertAlmostEqual(stats.gap, (makespan - stats.lower_bound) /
+                               stats.lower_bound)
+        self.assertGreaterEqual(stats.gap, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
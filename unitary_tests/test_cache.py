@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.cache import GraphCache, structural_hash, _function_name
+from simulator.compact import CompactGraph
+from simulator.graph import Graph
+from simulator.simulator import simulate
+from simulator.sweep import run_sweep
+
+
+class CacheTest(unittest.TestCase):
+    def test_generate(self):
+        cache = GraphCache()
+        graph = cache.generate_graph(20, (1, 5), (1, 3), True, 100)
+        self.assertIs(cache.generate_graph(20, (1, 5), (1, 3), True, 100),
+                      graph)
+        self.assertIsNot(cache.generate_graph(20, (1, 5), (1, 3), True, 101),
+                         graph)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(len(graph.height), 20)  # levels are computed
+
+    def test_priority(self):
+        cache = GraphCache()
+        graph = cache.generate_graph(6, (1, 10), (0, 3), False, 10)
+        # Cached vectors do not depend on the current priorities
+        schedulers.priority_by_id(graph)
+        lpt = cache.priority(graph, schedulers.priority_by_lpt)
+        self.assertEqual(list(lpt), [-1, -7, -1, -8, -3, -9])
+        self.assertIs(cache.priority(graph, schedulers.priority_by_lpt), lpt)
+        cache.apply_priority(graph, schedulers.priority_by_id)
+        fresh = Graph.generate_graph(6, (1, 10), (0, 3), False, 10)
+        schedulers.priority_by_id(fresh)
+        self.assertEqual(simulate(graph, 2), simulate(fresh, 2))
+        cache.apply_priority(graph, schedulers.priority_by_lpt)
+        self.assertEqual(graph.vertices[5].priority, -9)
+
+    def test_closures(self):
+        # Functions with the same name are different entries
+        def make(sign):
+            def priority(graph):
+                for task in graph.vertices.values():
+                    task.priority = sign * task.id
+            return priority
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GraphCache(directory=directory)
+            graph = cache.generate_graph(10, (1, 5), (1, 3), False, 100)
+            self.assertEqual(list(cache.priority(graph, make(1))),
+                             list(range(10)))
+            self.assertEqual(list(cache.priority(graph, make(-1))),
+                             [-id for id in range(10)])
+            double = lambda graph: make(2)(graph)
+            self.assertEqual(list(cache.priority(graph, double)),
+                             [2 * id for id in range(10)])
+            # Only the graph is on disk
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_fingerprint(self):
+        # Functions with the same name and another code (e.g., after an
+        # edit) have another name on disk
+        namespace = dict()
+        exec('def priority(graph):\n    return 1', namespace)
+        first = namespace['priority']
+        exec('def priority(graph):\n    return 2', namespace)
+        second = namespace['priority']
+        self.assertEqual(first.__qualname__, second.__qualname__)
+        self.assertNotEqual(_function_name(first), _function_name(second))
+        self.assertIsNotNone(_function_name(schedulers.priority_by_cp))
+
+    def test_structural(self):
+        cache = GraphCache()
+        graph = Graph.generate_graph(30, (1, 5), (1, 3), True, 7)
+        same = Graph.generate_graph(30, (1, 5), (1, 3), True, 7)
+        self.assertEqual(structural_hash(graph), structural_hash(same))
+        self.assertEqual(structural_hash(graph),
+                         structural_hash(CompactGraph.from_graph(graph)))
+        self.assertIs(cache.add_graph(graph), graph)
+        self.assertIs(cache.add_graph(same), graph)
+        compact = CompactGraph.from_graph(same)
+        self.assertIs(cache.add_graph(compact), compact)
+
+    def test_eviction(self):
+        cache = GraphCache(max_bytes=5000)
+        for seed in range(5):
+            cache.generate_graph(20, (1, 5), (1, 3), True, seed,
+                                 compact=True)
+        self.assertEqual(len(cache), 2)
+        cache.generate_graph(20, (1, 5), (1, 3), True, 4, compact=True)
+        self.assertEqual(cache.hits, 1)
+
+    def test_reinsert(self):
+        # A graph still used after its eviction is cached again
+        cache = GraphCache(max_bytes=5000)
+        graph = cache.generate_graph(20, (1, 5), (1, 3), True, 0,
+                                     compact=True)
+        for seed in range(1, 4):
+            cache.generate_graph(20, (1, 5), (1, 3), True, seed,
+                                 compact=True)
+        self.assertNotIn(cache._keys[graph], cache)
+        cp = cache.priority(graph, schedulers.priority_by_cp)
+        self.assertIn(cache._keys[graph], cache)
+        self.assertIs(cache.priority(graph, schedulers.priority_by_cp), cp)
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = GraphCache(directory=directory)
+            graph = cache.generate_graph(20, (1, 5), (1, 3), True, 100)
+            cp = cache.priority(graph, schedulers.priority_by_cp)
+            # A new cache (e.g., in another process) finds both on disk
+            other = GraphCache(directory=directory)
+            loaded = other.generate_graph(20, (1, 5), (1, 3), True, 100)
+            self.assertEqual((other.hits, other.misses), (1, 0))
+            self.assertEqual(loaded.topological_order,
+                             graph.topological_order)
+            self.assertEqual(other.priority(loaded,
+                                            schedulers.priority_by_cp), cp)
+            # Partial or invalid vectors are recomputed
+            names = [name for name in os.listdir(directory)
+                     if name.endswith('.prio')]
+            self.assertEqual(len(names), 1)
+            path = os.path.join(directory, names[0])
+            for data in [b'', b'q', open(path, 'rb').read()[:-8]]:
+                with open(path, 'wb') as file:
+                    file.write(data)
+                other = GraphCache(directory=directory)
+                loaded = other.generate_graph(20, (1, 5), (1, 3), True, 100)
+                self.assertEqual(other.priority(loaded,
+                                                schedulers.priority_by_cp),
+                                 cp)
+            self.assertFalse(any(name.endswith('.tmp')
+                                 for name in os.listdir(directory)))
+
+    def test_sweep(self):
+        grid = [{'num_tasks': 20, 'load_range': (1, 5),
+                 'dependency_range': (1, 3), 'rename': True}]
+        priorities = [schedulers.priority_by_id, schedulers.priority_by_lpt]
+        expected = run_sweep(grid, [100], priorities, [10, 2], max_workers=1)
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                rows = run_sweep(grid, [100], priorities, [10, 2],
+                                 max_workers=1, cache_directory=directory)
+                self.assertEqual(rows, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.compact import CompactGraph
+from simulator.graph import Graph, CycleError
+from simulator.simulator import simulate
+
+
+class ConversionTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(200, (1, 10), (0, 5), True, 7)
+
+    def test_attributes(self):
+        compact = CompactGraph.from_graph(self.graph)
+        self.assertEqual(len(compact), 200)
+        for i, id in enumerate(compact.ids):
+            task = self.graph.vertices[id]
+            self.assertEqual(compact.loads[i], task.load)
+            self.assertEqual({compact.ids[j] for j in compact.successors(i)},
+                             task.successors)
+            self.assertEqual({compact.ids[j] for j in compact.predecessors(i)},
+                             task.predecessors)
+        self.assertEqual([compact.ids[i] for i in compact.topological_order],
+                         self.graph.topological_order)
+
+    def test_round_trip(self):
+        schedulers.priority_by_id(self.graph)
+        graph = CompactGraph.from_graph(self.graph).to_graph()
+        self.assertEqual(list(graph.vertices), list(self.graph.vertices))
+        for id, task in graph.vertices.items():
+            original = self.graph.vertices[id]
+            self.assertEqual(task.load, original.load)
+            self.assertEqual(task.priority, original.priority)
+            self.assertEqual(task.successors, original.successors)
+            self.assertEqual(task.predecessors, original.predecessors)
+        self.assertEqual(graph.topological_order,
+                         self.graph.topological_order)
+        self.assertEqual(graph.depth, self.graph.depth)
+
+    def test_generate(self):
+        compact = Graph.generate_graph(200, (1, 10), (0, 5), True, 7,
+                                       compact=True)
+        expected = CompactGraph.from_graph(self.graph)
+        for name in ['ids', 'loads', 'succ_offsets', 'succ_indices',
+                     'pred_offsets', 'pred_indices', 'topological_order',
+                     'level_offsets', 'depth']:
+            self.assertEqual(getattr(compact, name), getattr(expected, name))
+
+    def test_cycle(self):
+        compact = CompactGraph.from_graph(self.graph)
+        # Adds an edge from the last task in the order back to the first one
+        last = compact.topological_order[-1]
+        first = compact.topological_order[0]
+        graph = compact.to_graph()
+        graph.vertices[compact.ids[last]].successors.add(compact.ids[first])
+        graph.vertices[compact.ids[first]].predecessors.add(compact.ids[last])
+        with self.assertRaises(CycleError):
+            CompactGraph.from_graph(graph).topological_ordering()
+
+
+class CompactSchedulingTest(unittest.TestCase):
+    def test_priorities(self):
+        for name in ['priority_by_id', 'priority_by_topological_order',
+                     'priority_by_lpt', 'priority_by_spt',
+                     'priority_by_successors', 'priority_by_hlf',
+                     'priority_by_cp']:
+            graph = Graph.generate_graph(50, (1, 10), (0, 4), True, 3)
+            compact = CompactGraph.from_graph(graph)
+            getattr(schedulers, name)(graph)
+            getattr(schedulers, name)(compact)
+            for i, id in enumerate(compact.ids):
+                self.assertEqual(compact.priority[i],
+                                 graph.vertices[id].priority, name)
+
+    def test_simulate(self):
+        compact = Graph.generate_graph(20, (1, 5), (1, 3), True, 100,
+                                       compact=True)
+        schedulers.priority_by_id(compact)
+        self.assertEqual(simulate(compact, 10, False), 22)
+        # The compact graph is not consumed by the simulation
+        self.assertEqual(simulate(compact, 2, False), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
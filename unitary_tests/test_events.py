@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.compact import CompactGraph
+from simulator.events import HeapEventQueue, BucketEventQueue, \
+    make_event_queue
+from simulator.graph import Graph, Task
+from simulator.simulator import simulate
+
+
+class EventQueueTest(unittest.TestCase):
+    def check_queue(self, queue):
+        for time, key, res_id in [(3, 5, 0), (1, 2, 1), (3, 1, 2),
+                                  (2, 4, 3), (1, 0, 4)]:
+            queue.push(time, key, res_id)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual(queue.pop_batch(), (1, [(0, 4), (2, 1)]))
+        queue.push(2, 3, 5)
+        self.assertEqual(queue.pop_batch(), (2, [(3, 5), (4, 3)]))
+        self.assertEqual(queue.pop_batch(), (3, [(1, 2), (5, 0)]))
+        self.assertEqual(len(queue), 0)
+
+    def test_heap(self):
+        self.check_queue(HeapEventQueue())
+
+    def test_bucket(self):
+        self.check_queue(BucketEventQueue(3))
+
+    def test_choice(self):
+        self.assertIsInstance(make_event_queue('auto', [1, 5, 3]),
+                              BucketEventQueue)
+        self.assertIsInstance(make_event_queue('auto', [1, 2.5]),
+                              HeapEventQueue)
+        with self.assertRaises(ValueError):
+            make_event_queue('bucket', [1, 2.5])
+        # Large loads: skipping the empty buckets would be slower
+        self.assertIsInstance(make_event_queue('auto', [60000] * 300),
+                              HeapEventQueue)
+        self.assertIsInstance(make_event_queue('auto', [1, 1, 50]),
+                              HeapEventQueue)
+
+
+class BackendsTest(unittest.TestCase):
+    def test_same_results(self):
+        for seed in range(5):
+            graph = Graph.generate_graph(300, (1, 20), (0, 6), True, seed)
+            for name in ['priority_by_id', 'priority_by_spt',
+                         'priority_by_cp']:
+                schedulers.reset_priorities(graph)
+                getattr(schedulers, name)(graph)
+                for num_resources in [1, 3, 16]:
+                    self.assertEqual(
+                        simulate(graph, num_resources, event_queue='heap'),
+                        simulate(graph, num_resources, event_queue='bucket'))
+
+    def test_float_loads(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        for task in graph.vertices.values():
+            task.load /= 2
+        schedulers.priority_by_id(graph)
+        self.assertEqual(simulate(graph, 10), 11)
+        self.assertEqual(simulate(CompactGraph.from_graph(graph), 10), 11)
+
+    def test_simultaneous_completions(self):
+        # Tasks 0 and 1 finish at time 2 and free 2 resources. Task 1 frees
+        # tasks 3 and 4, which have a higher priority than task 2 (waiting
+        # since time 0), so both must start at time 2.
+        graph = Graph()
+        for id, load, priority in [(0, 2, 0), (1, 2, 1), (2, 1, 9),
+                                   (3, 1, 2), (4, 1, 3), (5, 5, 4)]:
+            graph.vertices[id] = Task(id, load)
+            graph.vertices[id].priority = priority
+        for pred, succ in [(1, 3), (1, 4), (4, 5)]:
+            graph.vertices[pred].successors.add(succ)
+            graph.vertices[succ].predecessors.add(pred)
+        graph.topological_ordering()
+        self.assertEqual(simulate(graph, 2, event_queue='heap'), 8)
+        self.assertEqual(simulate(graph, 2, event_queue='bucket'), 8)
+
+    def test_sparse_loads(self):
+        # Chain of tasks of large load: 'auto' uses a heap
+        graph = Graph()
+        for id in range(300):
+            graph.vertices[id] = Task(id, 60000)
+            if id:
+                graph.vertices[id - 1].successors.add(id)
+                graph.vertices[id].predecessors.add(id - 1)
+        graph.topological_ordering()
+        schedulers.priority_by_id(graph)
+        self.assertEqual(simulate(graph, 2), 300 * 60000)
+
+    def test_zero_loads(self):
+        graph = Graph.generate_graph(50, (0, 3), (0, 4), True, 8)
+        schedulers.priority_by_id(graph)
+        self.assertEqual(simulate(graph, 2, event_queue='heap'),
+                         simulate(graph, 2, event_queue='bucket'))
+
+
+if __name__ == '__main__':
+    unittest.main()
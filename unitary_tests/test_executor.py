@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import asyncio
+import time
+from functools import partial
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id, priority_by_cp
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.executor import execute
+
+
+def square(x):
+    return x * x
+
+
+def fail():
+    raise RuntimeError('task failed')
+
+
+class ExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+        self.functions = {id: partial(square, id)
+                          for id in self.graph.vertices}
+
+    def check_order(self, report):
+        """Each task starts after its predecessors finish"""
+        position = {id: i for i, id in enumerate(report.schedule.ids)}
+        for id, task in self.graph.vertices.items():
+            for succ_id in task.successors:
+                self.assertLessEqual(
+                    report.schedule.finish[position[id]],
+                    report.schedule.start[position[succ_id]])
+
+    def test_thread(self):
+        report = execute(self.graph, self.functions, 4)
+        self.assertEqual(report.results,
+                         {id: id * id for id in self.graph.vertices})
+        self.assertEqual(report.simulated_makespan,
+                         simulate(self.graph, 4, quiet=True))
+        self.assertGreaterEqual(report.makespan, 0)
+        self.assertTrue(all(0 <= worker < 4
+                            for worker in report.schedule.resource))
+        self.check_order(report)
+
+    def test_process(self):
+        report = execute(self.graph, self.functions, 2, backend='process')
+        self.assertEqual(report.results,
+                         {id: id * id for id in self.graph.vertices})
+        self.check_order(report)
+
+    def test_asyncio(self):
+        async def task(id):
+            await asyncio.sleep(0)
+            return id
+
+        functions = {id: partial(task, id) for id in self.graph.vertices}
+        functions[0] = partial(square, 3)
+        report = execute(self.graph, functions, 3, backend='asyncio')
+        self.assertEqual(report.results[0], 9)
+        self.assertEqual(report.results[5], 5)
+        self.check_order(report)
+
+    def test_calibration(self):
+        graph = Graph.generate_graph(8, (1, 3), (0, 2), False, 4)
+        priority_by_cp(graph)
+        functions = {id: partial(time.sleep, task.load / 200)
+                     for id, task in graph.vertices.items()}
+        report = execute(graph, functions, 2)
+        self.assertGreater(report.time_per_load, 0.004)
+        self.assertGreaterEqual(report.makespan,
+                                0.9 * report.simulated_makespan / 200)
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        report = execute(compact, self.functions, 4)
+        self.assertEqual(report.results,
+                         {id: id * id for id in self.graph.vertices})
+
+    def test_error(self):
+        self.functions[3] = fail
+        with self.assertRaises(RuntimeError):
+            execute(self.graph, self.functions, 4)
+        with self.assertRaises(ValueError):
+            execute(self.graph, self.functions, 4, backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import random
+import unittest
+import sys
+from concurrent.futures import ThreadPoolExecutor
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.compact import CompactGraph
+from simulator.generator import generate_chunks, iter_tasks, np
+from simulator.graph import Graph, Task
+
+
+def edges(graph):
+    return {(id, succ) for id, task in graph.vertices.items()
+            for succ in task.successors}
+
+
+class GeneratorTest(unittest.TestCase):
+    def check_graph(self, mode):
+        graph = Graph.generate_graph(300, (2, 7), (1, 6), True, 9, mode=mode)
+        self.assertEqual(sorted(graph.vertices), list(range(300)))
+        position = {id: i for i, id in enumerate(graph.topological_order)}
+        for id, task in graph.vertices.items():
+            self.assertTrue(2 <= task.load < 7)
+            self.assertTrue(len(task.predecessors) < 6)
+            for pred in task.predecessors:
+                self.assertLess(position[pred], position[id])
+        same = Graph.generate_graph(300, (2, 7), (1, 6), True, 9, mode=mode)
+        self.assertEqual(edges(same), edges(graph))
+        other = Graph.generate_graph(300, (2, 7), (1, 6), True, 8, mode=mode)
+        self.assertNotEqual(edges(other), edges(graph))
+
+    def check_chunks(self, mode):
+        chunks = generate_chunks(1000, (1, 10), (0, 8), True, 4, mode,
+                                 chunk_size=64)
+        graph = Graph()
+        for id, load, predecessors in iter_tasks(chunks):
+            graph.vertices[id] = Task(id, load)
+            for pred in predecessors:
+                graph.vertices[id].predecessors.add(pred)
+                graph.vertices[pred].successors.add(id)
+        compact = CompactGraph.from_chunks(
+            generate_chunks(1000, (1, 10), (0, 8), True, 4, mode,
+                            chunk_size=64))
+        self.assertEqual(edges(compact.to_graph()), edges(graph))
+
+    def test_python(self):
+        self.check_graph('python')
+        self.check_chunks('python')
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_numpy(self):
+        self.check_graph('numpy')
+        self.check_chunks('numpy')
+
+    def test_compact(self):
+        graph = Graph.generate_graph(500, (1, 10), (0, 5), True, 3,
+                                     mode='python')
+        compact = Graph.generate_graph(500, (1, 10), (0, 5), True, 3,
+                                       compact=True, mode='python')
+        self.assertEqual(edges(compact.to_graph()), edges(graph))
+        self.assertEqual(compact.to_graph().topological_order,
+                         graph.topological_order)
+
+    def test_global_state(self):
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        for mode in ['legacy', 'python']:
+            Graph.generate_graph(50, (1, 10), (0, 3), True, 1, mode=mode)
+        self.assertEqual(random.random(), expected)
+
+    def test_threads(self):
+        expected = edges(Graph.generate_graph(200, (1, 10), (0, 5), True, 2))
+        with ThreadPoolExecutor(4) as pool:
+            graphs = list(pool.map(
+                lambda _: Graph.generate_graph(200, (1, 10), (0, 5), True, 2),
+                range(8)))
+        for graph in graphs:
+            self.assertEqual(edges(graph), expected)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Graph.generate_graph(10, (1, 10), (0, 3), mode='fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,9 @@ import sys
 # code from our simulator
 sys.path.append('../')
 
-from simulator.graph import Graph, Task
+from simulator.graph import Graph, Task, CycleError
+from simulator.levels import compute_levels
+from simulator.schedulers import priority_by_cp, update_priorities
 
 
 class TaskTest(unittest.TestCase):
@@ -83,6 +85,144 @@ class GraphTest(unittest.TestCase):
         self.assertEqual(topo2[4], 1)
         self.assertEqual(topo2[5], 5)
 
+    def test_depth(self):
+        depth = self.graph1.topological_ordering()
+        self.assertEqual(depth, {0: 0, 1: 1, 2: 0, 3: 0, 4: 0, 5: 1})
+        self.assertEqual(self.graph1.depth, depth)
+        self.assertEqual(self.graph1.level_offsets, [0, 4])
+
+    def test_mixed_ids(self):
+        # Identifiers that cannot be compared: insertion order in a level
+        graph = Graph()
+        for id in ['a', 1, 'b', 0]:
+            graph.vertices[id] = Task(id, 1)
+        for pred_id, succ_id in [('a', 'b'), ('a', 0), (1, 0), ('a', 1)]:
+            graph.vertices[pred_id].successors.add(succ_id)
+            graph.vertices[succ_id].predecessors.add(pred_id)
+        self.assertEqual(graph.topological_ordering(),
+                         {'a': 0, 1: 1, 'b': 1, 0: 2})
+        self.assertEqual(graph.topological_order, ['a', 1, 'b', 0])
+
+    def test_deterministic(self):
+        graph = Graph.generate_graph(500, (1, 10), (1, 10), True, 42)
+        order = list(graph.topological_order)
+        graph.topological_ordering()
+        self.assertEqual(graph.topological_order, order)
+        position = {id: i for i, id in enumerate(order)}
+        for id, task in graph.vertices.items():
+            for succ_id in task.successors:
+                self.assertLess(position[id], position[succ_id])
+                self.assertLess(graph.depth[id], graph.depth[succ_id])
+
+    def test_cycle(self):
+        graph = Graph()
+        for i in range(5):
+            graph.vertices[i] = Task(i, 1)
+        for pred, succ in [(0, 1), (1, 2), (2, 3), (3, 1), (3, 4)]:
+            graph.vertices[pred].successors.add(succ)
+            graph.vertices[succ].predecessors.add(pred)
+        with self.assertRaises(CycleError) as context:
+            graph.topological_ordering()
+        self.assertEqual(context.exception.vertices, [1, 2, 3])
+
+
+class EditTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(30, (1, 9), (0, 3), True, 5)
+        compute_levels(self.graph)
+
+    def check(self):
+        """Compares the graph with one computed from scratch"""
+        position = {id: i for i, id
+                    in enumerate(self.graph.topological_order)}
+        self.assertEqual(len(position), len(self.graph.vertices))
+        reference = Graph()
+        for id, task in self.graph.vertices.items():
+            reference.vertices[id] = Task(id, task.load)
+            for succ_id in task.successors:
+                self.assertLess(position[id], position[succ_id])
+        for id, task in self.graph.vertices.items():
+            for succ_id in task.successors:
+                reference.vertices[id].successors.add(succ_id)
+                reference.vertices[succ_id].predecessors.add(id)
+        depth = reference.topological_ordering()
+        compute_levels(reference)
+        for id, task in self.graph.vertices.items():
+            self.assertEqual(self.graph.depth[id], depth[id])
+            self.assertEqual(task.top_level,
+                             reference.vertices[id].top_level)
+            self.assertEqual(task.bottom_level,
+                             reference.vertices[id].bottom_level)
+            self.assertEqual(self.graph.height[id], reference.height[id])
+
+    def test_add_edge(self):
+        # From the last task to the first one forces a reordering
+        first, last = self.graph.topological_order[0], \
+            self.graph.topological_order[-1]
+        changed = self.graph.add_edge(last, first)
+        self.assertIn(first, changed)
+        self.assertIn(last, changed)
+        self.check()
+
+    def test_cycle(self):
+        first, last = self.graph.topological_order[0], \
+            self.graph.topological_order[-1]
+        self.graph.add_edge(first, last)
+        order = list(self.graph.topological_order)
+        with self.assertRaises(CycleError) as context:
+            self.graph.add_edge(last, first)
+        self.assertEqual(context.exception.vertices, [first, last])
+        self.assertNotIn(first, self.graph.vertices[last].successors)
+        self.assertEqual(self.graph.topological_order, order)
+
+    def test_add_task_cycle(self):
+        first, last = self.graph.topological_order[0], \
+            self.graph.topological_order[-1]
+        self.graph.add_edge(first, last)
+        successors = set(self.graph.vertices[last].successors)
+        levels = {id: (task.top_level, task.bottom_level)
+                  for id, task in self.graph.vertices.items()}
+        # The edge from last is added before the one to first fails
+        with self.assertRaises(CycleError):
+            self.graph.add_task(100, 50, [last], [first])
+        self.assertNotIn(100, self.graph.vertices)
+        self.assertNotIn(100, self.graph.topological_order)
+        self.assertEqual(self.graph.vertices[last].successors, successors)
+        self.assertEqual({id: (task.top_level, task.bottom_level)
+                          for id, task in self.graph.vertices.items()},
+                         levels)
+        self.check()
+        with self.assertRaises(KeyError):
+            self.graph.add_task(100, 50, [first], [-1])
+        self.assertNotIn(100, self.graph.vertices)
+        self.check()
+
+    def test_edits(self):
+        ids = list(self.graph.vertices)
+        self.graph.set_load(ids[3], 100)
+        self.check()
+        pred_id = next(id for id in ids if self.graph.vertices[id].successors)
+        succ_id = min(self.graph.vertices[pred_id].successors)
+        self.graph.remove_edge(pred_id, succ_id)
+        self.check()
+        self.graph.add_task(100, 7, ids[:2], ids[-1:])
+        self.check()
+        self.graph.remove_task(ids[5])
+        self.assertNotIn(ids[5], self.graph.topological_order)
+        self.check()
+        with self.assertRaises(ValueError):
+            self.graph.add_task(100, 1)
+
+    def test_priorities(self):
+        priority_by_cp(self.graph)
+        ids = list(self.graph.vertices)
+        for edit in [lambda: self.graph.set_load(ids[0], 50),
+                     lambda: self.graph.add_edge(ids[-1], ids[1]),
+                     lambda: self.graph.add_task(200, 3, [ids[2]])]:
+            update_priorities(self.graph, priority_by_cp, edit())
+            for task in self.graph.vertices.values():
+                self.assertEqual(task.priority, -task.bottom_level)
+
 
 if __name__ == '__main__':
     unittest.main()
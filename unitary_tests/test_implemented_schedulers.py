@@ -7,7 +7,9 @@ import sys
 sys.path.append('../')
 
 from simulator.schedulers import priority_by_id, priority_by_topological_order
+import simulator.schedulers as schedulers
 from simulator.graph import Graph
+from simulator.compact import CompactGraph
 
 
 class ByIDTest(unittest.TestCase):
@@ -34,5 +36,54 @@ class ByTopoTest(unittest.TestCase):
         self.assertEqual(graph.vertices[5].priority, 4)
 
 
+class VectorTest(unittest.TestCase):
+    functions = [schedulers.priority_by_id,
+                 schedulers.priority_by_topological_order,
+                 schedulers.priority_by_lpt, schedulers.priority_by_spt,
+                 schedulers.priority_by_successors,
+                 schedulers.priority_by_hlf, schedulers.priority_by_cp]
+
+    def test_same_priorities(self):
+        for function in self.functions:
+            graph = Graph.generate_graph(50, (1, 10), (0, 4), True, 10)
+            vector = function(graph, vector=True)
+            self.assertEqual(list(schedulers.get_priorities(graph)),
+                             [-1] * 50)
+            function(graph)
+            self.assertEqual(list(vector),
+                             list(schedulers.get_priorities(graph)))
+
+    def test_compact(self):
+        graph = Graph.generate_graph(50, (1, 10), (0, 4), True, 10)
+        compact = CompactGraph.from_graph(graph)
+        for function in self.functions:
+            self.assertEqual(list(function(compact, vector=True)),
+                             list(function(graph, vector=True)))
+
+    def test_call_order(self):
+        # Results do not depend on the previous priorities
+        for function in self.functions:
+            graph = Graph.generate_graph(50, (1, 10), (0, 4), True, 10)
+            expected = function(graph, vector=True)
+            schedulers.priority_by_successors(graph)
+            schedulers.priority_by_lpt(graph)
+            function(graph)
+            self.assertEqual(list(schedulers.get_priorities(graph)),
+                             list(expected))
+
+    def test_priority_vector(self):
+        graph = Graph.generate_graph(50, (1, 10), (0, 4), True, 10)
+        schedulers.priority_by_id(graph)
+        before = list(schedulers.get_priorities(graph))
+
+        def by_negative_id(graph):
+            for id, task in graph.vertices.items():
+                task.priority = -id
+
+        vector = schedulers.priority_vector(graph, by_negative_id)
+        self.assertEqual(list(vector), [-id for id in graph.vertices])
+        self.assertEqual(list(schedulers.get_priorities(graph)), before)
+
+
 if __name__ == '__main__':
     unittest.main()
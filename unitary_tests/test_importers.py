@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.compact import CompactGraph
+from simulator.graph import Graph, CycleError
+from simulator.schedulers import priority_by_cp
+from simulator.simulator import simulate
+from simulator.importers import read_graph, GraphFormatError
+
+DOT = '''// Example
+strict digraph "example" {
+  graph [rankdir=LR];
+  node [shape=box]
+  0 [load=3, label="start"];
+  1 [label="x y", load=2]
+  2 [load="4"]
+  0 -> 1 -> 2 [weight=1];
+  0 -> 2
+  subgraph cluster_a {
+    3 [
+      load=7
+    ]
+    1 -> 3;
+  }
+}
+'''
+
+STG = '''4
+0 0 0
+1 5 1 0
+2 3 1 0
+3 2 2 1 2
+4 4 1 3
+5 0 1 4
+# Comments and metadata
+'''
+
+WFCOMMONS = {
+    'name': 'example', 'schemaVersion': '1.5',
+    'workflow': {
+        'specification': {'tasks': [
+            {'name': 'a', 'id': 'ID1', 'parents': [],
+             'children': ['ID2', 'ID3']},
+            {'name': 'b', 'id': 'ID2', 'parents': ['ID1'],
+             'children': ['ID4']},
+            {'name': 'c', 'id': 'ID3', 'parents': ['ID1'],
+             'children': ['ID4']},
+            {'name': 'd', 'id': 'ID4', 'parents': ['ID2', 'ID3'],
+             'children': []}]},
+        'execution': {'makespanInSeconds': 6, 'tasks': [
+            {'id': 'ID1', 'runtimeInSeconds': 1.5},
+            {'id': 'ID2', 'runtimeInSeconds': 2},
+            {'id': 'ID3', 'runtimeInSeconds': 3.25},
+            {'id': 'ID4', 'runtimeInSeconds': 1}]}}}
+
+
+class ImportersTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(text)
+        return path
+
+    def check(self, graph, loads, edges):
+        self.assertIsInstance(graph, Graph)
+        self.assertEqual({id: task.load for id, task
+                          in graph.vertices.items()}, loads)
+        self.assertEqual({(id, succ_id) for id, task
+                          in graph.vertices.items()
+                          for succ_id in task.successors}, edges)
+        for id, task in graph.vertices.items():
+            for succ_id in task.successors:
+                self.assertIn(id, graph.vertices[succ_id].predecessors)
+        self.assertEqual(sorted(graph.topological_order),
+                         sorted(graph.vertices))
+
+    def test_dot(self):
+        path = self.write('graph.dot', DOT)
+        graph = read_graph(path)
+        self.check(graph, {0: 3, 1: 2, 2: 4, 3: 7},
+                   {(0, 1), (1, 2), (0, 2), (1, 3)})
+        self.assertEqual(graph.topological_order, [0, 1, 2, 3])
+        graph = read_graph(path, load_attribute='weight', default_load=5)
+        self.assertEqual(graph.vertices[0].load, 5)
+
+    def test_dot_url(self):
+        # '//' in a quoted string does not start a comment
+        path = self.write('url.dot', 'digraph {\n'
+                          'a [load=3, URL="http://example.com"]; '
+                          'b [load=2]; a -> b; // comment "\n}\n')
+        self.check(read_graph(path), {'a': 3, 'b': 2}, {('a', 'b')})
+
+    def test_stg(self):
+        path = self.write('graph.stg', STG)
+        self.check(read_graph(path), {0: 0, 1: 5, 2: 3, 3: 2, 4: 4, 5: 0},
+                   {(0, 1), (0, 2), (1, 3), (2, 3), (3, 4), (4, 5)})
+        graph = read_graph(path, dummies=False)
+        self.check(graph, {1: 5, 2: 3, 3: 2, 4: 4},
+                   {(1, 3), (2, 3), (3, 4)})
+        self.assertEqual(simulate(graph, 2, quiet=True), 11)
+
+    def test_wfcommons(self):
+        path = self.write('workflow.json', json.dumps(WFCOMMONS, indent=1))
+        for block_size in [1, 7, 1 << 16]:
+            graph = read_graph(path, block_size=block_size)
+            self.check(graph, {'ID1': 1.5, 'ID2': 2, 'ID3': 3.25, 'ID4': 1},
+                       {('ID1', 'ID2'), ('ID1', 'ID3'), ('ID2', 'ID4'),
+                        ('ID3', 'ID4')})
+        # Pegasus-style traces: jobs referred to by name
+        jobs = {'workflow': {'jobs': [
+            {'name': 'b', 'runtime': 4, 'parents': ['a']},
+            {'name': 'a', 'runtime': 2, 'parents': []}]}}
+        path = self.write('trace.json', json.dumps(jobs))
+        self.check(read_graph(path), {'a': 2, 'b': 4}, {('a', 'b')})
+
+    def test_compact(self):
+        paths = [self.write('graph.dot', DOT), self.write('graph.stg', STG),
+                 self.write('workflow.json', json.dumps(WFCOMMONS))]
+        for path in paths:
+            graph = read_graph(path)
+            compact = read_graph(path, compact=True)
+            self.assertIsInstance(compact, CompactGraph)
+            self.assertEqual(list(compact.ids), list(graph.vertices))
+            self.assertEqual([compact.ids[i] for i
+                              in compact.topological_order],
+                             graph.topological_order)
+            priority_by_cp(graph)
+            priority_by_cp(compact)
+            self.assertEqual(simulate(compact, 2, quiet=True),
+                             simulate(graph, 2, quiet=True))
+
+    def test_generated(self):
+        graph = Graph.generate_graph(200, (1, 10), (0, 4), False, 3)
+        lines = [f'{len(graph.vertices)}', '0 0 0']
+        for id, task in graph.vertices.items():
+            predecessors = [pred + 1 for pred in sorted(task.predecessors)]
+            predecessors = predecessors or [0]
+            lines.append(f'{id + 1} {task.load} {len(predecessors)} ' +
+                         ' '.join(map(str, predecessors)))
+        lines.append(f'{len(graph.vertices) + 1} 0 0')
+        path = self.write('generated.stg', '\n'.join(lines))
+        imported = read_graph(path, dummies=False, compact=True)
+        self.assertEqual(len(imported), 200)
+        self.assertEqual(simulate(imported, 4, quiet=True),
+                         simulate(graph, 4, quiet=True))
+
+    def test_errors(self):
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.txt', DOT))
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.txt', DOT), format='xml')
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.dot', 'graph G { a -- b }'))
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.dot', 'digraph G { a -> }'))
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.stg', '4\n0 0 0\n1 5 1'))
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('graph.stg', '1\n0 0 0\n1 5 1 2\n2 0 1 1'))
+        with self.assertRaises(GraphFormatError):
+            read_graph(self.write('workflow.json',
+                                  '{"tasks": [{"id": "a", "parents": ['))
+        with self.assertRaises(CycleError):
+            read_graph(self.write('graph.dot', 'digraph { a -> b -> a }'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.compact import CompactGraph
+from simulator.graph import Graph, Task
+from simulator.levels import compute_levels, ensure_levels, has_levels, np
+from simulator.schedulers import priority_by_cp
+
+
+class LevelsTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(6, (1, 10), (0, 4), False, 10)
+
+    def test_simple(self):
+        self.assertFalse(has_levels(self.graph))
+        compute_levels(self.graph)
+        vertices = self.graph.vertices
+        self.assertEqual([vertices[i].top_level for i in range(6)],
+                         [0, 1, 8, 9, 17, 0])
+        self.assertEqual([vertices[i].bottom_level for i in range(6)],
+                         [18, 17, 10, 9, 1, 6])
+        self.assertEqual([self.graph.height[i] for i in range(6)],
+                         [5, 4, 3, 2, 1, 1])
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        compute_levels(compact)
+        compute_levels(self.graph)
+        self.assertEqual(compact.to_graph().height, self.graph.height)
+        self.assertEqual(list(compact.top_level), [0, 1, 8, 9, 17, 0])
+        self.assertEqual(list(compact.bottom_level), [18, 17, 10, 9, 1, 6])
+
+    def test_cached(self):
+        ensure_levels(self.graph)
+        self.graph.vertices[0].bottom_level = 100
+        priority_by_cp(self.graph)
+        self.assertEqual(self.graph.vertices[0].priority, -100)
+
+    def test_long_chain(self):
+        graph = Graph()
+        for i in range(20000):
+            graph.vertices[i] = Task(i, 1)
+            if i > 0:
+                graph.vertices[i].predecessors.add(i - 1)
+                graph.vertices[i - 1].successors.add(i)
+        graph.topological_ordering()
+        priority_by_cp(graph)
+        self.assertEqual(graph.vertices[0].priority, -20000)
+        self.assertEqual(graph.vertices[19999].top_level, 19999)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_vectorized(self):
+        graph = Graph.generate_graph(2000, (1, 20), (0, 8), True, 11)
+        compact = CompactGraph.from_graph(graph)
+        compute_levels(compact, vectorized=True)
+        compute_levels(graph)
+        self.assertEqual(compact.to_graph().height, graph.height)
+        for i, id in enumerate(compact.ids):
+            task = graph.vertices[id]
+            self.assertEqual(compact.top_level[i], task.top_level)
+            self.assertEqual(compact.bottom_level[i], task.bottom_level)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.montecarlo import draw_loads, monte_carlo, MonteCarloResult, \
+    MODELS
+
+
+class DrawTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+
+    def test_models(self):
+        loads = [task.load for task in self.graph.vertices.values()]
+        for model in MODELS:
+            vectors = draw_loads(self.graph, 50, model, 0.1, 3)
+            self.assertEqual(len(vectors), 50)
+            self.assertTrue(all(len(vector) == 20 for vector in vectors))
+            self.assertTrue(all(load >= 0 for vector in vectors
+                                for load in vector))
+            self.assertEqual(vectors, draw_loads(self.graph, 50, model,
+                                                 0.1, 3))
+        for vector in draw_loads(self.graph, 10, 'uniform', 0.1, 3):
+            for load, reference in zip(vector, loads):
+                self.assertLessEqual(abs(load - reference),
+                                     0.1 * reference + 1e-9)
+
+    def test_custom(self):
+        vectors = draw_loads(self.graph, 3,
+                             lambda rng, loads, k: [loads] * k)
+        self.assertEqual(vectors[2], [task.load for task
+                                      in self.graph.vertices.values()])
+        with self.assertRaises(ValueError):
+            draw_loads(self.graph, 3, 'cauchy')
+
+
+class MonteCarloTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        self.priorities = [schedulers.priority_by_id,
+                           schedulers.priority_by_cp]
+
+    def test_no_noise(self):
+        schedulers.priority_by_lpt(self.graph)
+        priorities = [task.priority for task in self.graph.vertices.values()]
+        results = monte_carlo(self.graph, 2, self.priorities, 5,
+                              'uniform', 0, 1, max_workers=1)
+        # The priorities of the graph are not changed by the study
+        self.assertEqual([task.priority
+                          for task in self.graph.vertices.values()],
+                         priorities)
+        self.assertEqual(results['priority_by_id'].makespans, [30] * 5)
+        self.assertEqual(results['priority_by_id'].confidence_interval(),
+                         (30, 30))
+
+    def test_parallel(self):
+        serial = monte_carlo(self.graph, 3, self.priorities, 20,
+                             rng_seed=2, max_workers=1)
+        parallel = monte_carlo(self.graph, 3, self.priorities, 20,
+                               rng_seed=2, max_workers=2)
+        for name in serial:
+            self.assertEqual(serial[name].makespans,
+                             parallel[name].makespans)
+
+    def test_no_replicates(self):
+        for max_workers in [1, 2]:
+            with self.assertRaises(ValueError):
+                monte_carlo(self.graph, 3, self.priorities, 0,
+                            max_workers=max_workers)
+
+    def test_replicates(self):
+        compact = CompactGraph.from_graph(self.graph)
+        results = monte_carlo(compact, 3, self.priorities, 10,
+                              rng_seed=4, max_workers=1)
+        vectors = draw_loads(compact, 10, rng_seed=4)
+        priorities = schedulers.priority_by_cp(compact, vector=True)
+        self.assertEqual(results['priority_by_cp'].makespans,
+                         [simulate(compact, 3, quiet=True,
+                                   priorities=priorities, loads=loads)
+                          for loads in vectors])
+
+
+class ResultTest(unittest.TestCase):
+    def test_statistics(self):
+        result = MonteCarloResult([4, 1, 3, 2, 5])
+        self.assertEqual(result.mean, 3)
+        self.assertEqual(result.percentile(50), 3)
+        self.assertEqual(result.percentile(0), 1)
+        self.assertEqual(result.percentile(100), 5)
+        self.assertEqual(result.percentile(25), 2)
+        low, high = result.confidence_interval()
+        self.assertLess(low, 3)
+        self.assertGreater(high, 3)
+        self.assertAlmostEqual(3 - low, high - 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id
+from simulator.graph import Graph
+from simulator.simulator import simulate
+from simulator.online import OnlineSimulator
+from simulator.trace import START, END
+
+
+def submit_graph(online, graph, release_time=None):
+    for id in graph.topological_order:
+        task = graph.vertices[id]
+        online.submit(id, task.load, task.priority, task.predecessors,
+                      release_time)
+
+
+class OnlineTest(unittest.TestCase):
+    def test_same_as_simulate(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(graph)
+        for num_resources, expected in [(10, 22), (2, 30)]:
+            online = OnlineSimulator(num_resources)
+            submit_graph(online, graph)
+            _, schedule = simulate(graph, num_resources, quiet=True,
+                                   schedule=True)
+            start = dict(zip(schedule.ids, schedule.start))
+            events = list(online.run())
+            self.assertEqual(online.time, expected)
+            self.assertEqual(online.num_finished, 20)
+            self.assertEqual(len(online), 0)
+            for kind, time, id, _ in events:
+                if kind == START:
+                    self.assertEqual(time, start[id])
+
+    def test_release(self):
+        online = OnlineSimulator(2)
+        online.submit('a', 5)
+        online.submit('b', 3, predecessors=['a'], release_time=7)
+        online.submit('c', 2, release_time=1)
+        self.assertEqual(list(online.run()),
+                         [(START, 0, 'a', 0), (START, 1, 'c', 1),
+                          (END, 3, 'c', 1), (END, 5, 'a', 0),
+                          (START, 7, 'b', 1), (END, 10, 'b', 1)])
+
+    def test_until(self):
+        online = OnlineSimulator(1)
+        online.submit(0, 4)
+        online.submit(1, 4, predecessors=[0])
+        events = list(online.run(until=5))
+        self.assertEqual(events, [(START, 0, 0, 0), (END, 4, 0, 0),
+                                  (START, 4, 1, 0)])
+        self.assertEqual(online.time, 5)
+        # Submitted while the simulation is paused
+        online.submit(2, 1, priority=-5, predecessors=[1, 0])
+        self.assertEqual(list(online.run()), [(END, 8, 1, 0),
+                                              (START, 8, 2, 0),
+                                              (END, 9, 2, 0)])
+        with self.assertRaises(ValueError):
+            online.submit(3, 1, release_time=2)
+
+    def test_interrupted(self):
+        online = OnlineSimulator(2)
+        for id in range(4):
+            online.submit(id, 1)
+        for event in online.run():
+            if event[0] == END:
+                break
+        # The rest of the batch is not lost
+        self.assertEqual(online.num_finished, 2)
+        self.assertEqual([event[2] for event in online.run()
+                          if event[0] == END], [2, 3])
+
+    def test_memory(self):
+        # A long stream of chains keeps only a few unfinished tasks
+        online = OnlineSimulator(2)
+        peak = 0
+        for step in range(1000):
+            online.submit(step, 1, predecessors=[step - 1],
+                          release_time=step)
+            for _ in online.run(until=step):
+                peak = max(peak, len(online))
+        list(online.run())
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(online.num_finished, 1000)
+        self.assertEqual(len(online), 0)
+        self.assertEqual(online.time, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import itertools
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.bounds import lower_bounds
+from simulator.schedule import validate_schedule
+from simulator.optimal import optimal_schedule
+
+
+def brute_force(graph, num_resources):
+    """Smallest makespan over all orders of the tasks, each task starting
+    as early as possible after the previous ones"""
+    ids = list(graph.vertices)
+    best = None
+    for order in itertools.permutations(ids):
+        position = {id: i for i, id in enumerate(order)}
+        if any(position[pred] > position[id] for id in ids
+               for pred in graph.vertices[id].predecessors):
+            continue
+        start = dict()
+        for id in order:
+            load = graph.vertices[id].load
+            earliest = max((start[pred] + graph.vertices[pred].load
+                            for pred in graph.vertices[id].predecessors),
+                           default=0)
+            for time in sorted({earliest} | {start[other] +
+                                             graph.vertices[other].load
+                                             for other in start}):
+                if time < earliest:
+                    continue
+                points = {time} | {start[other] for other in start
+                                   if time <= start[other] < time + load}
+                if all(sum(start[other] <= point < start[other] +
+                           graph.vertices[other].load for other in start)
+                       < num_resources for point in points):
+                    start[id] = time
+                    break
+        makespan = max((start[id] + graph.vertices[id].load for id in ids),
+                       default=0)
+        best = makespan if best is None else min(best, makespan)
+    return best
+
+
+class OptimalTest(unittest.TestCase):
+    def test_brute_force(self):
+        for seed in range(15):
+            graph = Graph.generate_graph(6, (1, 6), (0, 2), True, seed)
+            for num_resources in [2, 3]:
+                result = optimal_schedule(graph, num_resources)
+                self.assertTrue(result.optimal)
+                self.assertEqual(result.makespan,
+                                 brute_force(graph, num_resources))
+                validate_schedule(graph, result.schedule, num_resources)
+                self.assertEqual(result.schedule.makespan, result.makespan)
+
+    def test_heuristics(self):
+        improved = 0
+        for seed in range(5):
+            graph = Graph.generate_graph(16, (1, 20), (0, 1), False, seed)
+            result = optimal_schedule(graph, 3)
+            self.assertTrue(result.optimal)
+            self.assertGreaterEqual(result.makespan,
+                                    lower_bounds(graph, 3).value)
+            for function in [schedulers.priority_by_id,
+                             schedulers.priority_by_cp]:
+                self.assertLessEqual(
+                    result.makespan,
+                    simulate(graph, 3, quiet=True,
+                             priorities=function(graph, vector=True)))
+            improved += result.makespan < simulate(graph, 3, quiet=True)
+        self.assertGreater(improved, 0)
+
+    def test_compact(self):
+        graph = Graph.generate_graph(12, (1, 20), (0, 1), False, 1)
+        compact = CompactGraph.from_graph(graph)
+        result = optimal_schedule(compact, 3)
+        self.assertEqual(result.makespan,
+                         optimal_schedule(graph, 3).makespan)
+        validate_schedule(compact, result.schedule, 3)
+
+    def test_max_nodes(self):
+        graph = Graph.generate_graph(16, (1, 20), (0, 1), False, 1)
+        result = optimal_schedule(graph, 5, max_nodes=10)
+        self.assertFalse(result.optimal)
+        self.assertLessEqual(result.nodes, 10)
+        self.assertGreaterEqual(result.makespan,
+                                optimal_schedule(graph, 5).makespan)
+        validate_schedule(graph, result.schedule, 5)
+
+    def test_parallel(self):
+        graph = Graph.generate_graph(12, (1, 20), (0, 1), False, 2)
+        serial = optimal_schedule(graph, 4)
+        parallel = optimal_schedule(graph, 4, max_workers=2)
+        self.assertEqual(parallel.makespan, serial.makespan)
+        self.assertTrue(parallel.optimal)
+        validate_schedule(graph, parallel.schedule, 4)
+
+    def test_empty(self):
+        result = optimal_schedule(Graph(), 2)
+        self.assertEqual(result.makespan, 0)
+        self.assertTrue(result.optimal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id, priority_by_cp
+from simulator.graph import Graph, Task
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.schedule import validate_schedule
+from simulator.policies import Policy, EnablingPolicy
+
+
+class StaticPolicyTest(unittest.TestCase):
+    def test_same_makespan(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(graph)
+        for num_resources, expected in [(10, 22), (2, 30)]:
+            self.assertEqual(simulate(graph, num_resources, quiet=True,
+                                      policy=Policy(graph)), expected)
+
+    def test_large(self):
+        graph = Graph.generate_graph(500, (1, 20), (1, 10), True, 7)
+        priority_by_cp(graph)
+        for num_resources in [3, 20]:
+            _, expected = simulate(graph, num_resources, quiet=True,
+                                   schedule=True)
+            _, schedule = simulate(graph, num_resources, quiet=True,
+                                   schedule=True, policy=Policy(graph))
+            self.assertEqual(list(schedule.start), list(expected.start))
+
+
+class EnablingPolicyTest(unittest.TestCase):
+    def test_valid(self):
+        graph = Graph.generate_graph(500, (1, 20), (1, 10), True, 7)
+        compact = CompactGraph.from_graph(graph)
+        for g in [graph, compact]:
+            _, stats, schedule = simulate(g, 4, quiet=True, stats=True,
+                                          schedule=True,
+                                          policy=EnablingPolicy(g))
+            validate_schedule(g, schedule, 4)
+            self.assertGreater(stats.ready_updates, 0)
+
+    def test_enabling(self):
+        # Task 0 enables nothing, task 1 enables task 3, which has a
+        # single predecessor, so task 1 runs first on the single resource
+        graph = Graph()
+        for id in range(4):
+            graph.vertices[id] = Task(id, 1)
+        graph.vertices[1].successors.add(3)
+        graph.vertices[3].predecessors.add(1)
+        graph.topological_ordering()
+        _, schedule = simulate(graph, 1, quiet=True, schedule=True,
+                               policy=EnablingPolicy(graph))
+        self.assertEqual(schedule.start[1], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
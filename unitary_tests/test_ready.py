@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.ready import ReadyQueue, STALE_RATIO
+
+
+class ReadyQueueTest(unittest.TestCase):
+    def test_order(self):
+        queue = ReadyQueue([(3, 'c'), (1, 'b'), (1, 'a')])
+        queue.push(2, 'd')
+        self.assertEqual(len(queue), 4)
+        self.assertEqual([queue.pop() for _ in range(4)],
+                         ['a', 'b', 'd', 'c'])
+        self.assertEqual(len(queue), 0)
+        self.assertEqual((queue.pushes, queue.pops), (4, 4))
+
+    def test_update(self):
+        queue = ReadyQueue([(5, 0), (4, 1), (3, 2)])
+        queue.update(0, 1)     # decrease
+        queue.update(2, 9)     # increase
+        queue.update(1, 4)     # no change
+        self.assertEqual(queue.updates, 2)
+        self.assertEqual(queue.priority(2), 9)
+        self.assertEqual(queue.peek(), (1, 0))
+        self.assertEqual([queue.pop() for _ in range(3)], [0, 1, 2])
+
+    def test_back_and_forth(self):
+        queue = ReadyQueue([(1, 0), (2, 1)])
+        queue.update(0, 3)
+        queue.update(0, 1)
+        self.assertEqual(queue.pop(), 0)
+        self.assertEqual(queue.pop(), 1)
+        self.assertFalse(queue)
+
+    def test_remove(self):
+        queue = ReadyQueue([(1, 0), (2, 1), (3, 2)])
+        queue.remove(0)
+        self.assertNotIn(0, queue)
+        self.assertIn(1, queue)
+        self.assertEqual([queue.pop() for _ in range(2)], [1, 2])
+
+    def test_compaction(self):
+        # Changing every priority at each step (as time-dependent policies
+        # do) keeps the heap proportional to the queue
+        queue = ReadyQueue((key, key) for key in range(100))
+        for step in range(1, 50):
+            for key in range(100):
+                queue.update(key, (key * step) % 101)
+                self.assertLessEqual(len(queue._heap),
+                                     (1 + STALE_RATIO) * len(queue) + 1)
+        for key in range(0, 100, 2):
+            queue.remove(key)
+        self.assertLessEqual(len(queue._heap),
+                             (1 + STALE_RATIO) * len(queue) + 1)
+        self.assertEqual([queue.pop() for _ in range(50)],
+                         sorted(range(1, 100, 2),
+                                key=lambda key: ((key * 49) % 101, key)))
+
+
+if __name__ == '__main__':
+    unittest.main()
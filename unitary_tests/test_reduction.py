@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+import simulator.schedulers as schedulers
+from simulator.graph import Graph, Task
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.reduction import reduce_graph
+
+
+def build(loads, edges):
+    graph = Graph()
+    for id, load in enumerate(loads):
+        graph.vertices[id] = Task(id, load)
+    for pred_id, succ_id in edges:
+        graph.vertices[pred_id].successors.add(succ_id)
+        graph.vertices[succ_id].predecessors.add(pred_id)
+    graph.topological_ordering()
+    return graph
+
+
+class TransitiveTest(unittest.TestCase):
+    def test_implied_edges(self):
+        graph = build([1, 2, 3, 4], [(0, 1), (1, 2), (0, 2), (2, 3),
+                                     (0, 3)])
+        reduction = reduce_graph(graph)
+        self.assertEqual(reduction.num_tasks, (4, 4))
+        self.assertEqual(reduction.num_edges, (5, 3))
+        self.assertEqual(reduction.graph.vertices[0].successors, {1})
+        self.assertEqual(reduction.graph.vertices[3].predecessors, {2})
+        self.assertEqual(reduction.chains, dict())
+        # The original graph is not modified
+        self.assertEqual(graph.vertices[0].successors, {1, 2, 3})
+
+    def test_same_makespan(self):
+        for seed in range(10):
+            graph = Graph.generate_graph(100, (1, 10), (1, 4), True, seed)
+            schedulers.priority_by_cp(graph)
+            reduction = reduce_graph(graph)
+            self.assertLessEqual(reduction.num_edges[1],
+                                 reduction.num_edges[0])
+            for num_resources in [1, 3, 8]:
+                self.assertEqual(simulate(reduction.graph, num_resources,
+                                          quiet=True),
+                                 simulate(graph, num_resources, quiet=True))
+
+
+class ChainTest(unittest.TestCase):
+    def test_chain(self):
+        # 0 -> 1 -> 2 -> 3 and 0 -> 4
+        graph = build([1, 2, 3, 4, 5], [(0, 1), (1, 2), (2, 3), (0, 4)])
+        reduction = reduce_graph(graph, chains=True, safe=False)
+        self.assertEqual(reduction.chains, {1: [1, 2, 3]})
+        self.assertEqual(reduction.num_tasks, (5, 3))
+        self.assertEqual(reduction.num_edges, (4, 2))
+        self.assertEqual(reduction.graph.vertices[1].load, 9)
+        self.assertEqual(reduction.graph.vertices[0].successors, {1, 4})
+        self.assertEqual(simulate(reduction.graph, 2, quiet=True),
+                         simulate(graph, 2, quiet=True))
+        # Without the transitive reduction
+        reduction = reduce_graph(graph, transitive=False, chains=True,
+                                 safe=False)
+        self.assertEqual(reduction.chains, {1: [1, 2, 3]})
+        reduction = reduce_graph(graph, transitive=False, chains=True)
+        self.assertEqual(reduction.num_tasks[0], 5)
+
+    def test_unsafe(self):
+        # Task 2 waits for task 1 after 0 finishes, so merging 0 and 2
+        # would change the schedule
+        graph = build([1, 5, 1], [(0, 2)])
+        for id, priority in enumerate([0, 1, 2]):
+            graph.vertices[id].priority = priority
+        self.assertEqual(simulate(graph, 1, quiet=True), 7)
+        reduction = reduce_graph(graph, chains=True)
+        self.assertEqual(reduction.num_tasks, (3, 3))
+        self.assertEqual(simulate(reduction.graph, 1, quiet=True), 7)
+        reduction = reduce_graph(graph, chains=True, safe=False)
+        self.assertEqual(reduction.num_tasks, (3, 2))
+        self.assertEqual(simulate(reduction.graph, 1, quiet=True), 7)
+        graph.vertices[1].priority = 3
+        reduction = reduce_graph(graph, chains=True)
+        self.assertEqual(reduction.num_tasks, (3, 2))
+
+    def test_zero_load(self):
+        # Task 2 has no load: merging it into task 9 let its successors
+        # start one batch earlier, and changed the makespan from 20 to 21
+        graph = Graph.generate_graph(30, (0, 5), (0, 3), True, 226)
+        schedulers.priority_by_spt(graph)
+        self.assertEqual(graph.vertices[2].load, 0)
+        self.assertEqual(graph.vertices[9].successors, {2})
+        reduction = reduce_graph(graph, chains=True)
+        self.assertNotIn(9, reduction.chains)
+        for num_resources in [1, 2, 3, 5]:
+            self.assertEqual(simulate(reduction.graph, num_resources,
+                                      quiet=True),
+                             simulate(graph, num_resources, quiet=True))
+
+    def test_same_makespan(self):
+        contracted = 0
+        for seed in range(10):
+            graph = Graph.generate_graph(80, (1, 10), (0, 2), True, seed)
+            for function in [schedulers.priority_by_id,
+                             schedulers.priority_by_cp]:
+                function(graph)
+                for original in [graph, CompactGraph.from_graph(graph)]:
+                    reduction = reduce_graph(original, chains=True)
+                    contracted += len(reduction.chains)
+                    for num_resources in [1, 2, 5]:
+                        self.assertEqual(
+                            simulate(reduction.graph, num_resources,
+                                     quiet=True),
+                            simulate(original, num_resources, quiet=True))
+        self.assertGreater(contracted, 0)
+
+    def test_compact(self):
+        graph = build([1, 2, 3], [(0, 1), (1, 2)])
+        reduction = reduce_graph(CompactGraph.from_graph(graph),
+                                 chains=True)
+        self.assertIsInstance(reduction.graph, CompactGraph)
+        self.assertEqual(len(reduction.graph), 1)
+        self.assertEqual(list(reduction.graph.loads), [6])
+        self.assertEqual(reduction.num_tasks, (3, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.graph import Graph, Task
+from simulator.resources import ResourcePool
+from simulator.schedulers import priority_by_id
+from simulator.simulator import simulate
+
+
+class ResourcePoolTest(unittest.TestCase):
+    def test_identical(self):
+        pool = ResourcePool(3)
+        self.assertTrue(pool.uniform)
+        self.assertEqual([pool.acquire(), pool.acquire()], [0, 1])
+        pool.release(1)
+        pool.release(0)
+        self.assertEqual([pool.acquire() for _ in range(3)], [2, 1, 0])
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool.duration(0, 7), 7)
+
+    def test_speeds(self):
+        pool = ResourcePool(4, [1, 2, 2, 0.5])
+        self.assertFalse(pool.uniform)
+        self.assertEqual([pool.acquire(), pool.acquire()], [1, 2])
+        pool.release(2)
+        self.assertEqual([pool.acquire() for _ in range(3)], [2, 0, 3])
+        self.assertEqual(pool.duration(3, 7), 14)
+        self.assertTrue(ResourcePool(2, [1, 1]).uniform)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            ResourcePool(2, [1])
+        with self.assertRaises(ValueError):
+            ResourcePool(2, [1, 0])
+
+
+class SpeedsTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+
+    def test_uniform(self):
+        self.assertEqual(simulate(self.graph, 10, speeds=[1] * 10), 22)
+        self.assertEqual(simulate(self.graph, 10, speeds=[2] * 10), 11)
+        with self.assertRaises(ValueError):
+            simulate(self.graph, 2, event_queue='bucket', speeds=[1, 2])
+
+    def test_heterogeneous(self):
+        graph = Graph()
+        for id in range(3):
+            graph.vertices[id] = Task(id, 4)
+            graph.vertices[id].priority = id
+        graph.topological_ordering()
+        # Ready tasks start right away, on the fastest free resources:
+        # task 2 runs on the slowest resource (from 0 to 4)
+        self.assertEqual(simulate(graph, 3, speeds=[1, 4, 2]), 4)
+        # Task 2 waits for the fastest resource (free at time 0.5)
+        self.assertEqual(simulate(graph, 2, speeds=[4, 8]), 1)
+
+    def test_many_resources(self):
+        graph = Graph.generate_graph(2000, (1, 10), (0, 3), True, 5,
+                                     compact=True)
+        priority_by_id(graph)
+        self.assertEqual(simulate(graph, 100000),
+                         simulate(graph, 2000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import csv
+import json
+import os
+import tempfile
+from array import array
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.schedule import ScheduleError, validate_schedule, \
+    write_csv, write_chrome_trace
+
+
+class ScheduleTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+
+    def test_schedule(self):
+        makespan, schedule = simulate(self.graph, 2, quiet=True,
+                                      schedule=True)
+        self.assertEqual(makespan, 30)
+        self.assertEqual(schedule.makespan, 30)
+        self.assertEqual(list(schedule.ids), list(self.graph.vertices))
+        for i, id in enumerate(schedule.ids):
+            self.assertEqual(schedule.finish[i] - schedule.start[i],
+                             self.graph.vertices[id].load)
+        validate_schedule(self.graph, schedule, 2)
+
+    def test_stats(self):
+        makespan, stats, schedule = simulate(self.graph, 10, quiet=True,
+                                             stats=True, schedule=True)
+        self.assertEqual(makespan, 22)
+        self.assertEqual(stats.makespan, schedule.makespan)
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        _, schedule = simulate(compact, 2, quiet=True, schedule=True)
+        _, expected = simulate(self.graph, 2, quiet=True, schedule=True)
+        self.assertEqual(list(schedule.start), list(expected.start))
+        self.assertEqual(list(schedule.finish), list(expected.finish))
+        validate_schedule(compact, schedule, 2)
+
+    def test_speeds(self):
+        _, schedule = simulate(self.graph, 3, quiet=True, schedule=True,
+                               speeds=[1, 2, 3])
+        validate_schedule(self.graph, schedule, 3, [1, 2, 3])
+        with self.assertRaises(ScheduleError):
+            validate_schedule(self.graph, schedule, 3)
+
+
+class ValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+        _, self.schedule = simulate(self.graph, 2, quiet=True,
+                                    schedule=True)
+
+    def test_precedence(self):
+        # Moves a task with predecessors to time zero on a third resource
+        i = next(i for i, id in enumerate(self.schedule.ids)
+                 if self.graph.vertices[id].predecessors)
+        load = self.schedule.finish[i] - self.schedule.start[i]
+        self.schedule.start[i] = 0
+        self.schedule.finish[i] = load
+        self.schedule.resource[i] = 2
+        with self.assertRaises(ScheduleError):
+            validate_schedule(self.graph, self.schedule)
+
+    def test_overlap(self):
+        self.schedule.resource = array('i', [0] * len(self.schedule))
+        with self.assertRaises(ScheduleError):
+            validate_schedule(self.graph, self.schedule)
+
+    def test_resources(self):
+        with self.assertRaises(ScheduleError):
+            validate_schedule(self.graph, self.schedule, 1)
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(graph)
+        _, self.schedule = simulate(graph, 2, quiet=True, schedule=True)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv(self):
+        path = os.path.join(self.directory.name, 'schedule.csv')
+        write_csv(self.schedule, path)
+        with open(path) as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 20)
+        self.assertEqual([int(row['start']) for row in rows],
+                         list(self.schedule.start))
+
+    def test_chrome_trace(self):
+        path = os.path.join(self.directory.name, 'trace.json')
+        write_chrome_trace(self.schedule, path, 1000)
+        with open(path) as file:
+            events = json.load(file)['traceEvents']
+        self.assertEqual(len(events), 20)
+        self.assertEqual(events[0]['ph'], 'X')
+        self.assertEqual([event['ts'] for event in events],
+                         [start * 1000 for start in self.schedule.start])
+
+
+if __name__ == '__main__':
+    unittest.main()
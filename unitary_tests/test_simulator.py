@@ -2,11 +2,12 @@
 
 import unittest
 import sys
+from concurrent.futures import ThreadPoolExecutor
 # Add the parent directory to the path so we can import
 # code from our simulator
 sys.path.append('../')
 
-from simulator.schedulers import priority_by_id
+from simulator.schedulers import priority_by_id, priority_by_cp
 from simulator.graph import Graph
 from simulator.simulator import simulate
 
@@ -21,5 +22,55 @@ class ByIDTest(unittest.TestCase):
         self.assertEqual(makespan, 30)
 
 
+class ReadOnlyTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+
+    def test_rerun(self):
+        predecessors = {id: set(task.predecessors)
+                        for id, task in self.graph.vertices.items()}
+        self.assertEqual(simulate(self.graph, 10, False), 22)
+        self.assertEqual(simulate(self.graph, 2, False), 30)
+        self.assertEqual(simulate(self.graph, 10, False), 22)
+        for id, task in self.graph.vertices.items():
+            self.assertEqual(task.predecessors, predecessors[id])
+
+    def test_threads(self):
+        with ThreadPoolExecutor(4) as pool:
+            makespans = list(pool.map(lambda r: simulate(self.graph, r),
+                                      [10, 2] * 4))
+        self.assertEqual(makespans, [22, 30] * 4)
+
+
+class PrioritiesTest(unittest.TestCase):
+    def test_vector(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        vector = priority_by_id(graph, vector=True)
+        self.assertEqual(simulate(graph, 10, quiet=True, priorities=vector),
+                         22)
+        self.assertEqual(simulate(graph, 2, quiet=True, priorities=vector),
+                         30)
+
+    def test_threads(self):
+        graph = Graph.generate_graph(200, (1, 10), (1, 5), True, 3)
+        vectors = [priority_by_id(graph, vector=True),
+                   priority_by_cp(graph, vector=True)]
+        expected = list()
+        for function in [priority_by_id, priority_by_cp]:
+            function(graph)
+            expected.append(simulate(graph, 4, quiet=True))
+        with ThreadPoolExecutor(4) as pool:
+            makespans = list(pool.map(
+                lambda v: simulate(graph, 4, quiet=True, priorities=v),
+                vectors * 4))
+        self.assertEqual(makespans, expected * 4)
+
+    def test_length(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        with self.assertRaises(ValueError):
+            simulate(graph, 2, quiet=True, priorities=[0] * 19)
+
+
 if __name__ == '__main__':
     unittest.main()
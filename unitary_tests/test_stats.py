@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import contextlib
+import io
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.stats import SimulationHooks
+
+
+class RecordingHooks(SimulationHooks):
+    def __init__(self):
+        self.calls = list()
+
+    def ready(self, time, key):
+        self.calls.append(('ready', time, key))
+
+    def start(self, time, key, res_id):
+        self.calls.append(('start', time, key, res_id))
+
+    def finish(self, time, key, res_id):
+        self.calls.append(('finish', time, key, res_id))
+
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+
+    def test_makespan(self):
+        for num_resources, expected in [(10, 22), (2, 30)]:
+            makespan, stats = simulate(self.graph, num_resources,
+                                       quiet=True, stats=True)
+            self.assertEqual(makespan, expected)
+            self.assertEqual(stats.makespan, expected)
+
+    def test_counts(self):
+        _, stats = simulate(self.graph, 2, quiet=True, stats=True)
+        self.assertEqual(stats.num_tasks, 20)
+        self.assertEqual(stats.events, 20)
+        self.assertEqual(stats.ready_pushes, 20)
+        self.assertEqual(stats.ready_pops, 20)
+        self.assertLessEqual(stats.batches, 20)
+        self.assertGreaterEqual(stats.peak_ready, 1)
+
+    def test_time(self):
+        _, stats = simulate(self.graph, 3, quiet=True, stats=True)
+        total_load = sum(task.load for task in self.graph.vertices.values())
+        self.assertEqual(sum(stats.busy_time), total_load)
+        self.assertEqual(sum(stats.busy_time) + stats.idle_time,
+                         3 * stats.makespan)
+        self.assertAlmostEqual(stats.total_utilization,
+                               total_load / (3 * stats.makespan))
+
+    def test_speeds(self):
+        _, stats = simulate(self.graph, 2, quiet=True, stats=True,
+                            speeds=[1, 2])
+        self.assertAlmostEqual(sum(stats.busy_time) + stats.idle_time,
+                               2 * stats.makespan)
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        self.assertEqual(simulate(compact, 2, quiet=True, stats=True)[0], 30)
+
+
+class HooksTest(unittest.TestCase):
+    def test_order(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(graph)
+        hooks = RecordingHooks()
+        self.assertEqual(simulate(graph, 2, quiet=True, hooks=hooks), 30)
+        kinds = [call[0] for call in hooks.calls]
+        self.assertEqual(kinds.count('ready'), 20)
+        self.assertEqual(kinds.count('start'), 20)
+        self.assertEqual(kinds.count('finish'), 20)
+        started = set()
+        for call in hooks.calls:
+            if call[0] == 'start':
+                started.add(call[2])
+            elif call[0] == 'finish':
+                self.assertIn(call[2], started)
+        self.assertEqual(max(call[1] for call in hooks.calls), 30)
+
+
+class QuietTest(unittest.TestCase):
+    def test_quiet(self):
+        graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            simulate(graph, 2, quiet=True)
+        self.assertEqual(output.getvalue(), '')
+        with contextlib.redirect_stdout(output):
+            simulate(graph, 2)
+        self.assertIn('makespan', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.compact import CompactGraph
+from simulator.graph import Graph
+from simulator.levels import compute_levels
+from simulator.schedulers import priority_by_id, priority_by_cp
+from simulator.simulator import simulate
+from simulator.storage import save_graph, load_graph, GraphFileError
+
+
+class StorageTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graph.dag')
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_graph(self):
+        save_graph(self.graph, self.path)
+        graph = load_graph(self.path, compact=False, verify=True)
+        self.assertEqual(list(graph.vertices), list(self.graph.vertices))
+        for id, task in graph.vertices.items():
+            original = self.graph.vertices[id]
+            self.assertEqual(task.load, original.load)
+            self.assertEqual(task.priority, original.priority)
+            self.assertEqual(task.successors, original.successors)
+            self.assertEqual(task.predecessors, original.predecessors)
+        self.assertEqual(graph.topological_order,
+                         self.graph.topological_order)
+        self.assertEqual(graph.depth, self.graph.depth)
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        compute_levels(compact)
+        save_graph(compact, self.path)
+        loaded = load_graph(self.path, verify=True)
+        for name in ['ids', 'loads', 'succ_offsets', 'succ_indices',
+                     'pred_offsets', 'pred_indices', 'priority',
+                     'topological_order', 'level_offsets', 'depth',
+                     'top_level', 'bottom_level', 'height']:
+            self.assertEqual(list(getattr(loaded, name)),
+                             list(getattr(compact, name)), name)
+        self.assertEqual(simulate(loaded, 10), 22)
+        # Priorities of a loaded graph can be updated
+        priority_by_cp(loaded)
+        self.assertEqual(list(loaded.priority),
+                         [-level for level in compact.bottom_level])
+
+    def test_without_derived(self):
+        save_graph(self.graph, self.path, derived=False)
+        loaded = load_graph(self.path)
+        self.assertEqual(len(loaded.topological_order), 0)
+        loaded.topological_ordering()
+        self.assertEqual([loaded.ids[i] for i in loaded.topological_order],
+                         self.graph.topological_order)
+
+    def corrupt(self, position):
+        with open(self.path, 'r+b') as file:
+            file.seek(position)
+            byte = file.read(1)
+            file.seek(position)
+            file.write(bytes([byte[0] ^ 0xff]))
+
+    def test_corrupted_header(self):
+        save_graph(self.graph, self.path)
+        self.corrupt(40)
+        with self.assertRaises(GraphFileError):
+            load_graph(self.path)
+
+    def test_corrupted_data(self):
+        save_graph(self.graph, self.path)
+        self.corrupt(os.path.getsize(self.path) - 20)
+        load_graph(self.path)  # not detected without a full check
+        with self.assertRaises(GraphFileError):
+            load_graph(self.path, verify=True)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a graph')
+        with self.assertRaises(GraphFileError):
+            load_graph(self.path)
+        save_graph(self.graph, self.path)
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 16)
+        with self.assertRaises(GraphFileError):
+            load_graph(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import io
+import unittest
+import sys
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id, priority_by_cp
+from simulator.sweep import run_sweep, iter_sweep, write_csv, COLUMNS, \
+    BOUND_COLUMNS
+
+
+GRID = [{'num_tasks': 20, 'load_range': (1, 5), 'dependency_range': (1, 3),
+         'rename': True},
+        {'num_tasks': 30, 'load_range': (1, 10), 'dependency_range': (0, 4)}]
+PRIORITIES = [priority_by_id, priority_by_cp]
+
+
+class SweepTest(unittest.TestCase):
+    def test_serial(self):
+        rows = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2], max_workers=1)
+        self.assertEqual(len(rows), 2 * 2 * 2 * 2)
+        self.assertEqual(rows[0], {'num_tasks': 20, 'load_range': (1, 5),
+                                   'dependency_range': (1, 3),
+                                   'rename': True, 'rng_seed': 100,
+                                   'priority': 'priority_by_id',
+                                   'num_resources': 10, 'makespan': 22})
+        self.assertEqual(rows[1]['makespan'], 30)
+        self.assertFalse(rows[-1]['rename'])
+
+    def test_parallel(self):
+        serial = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                           max_workers=1)
+        parallel = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                             max_workers=2)
+        self.assertEqual(parallel, serial)
+        streamed = list(iter_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                                   max_workers=2))
+        key = lambda row: sorted((k, str(v)) for k, v in row.items())
+        self.assertEqual(sorted(streamed, key=key), sorted(serial, key=key))
+
+    def test_compact(self):
+        rows = run_sweep(GRID, [100], PRIORITIES, [10, 2], max_workers=1)
+        compact = run_sweep(GRID, [100], PRIORITIES, [10, 2], max_workers=1,
+                            compact=True)
+        self.assertEqual(compact, rows)
+
+    def test_csv(self):
+        rows = run_sweep(GRID[:1], [100], PRIORITIES[:1], [10], max_workers=1)
+        file = io.StringIO()
+        write_csv(rows, file)
+        lines = file.getvalue().splitlines()
+        self.assertEqual(lines[0], 'num_tasks,load_range,dependency_range,' +
+                         'rename,rng_seed,priority,num_resources,makespan')
+        self.assertEqual(lines[1],
+                         '20,"(1, 5)","(1, 3)",True,100,priority_by_id,10,22')
+
+    def test_bounds(self):
+        rows = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                         max_workers=1)
+        bounded = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                            max_workers=1, bounds=True)
+        self.assertEqual(len(bounded), len(rows))
+        for row, bounded_row in zip(rows, bounded):
+            self.assertEqual(bounded_row['makespan'], row['makespan'])
+            self.assertLessEqual(bounded_row['lower_bound'], row['makespan'])
+            self.assertGreaterEqual(bounded_row['gap'], 0)
+        file = io.StringIO()
+        write_csv(bounded, file, COLUMNS + BOUND_COLUMNS)
+        self.assertTrue(file.getvalue().startswith(
+            ','.join(COLUMNS + BOUND_COLUMNS)))
+
+    def test_prune(self):
+        rows = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                         max_workers=1, bounds=True)
+        pruned = run_sweep(GRID, [100, 101], PRIORITIES, [10, 2],
+                           max_workers=1, bounds=True, prune=True)
+        # Rows are only skipped after a makespan reached the bound
+        self.assertTrue(all(row in rows for row in pruned))
+        key = lambda row: (row['num_tasks'], row['rng_seed'],
+                           row['num_resources'])
+        optimal = {key(row) for row in rows if row['gap'] == 0}
+        self.assertGreater(len(optimal), 0)
+        self.assertLess(len(pruned), len(rows))
+        for row in rows:
+            if row not in pruned:
+                self.assertIn(key(row), optimal)
+        for configuration in {key(row) for row in rows}:
+            best = min(row['makespan'] for row in rows
+                       if key(row) == configuration)
+            self.assertEqual(min(row['makespan'] for row in pruned
+                                 if key(row) == configuration), best)
+
+    def test_prune_resources(self):
+        # With more resources than tasks, the makespan is the critical
+        # path and is not simulated
+        rows = run_sweep(GRID, [100], PRIORITIES, [2, 40], max_workers=1)
+        pruned = run_sweep(GRID, [100], PRIORITIES, [2, 40], max_workers=1,
+                           prune=True)
+        self.assertTrue(all(row in rows for row in pruned))
+        self.assertTrue(any(row['num_resources'] == 40 for row in pruned))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import contextlib
+import io
+import os
+import tempfile
+# Add the parent directory to the path so we can import
+# code from our simulator
+sys.path.append('../')
+
+from simulator.schedulers import priority_by_id
+from simulator.graph import Graph
+from simulator.compact import CompactGraph
+from simulator.simulator import simulate
+from simulator.stats import DebugHooks
+from simulator.trace import TraceWriter, TraceFileError, read_trace, \
+    replay, READY, START, END
+
+
+class TraceTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = Graph.generate_graph(20, (1, 5), (1, 3), True, 100)
+        priority_by_id(self.graph)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.trace')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_events(self):
+        with TraceWriter(self.path, self.graph, buffer_size=7) as trace:
+            self.assertEqual(simulate(self.graph, 2, quiet=True,
+                                      hooks=trace), 30)
+        events = list(read_trace(self.path))
+        self.assertEqual(len(events), 60)
+        self.assertEqual(trace.num_records, 60)
+        kinds = [event[0] for event in events]
+        for kind in [READY, START, END]:
+            self.assertEqual(kinds.count(kind), 20)
+        self.assertEqual(max(event[1] for event in events), 30)
+        self.assertTrue(all(event[3] == -1 for event in events
+                            if event[0] == READY))
+
+    def test_schedule(self):
+        with TraceWriter(self.path, self.graph) as trace:
+            _, schedule = simulate(self.graph, 2, quiet=True, hooks=trace,
+                                   schedule=True)
+        for kind, time, i, res_id in read_trace(self.path):
+            if kind == START:
+                self.assertEqual(time, schedule.start[i])
+                self.assertEqual(res_id, schedule.resource[i])
+            elif kind == END:
+                self.assertEqual(time, schedule.finish[i])
+
+    def test_ring(self):
+        with TraceWriter(self.path, self.graph) as trace:
+            simulate(self.graph, 2, quiet=True, hooks=trace)
+        with TraceWriter(self.path + '2', self.graph, last=10) as trace:
+            simulate(self.graph, 2, quiet=True, hooks=trace)
+        events = list(read_trace(self.path))
+        self.assertEqual(list(read_trace(self.path + '2')), events[-10:])
+
+    def test_sample(self):
+        with TraceWriter(self.path, self.graph, sample=4) as trace:
+            simulate(self.graph, 2, quiet=True, hooks=trace)
+        events = list(read_trace(self.path))
+        self.assertEqual(len(events), 15)
+        self.assertTrue(all(event[2] % 4 == 0 for event in events))
+
+    def test_invalid(self):
+        for options in [{'sample': 0}, {'last': 0}, {'buffer_size': 0},
+                        {'sample': -1}]:
+            with self.assertRaises(ValueError):
+                TraceWriter(self.path, self.graph, **options)
+
+    def test_replay(self):
+        ids = list(self.graph.vertices)
+        describe = lambda id: f'task {id}'
+        with TraceWriter(self.path, self.graph) as trace:
+            simulate(self.graph, 2, quiet=True, hooks=trace)
+        expected = io.StringIO()
+        with contextlib.redirect_stdout(expected):
+            simulate(self.graph, 2, quiet=True,
+                     hooks=DebugHooks(describe))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            replay(self.path, DebugHooks(describe), ids)
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+    def test_compact(self):
+        compact = CompactGraph.from_graph(self.graph)
+        with TraceWriter(self.path, compact) as trace:
+            simulate(compact, 2, quiet=True, hooks=trace)
+        self.assertEqual(len(list(read_trace(self.path))), 60)
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a trace file at all')
+        with self.assertRaises(TraceFileError):
+            list(read_trace(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()